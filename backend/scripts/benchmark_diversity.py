@@ -0,0 +1,50 @@
+import asyncio
+import sys
+import os
+import time
+from typing import Dict, Any, List
+
+# Add src to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from src.agents.ranking_agent import RankingAgent
+from benchmark_ranking import REQUIREMENTS, make_catalog
+
+MODES = {
+    "plain": None,
+    "mmr": {"mode": "mmr"},
+    "vendor_quota": {"mode": "vendor_quota"},
+}
+
+
+def distinct_items(packages: List[Dict[str, Any]]) -> int:
+    """Count distinct items used across packages."""
+    return len({item["item_id"] for pkg in packages for item in pkg["items"].values()})
+
+
+async def run_benchmark(sizes: List[int], top_k: int = 10, repeats: int = 3):
+    """Time plain vs diversified top-K ranking as catalogs grow."""
+    print("\n📊 Diversified ranking benchmark (top-%d)" % top_k)
+    print("=" * 72)
+    print(f"{'items/cat':>10} {'mode':>14} {'ms (best)':>10} {'distinct items':>15} {'min score':>10}")
+    
+    for size in sizes:
+        items = make_catalog(size)
+        for mode, diversity in MODES.items():
+            timings = []
+            for _ in range(repeats):
+                agent = RankingAgent()  # Fresh agent: no cached component scores
+                start = time.perf_counter()
+                packages = await agent.rank(items, REQUIREMENTS, top_k=top_k, diversity=diversity)
+                timings.append((time.perf_counter() - start) * 1000)
+            
+            print(
+                f"{size:>10} {mode:>14} {min(timings):>10.1f} "
+                f"{distinct_items(packages):>15} {min(p['final_score'] for p in packages):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000]
+    asyncio.run(run_benchmark(sizes))
@@ -0,0 +1,310 @@
+"""Micro-benchmarks for the ranking engine on synthetic catalogs.
+
+Times RankingAgent.rank (cold and with cached component scores),
+_score_item and package generation for growing catalogs and several weight
+presets, and reports ops/sec, peak memory and how each benchmark scales.
+
+Usage:
+    python scripts/benchmark_ranking.py
+    python scripts/benchmark_ranking.py --sizes 3 30 300 3000 --presets default budget
+    python scripts/benchmark_ranking.py --save baseline.json
+    python scripts/benchmark_ranking.py --compare baseline.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import os
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+import numpy as np
+
+# Add src to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from src.agents.ranking_agent import RankingAgent
+from src.models.responses import DiscoveredItem
+
+CATEGORIES = ["flights", "hotels", "meeting_rooms", "catering"]
+REQUIREMENTS = {"attendees": 50, "budget": 60000, "duration": "2 days", "location": "Miami"}
+
+AMENITIES = ["WiFi", "Pool", "Fitness Center", "Spa", "Restaurant", "Bar", "Parking", "Concierge"]
+EQUIPMENT = ["Projector", "Whiteboard", "Video Conferencing", "Sound System"]
+DIETARY = ["Vegetarian", "Vegan", "Gluten-Free", "Kosher", "Halal"]
+
+# Weight presets, as built by main._weights_to_dict
+PRESETS: Dict[str, Optional[Dict[str, Any]]] = {
+    "default": None,
+    "budget": {
+        "category_importance": {"flights": 40, "hotels": 30, "meeting_rooms": 15, "catering": 15},
+        "flights": {"price_weight": 70, "timing_weight": 10, "trust_weight": 10, "comfort_weight": 10},
+        "hotels": {"price_weight": 60, "trust_weight": 20, "location_weight": 10, "amenities_weight": 10},
+    },
+    "quality": {
+        "category_importance": {"flights": 20, "hotels": 50, "meeting_rooms": 20, "catering": 10},
+        "hotels": {"price_weight": 5, "trust_weight": 50, "location_weight": 25, "amenities_weight": 20},
+        "catering": {"price_weight": 10, "trust_weight": 50, "dietary_weight": 25, "service_weight": 15},
+    },
+}
+
+BENCHMARKS = ["rank_cold", "rank_warm", "score_item", "generate_packages"]
+
+
+def make_catalog(per_category: int, seed: int = 0, vendors: int = 25) -> List[Dict[str, Any]]:
+    """Generate a synthetic catalog with per_category items in every category.
+    
+    Items have the shape DiscoveryAgent produces and are validated against
+    the DiscoveredItem model.
+    
+    Args:
+        per_category: Items per category
+        seed: Random seed (same seed, same catalog)
+        vendors: Number of distinct vendors to draw from
+        
+    Returns:
+        List of item dictionaries
+    """
+    rng = random.Random(seed)
+    items = []
+    for category in CATEGORIES:
+        for idx in range(per_category):
+            if category == "flights":
+                metadata = {"stops": rng.choice([0, 0, 1, 2]), "airline": f"Airline {rng.randint(1, 8)}"}
+            elif category == "hotels":
+                metadata = {
+                    "star_rating": rng.randint(2, 5),
+                    "amenities": rng.sample(AMENITIES, rng.randint(0, len(AMENITIES))),
+                }
+            elif category == "meeting_rooms":
+                metadata = {
+                    "capacity": rng.randint(20, 120),
+                    "equipment": rng.sample(EQUIPMENT, rng.randint(0, len(EQUIPMENT))),
+                }
+            else:
+                metadata = {"dietary_options": rng.sample(DIETARY, rng.randint(0, len(DIETARY)))}
+            
+            item = {
+                "item_id": f"{category}_{idx:05d}",
+                "category": category,
+                "vendor": f"Vendor {rng.randint(1, vendors)}",
+                "source": f"https://vendor{idx}.example.com/{category}",
+                "title": f"{category} option {idx}",
+                "description": f"Synthetic {category} listing",
+                "price": round(rng.uniform(1000, 30000), 2),
+                "currency": "USD",
+                "availability": True,
+                "metadata": metadata,
+                "trust_score": {"rating": round(rng.uniform(2.5, 5.0), 2), "source": "Synthetic"},
+            }
+            DiscoveredItem(**item)
+            items.append(item)
+    return items
+
+
+def measure(fn: Callable[[], Any], repeats: int, ops: int = 1) -> Dict[str, float]:
+    """Time a callable and record its peak traced memory.
+    
+    Each sample runs fn enough times to take ~0.2s (timeit's autorange);
+    memory is traced in a separate, untimed call.
+    
+    Args:
+        fn: Callable to benchmark
+        repeats: Number of timing samples
+        ops: Operations performed by one call (e.g. items scored)
+        
+    Returns:
+        Dict with "median_ms" and "best_ms" (per call), "ops_per_sec" and
+        "peak_kb"
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeats, number=number)]
+    median = statistics.median(per_call)
+    
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        "median_ms": median * 1000,
+        "best_ms": min(per_call) * 1000,
+        "ops_per_sec": ops / median,
+        "peak_kb": peak / 1024,
+    }
+
+
+def benchmark_size(
+    size: int,
+    preset: Optional[Dict[str, Any]],
+    top_k: int,
+    repeats: int
+) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark for one catalog size and weight preset.
+    
+    Args:
+        size: Items per category
+        preset: Custom weights (None for defaults)
+        top_k: Packages to rank
+        repeats: Number of timing samples
+        
+    Returns:
+        Dict mapping benchmark name to its measurements
+    """
+    items = make_catalog(size)
+    loop = asyncio.new_event_loop()
+    results = {}
+    
+    try:
+        # Fresh agent per call: every component score is computed
+        results["rank_cold"] = measure(
+            lambda: loop.run_until_complete(RankingAgent().rank(items, REQUIREMENTS, preset, top_k)),
+            repeats
+        )
+        
+        # Same agent: component scores come from the session cache
+        agent = RankingAgent()
+        results["rank_warm"] = measure(
+            lambda: loop.run_until_complete(agent.rank(items, REQUIREMENTS, preset, top_k)),
+            repeats
+        )
+    finally:
+        loop.close()
+    
+    def score_all():
+        for item in items:
+            agent._score_item(item, item["category"], REQUIREMENTS, preset)
+    
+    results["score_item"] = measure(score_all, repeats, ops=len(items))
+    
+    # Package generation alone, from already-scored categories
+    scored = agent._score_categories(agent._group_for_packages(items, REQUIREMENTS), REQUIREMENTS, preset)
+    importance = agent._resolve_importance(preset)
+    results["generate_packages"] = measure(
+        lambda: list(itertools.islice(agent._generate_packages(scored, importance), top_k)),
+        repeats
+    )
+    
+    return results
+
+
+def scaling_exponents(sizes: List[int], medians: List[float]) -> List[float]:
+    """Log-log slope between consecutive sizes (1.0 = linear, 2.0 = quadratic)."""
+    return [
+        math.log(t2 / t1) / math.log(n2 / n1)
+        for (n1, t1), (n2, t2) in zip(zip(sizes, medians), zip(sizes[1:], medians[1:]))
+    ]
+
+
+def run_suite(sizes: List[int], presets: List[str], top_k: int, repeats: int) -> Dict[str, Any]:
+    """Run the suite and print a results table.
+    
+    Returns:
+        Dict with "meta" and "results" keyed "benchmark/preset/size"
+    """
+    results = {}
+    print(f"\n📊 Ranking benchmark (top-{top_k}, median of {repeats})")
+    print("=" * 78)
+    print(f"{'items/cat':>10} {'preset':>9} {'benchmark':>18} {'ms':>10} {'ops/sec':>12} {'peak KB':>10}")
+    
+    for size in sizes:
+        for preset in presets:
+            for name, stats in benchmark_size(size, PRESETS[preset], top_k, repeats).items():
+                results[f"{name}/{preset}/{size}"] = stats
+                print(
+                    f"{size:>10} {preset:>9} {name:>18} {stats['median_ms']:>10.3f} "
+                    f"{stats['ops_per_sec']:>12,.0f} {stats['peak_kb']:>10.1f}"
+                )
+    
+    if len(sizes) > 1:
+        print("\n📈 Scaling exponents (time ~ items^k, between consecutive sizes)")
+        print("=" * 78)
+        for preset in presets:
+            for name in BENCHMARKS:
+                medians = [results[f"{name}/{preset}/{size}"]["median_ms"] for size in sizes]
+                exponents = " ".join(f"{k:>6.2f}" for k in scaling_exponents(sizes, medians))
+                print(f"{preset:>9} {name:>18}  {exponents}")
+    
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sizes": sizes,
+            "presets": presets,
+            "top_k": top_k,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """Print current vs baseline timings and count regressions.
+    
+    Args:
+        current: Suite output from run_suite
+        baseline: Suite output loaded from a --save file
+        threshold: Relative slowdown (e.g. 0.1 = 10%) counted as a regression
+        
+    Returns:
+        Number of benchmarks slower than the baseline by more than threshold
+    """
+    print(f"\n⚖️  Compared to baseline from {baseline['meta'].get('created_at', '?')}")
+    print("=" * 78)
+    print(f"{'benchmark':>36} {'baseline ms':>12} {'ms':>10} {'change':>9}")
+    
+    regressions = 0
+    for key, stats in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        change = stats["median_ms"] / base["median_ms"] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  ❌ slower"
+        elif change < -threshold:
+            flag = "  ✅ faster"
+        print(f"{key:>36} {base['median_ms']:>12.3f} {stats['median_ms']:>10.3f} {change:>+9.1%}{flag}")
+    
+    print(f"\n{regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ranking engine on synthetic catalogs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 30, 300], help="Items per category")
+    parser.add_argument("--presets", nargs="+", default=["default"], choices=sorted(PRESETS))
+    parser.add_argument("--top-k", type=int, default=10, help="Packages to rank")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing samples per benchmark")
+    parser.add_argument("--save", help="Write results as JSON (e.g. a baseline)")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --save")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Slowdown counted as a regression")
+    args = parser.parse_args()
+    
+    current = run_suite(args.sizes, args.presets, args.top_k, args.repeats)
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"\n💾 Saved results to {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Accuracy and latency of the rule-based requirements parser vs the LLM.
+
+Runs a labelled corpus of retreat requests through the rule parser and
+reports how many take the fast path, how accurate those results are, and
+how long parsing takes. With --llm (needs OPENAI_API_KEY) the same corpus
+also goes through the LLM path for comparison.
+
+Usage:
+    python scripts/benchmark_requirements_parser.py
+    python scripts/benchmark_requirements_parser.py --llm
+    python scripts/benchmark_requirements_parser.py --corpus more_prompts.json --threshold 0.8
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import os
+import time
+import timeit
+from typing import Dict, Any, List, Optional
+
+# Add src to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '..'))
+
+from src.config import settings
+from src.services.requirements_parser import REQUIRED_FIELDS, parse_requirements
+
+# (request, expected required fields)
+CORPUS: List[Dict[str, Any]] = [
+    {"input": "Plan a 2-day retreat in Las Vegas for 50 managers. Budget $60,000. Need 4-star hotel, flights from SF, meeting room, catering.",
+     "expected": {"attendees": 50, "budget": 60000, "duration": "2 days", "location": "Las Vegas"}},
+    {"input": "50 people, Las Vegas, 2 days, $60k budget",
+     "expected": {"attendees": 50, "budget": 60000, "duration": "2 days", "location": "Las Vegas"}},
+    {"input": "Planning a retreat for 50 people in Miami for 3 days with a 50k budget",
+     "expected": {"attendees": 50, "budget": 50000, "duration": "3 days", "location": "Miami"}},
+    {"input": "Team offsite in Austin, TX for 25 engineers, 3 days, budget of 40000 dollars, vegan catering",
+     "expected": {"attendees": 25, "budget": 40000, "duration": "3 days", "location": "Austin, TX"}},
+    {"input": "Offsite for a team of 12 in Lisbon, 5 nights, $30,000, nonstop flights from New York",
+     "expected": {"attendees": 12, "budget": 30000, "duration": "5 nights", "location": "Lisbon"}},
+    {"input": "Company retreat in Denver for 80 employees, 4 days, $120,000 total",
+     "expected": {"attendees": 80, "budget": 120000, "duration": "4 days", "location": "Denver"}},
+    {"input": "3-day leadership summit in Chicago for 15 executives with a $45k budget",
+     "expected": {"attendees": 15, "budget": 45000, "duration": "3 days", "location": "Chicago"}},
+    {"input": "Sales kickoff at Scottsdale for 120 reps, 2 days, $250,000",
+     "expected": {"attendees": 120, "budget": 250000, "duration": "2 days", "location": "Scottsdale"}},
+    {"input": "Weekend getaway to Napa for 20 colleagues, budget $35,000",
+     "expected": {"attendees": 20, "budget": 35000, "duration": "2 days", "location": "Napa"}},
+    {"input": "We need a one week trip to Honolulu for 30 people, $150k, 5-star hotel with spa",
+     "expected": {"attendees": 30, "budget": 150000, "duration": "7 days", "location": "Honolulu"}},
+    {"input": "Engineering offsite in San Diego for 40 developers, 3 days, 75k",
+     "expected": {"attendees": 40, "budget": 75000, "duration": "3 days", "location": "San Diego"}},
+    {"input": "Retreat in Boston for 10 people for 2 days, budget $20,000, gluten-free catering",
+     "expected": {"attendees": 10, "budget": 20000, "duration": "2 days", "location": "Boston"}},
+    {"input": "Destination: Seattle. 35 attendees, 3 days, $70,000",
+     "expected": {"attendees": 35, "budget": 70000, "duration": "3 days", "location": "Seattle"}},
+    # The city ends a sentence: the period is not part of the name
+    {"input": "Plan a 2-day retreat in Las Vegas. Budget $60,000 for 50 managers.",
+     "expected": {"attendees": 50, "budget": 60000, "duration": "2 days", "location": "Las Vegas"}},
+    {"input": "Retreat for 20 people flying from Boston. Need a hotel in Miami, 3 days, $30k budget.",
+     "expected": {"attendees": 20, "budget": 30000, "duration": "3 days", "location": "Miami"}},
+    {"input": "Offsite for 30 people in St. Louis. 2 days, $40k.",
+     "expected": {"attendees": 30, "budget": 40000, "duration": "2 days", "location": "St. Louis"}},
+    {"input": "Summit in Washington D.C. Budget $50,000 for 25 leaders, 2 days.",
+     "expected": {"attendees": 25, "budget": 50000, "duration": "2 days", "location": "Washington D.C."}},
+    {"input": "Two day workshop in Portland for 18 staff with $25k",
+     "expected": {"attendees": 18, "budget": 25000, "duration": "2 days", "location": "Portland"}},
+    {"input": "retreat in miami for 30 people, 3 days, $40000",
+     "expected": {"attendees": 30, "budget": 40000, "duration": "3 days", "location": "Miami"}},
+    {"input": "We want a 3-day retreat in Denver or Boulder for 40 people with $50k",
+     "expected": {"attendees": 40, "budget": 50000, "duration": "3 days", "location": "Denver"}},
+    {"input": "A retreat in March for 40-60 people in Paris, budget $100k, 4 days",
+     "expected": {"attendees": 50, "budget": 100000, "duration": "4 days", "location": "Paris"}},
+    {"input": "We need a 2 day retreat in Miami for 50 people, $500 per person",
+     "expected": {"attendees": 50, "budget": 25000, "duration": "2 days", "location": "Miami"}},
+    {"input": "Meeting room with wifi in Chicago for 20 people, 1 day, $10k",
+     "expected": {"attendees": 20, "budget": 10000, "duration": "1 day", "location": "Chicago"}},
+    {"input": "Looking for something warm next month, about 25 of us, maybe 3 or 4 days, budget flexible around 60k",
+     "expected": {"attendees": 25, "budget": 60000, "duration": "3 days", "location": None}},
+    {"input": "Offsite in Nashville for 45 managers, 3 days, $90,000, no red-eye flights, wheelchair accessible venue",
+     "expected": {"attendees": 45, "budget": 90000, "duration": "3 days", "location": "Nashville"}},
+    {"input": "Plan a retreat in Toronto for 60 employees over 3 days. Budget is $110,000 but ideally under $100,000",
+     "expected": {"attendees": 60, "budget": 100000, "duration": "3 days", "location": "Toronto"}},
+]
+
+
+def normalize_place(place: str) -> str:
+    """Case- and whitespace-insensitive form of a place name."""
+    return " ".join(place.casefold().split())
+
+
+def field_correct(field: str, value: Any, expected: Any) -> bool:
+    """Compare one extracted field with its label (location exactly after normalizing, duration by count)."""
+    if expected is None:
+        return True  # Unlabelled: nothing to check
+    if value is None:
+        return False
+    if field == "location":
+        return normalize_place(str(value)) == normalize_place(expected)
+    if field == "duration":
+        return re.findall(r"\d+", str(value))[:1] == re.findall(r"\d+", expected)[:1]
+    return float(value) == float(expected)
+
+
+def score(requirements: Dict[str, Any], expected: Dict[str, Any]) -> Dict[str, bool]:
+    """Per-field correctness of a parsed request."""
+    return {field: field_correct(field, requirements.get(field), expected.get(field)) for field in REQUIRED_FIELDS}
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_rules(corpus: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Parse every request with the rules, timing each."""
+    rows = []
+    for case in corpus:
+        timer = timeit.Timer(lambda: parse_requirements(case["input"]))
+        number, _ = timer.autorange()
+        seconds = min(timer.repeat(repeat=3, number=number)) / number
+        parsed = parse_requirements(case["input"])
+        rows.append({
+            "input": case["input"],
+            "fast_path": parsed["overall"] >= threshold,
+            "confidence": parsed["overall"],
+            "reasons": parsed["reasons"],
+            "correct": score(parsed["requirements"], case["expected"]),
+            "ms": seconds * 1000,
+        })
+    return rows
+
+
+async def run_llm(corpus: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Parse every request with the LLM path only."""
+    from src.agents.requirements_analyst import RequirementsAnalystAgent
+    
+    agent = RequirementsAnalystAgent()
+    rows = []
+    for case in corpus:
+        start = time.perf_counter()
+        requirements, path = await agent._analyze_with_llm(case["input"])
+        requirements = agent._ensure_required_fields(requirements, case["input"])
+        rows.append({
+            "path": path,
+            "correct": score(requirements, case["expected"]),
+            "ms": (time.perf_counter() - start) * 1000,
+        })
+    return rows
+
+
+def report(rules: List[Dict[str, Any]], llm: Optional[List[Dict[str, Any]]], threshold: float):
+    """Print per-request results and a summary of both paths."""
+    print(f"\n📋 Rule parser (fast path at confidence >= {threshold})")
+    print("=" * 96)
+    for row in rules:
+        fields = "".join("✓" if ok else "✗" for ok in row["correct"].values())
+        path = "rules" if row["fast_path"] else "LLM  "
+        print(f"{path} {row['confidence']:>5.2f} {fields} {row['ms']:>7.3f} ms  {row['input'][:60]}")
+        if not row["fast_path"] and row["reasons"]:
+            print(f"{'':>19}↳ {', '.join(row['reasons'])}")
+    
+    fast = [row for row in rules if row["fast_path"]]
+    exact = [row for row in fast if all(row["correct"].values())]
+    rule_ms = [row["ms"] for row in rules]
+    
+    print("\n📊 Summary")
+    print("=" * 96)
+    print(f"Fast path taken:        {len(fast)}/{len(rules)} ({len(fast) / len(rules):.0%})")
+    if fast:
+        print(f"Fast path all-correct:  {len(exact)}/{len(fast)} ({len(exact) / len(fast):.0%})")
+    print(f"Rule parse latency:     mean {statistics.mean(rule_ms):.3f} ms, p95 {percentile(rule_ms, 0.95):.3f} ms")
+    
+    if llm:
+        llm_ms = [row["ms"] for row in llm]
+        llm_exact = sum(all(row["correct"].values()) for row in llm)
+        slow = [row for row, rule in zip(llm, rules) if not rule["fast_path"]]
+        hybrid_exact = len(exact) + sum(all(row["correct"].values()) for row in slow)
+        hybrid_ms = statistics.mean(
+            rule["ms"] + (0 if rule["fast_path"] else row["ms"]) for rule, row in zip(rules, llm)
+        )
+        print(f"LLM all-correct:        {llm_exact}/{len(llm)} ({llm_exact / len(llm):.0%})")
+        print(f"LLM latency:            mean {statistics.mean(llm_ms):.0f} ms, p95 {percentile(llm_ms, 0.95):.0f} ms")
+        print(f"Hybrid all-correct:     {hybrid_exact}/{len(rules)} ({hybrid_exact / len(rules):.0%})")
+        print(f"Hybrid mean latency:    {hybrid_ms:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the rule-based requirements parser with the LLM")
+    parser.add_argument("--corpus", help="JSON list of {\"input\": ..., \"expected\": {...}} to use instead")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=settings.requirements_fast_path_min_confidence,
+        help="Fast-path confidence threshold"
+    )
+    parser.add_argument("--llm", action="store_true", help="Also run the LLM path (makes API calls)")
+    args = parser.parse_args()
+    
+    corpus = CORPUS
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = json.load(f)
+    
+    rules = run_rules(corpus, args.threshold)
+    llm = asyncio.run(run_llm(corpus)) if args.llm else None
+    report(rules, llm, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Report what importing the app costs at startup, per module and per package.
+
+Imports a module (src.main by default) in a fresh interpreter with
+`python -X importtime`, then prints the slowest modules by cumulative time,
+self time summed per top-level package, and whether any module that should
+load lazily (crewai, tavily, stripe) was imported.
+
+Usage:
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py --module src.crew.retreat_crew --top 30
+    python scripts/import_time_report.py --save baseline.json
+    python scripts/import_time_report.py --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, List
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Modules that must not be imported when the app starts
+LAZY_MODULES = ["crewai", "tavily", "stripe"]
+
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> List[Dict[str, Any]]:
+    """Import a module in a fresh interpreter and parse its -X importtime output.
+    
+    Args:
+        module: Dotted module name to import
+        
+    Returns:
+        One dict per imported module with "module", "self_us",
+        "cumulative_us" and nesting "depth"
+        
+    Raises:
+        RuntimeError: If the import fails
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    return rows
+
+
+def summarize(rows: List[Dict[str, Any]], module: str) -> Dict[str, Any]:
+    """Total import time, time per top-level package and lazy modules loaded."""
+    packages: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        packages[row["module"].split(".")[0]] += row["self_us"]
+    
+    total = next((row["cumulative_us"] for row in rows if row["module"] == module), 0)
+    loaded = {row["module"].split(".")[0] for row in rows}
+    return {
+        "total_ms": total / 1000,
+        "modules": len(rows),
+        "packages_ms": {name: us / 1000 for name, us in sorted(packages.items(), key=lambda p: -p[1])},
+        "lazy_imported": [name for name in LAZY_MODULES if name in loaded],
+    }
+
+
+def report(rows: List[Dict[str, Any]], summary: Dict[str, Any], module: str, top: int):
+    """Print the slowest modules and packages."""
+    print(f"\n⏱️  import {module}: {summary['total_ms']:.1f} ms, {summary['modules']} modules")
+    
+    print("\n📦 Slowest modules (cumulative)")
+    print("=" * 78)
+    print(f"{'cumulative ms':>14} {'self ms':>10}  module")
+    for row in sorted(rows, key=lambda r: -r["cumulative_us"])[:top]:
+        print(f"{row['cumulative_us'] / 1000:>14.1f} {row['self_us'] / 1000:>10.1f}  {'  ' * row['depth']}{row['module']}")
+    
+    print("\n📚 Self time per top-level package")
+    print("=" * 78)
+    for name, ms in list(summary["packages_ms"].items())[:top]:
+        print(f"{ms:>14.1f}  {name}")
+    
+    print()
+    if summary["lazy_imported"]:
+        print(f"❌ Imported at startup but should load lazily: {', '.join(summary['lazy_imported'])}")
+    else:
+        print(f"✅ None of {', '.join(LAZY_MODULES)} imported at startup")
+
+
+def compare(summary: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print total and per-package changes; True if the total regressed beyond threshold."""
+    print(f"\n⚖️  Compared to baseline from {baseline['meta'].get('created_at', '?')}")
+    print("=" * 78)
+    for name, ms in list(summary["packages_ms"].items()):
+        base = baseline["summary"]["packages_ms"].get(name)
+        if base is None:
+            print(f"{name:>30} {'new':>10} {ms:>10.1f}")
+        elif abs(ms - base) >= 5:
+            print(f"{name:>30} {base:>10.1f} {ms:>10.1f}")
+    
+    base_total = baseline["summary"]["total_ms"]
+    change = summary["total_ms"] / base_total - 1 if base_total else 0.0
+    print(f"\n{'total':>30} {base_total:>10.1f} {summary['total_ms']:>10.1f} {change:>+9.1%}")
+    return change > threshold
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import time at startup")
+    parser.add_argument("--module", default="src.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Rows to show")
+    parser.add_argument("--save", help="Write the report as JSON (e.g. a baseline)")
+    parser.add_argument("--compare", help="Baseline JSON from an earlier --save")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Total slowdown counted as a regression")
+    args = parser.parse_args()
+    
+    rows = measure(args.module)
+    summary = summarize(rows, args.module)
+    report(rows, summary, args.module, args.top)
+    
+    failed = bool(summary["lazy_imported"])
+    
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {"created_at": datetime.now().isoformat(), "module": args.module},
+                "summary": summary,
+            }, f, indent=2)
+        print(f"\n💾 Saved report to {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        failed = compare(summary, baseline, args.threshold) or failed
+    
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
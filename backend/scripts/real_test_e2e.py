@@ -50,7 +50,7 @@ async def run_real_e2e_test():
         print(f"✅ Generated and ranked {len(packages)} package combinations.")
         top_pkg = packages[0]
         print(f"   Top Package Score: {top_pkg['final_score']} (Total Cost: ${top_pkg['total_cost']})")
-        print(f"   Top Package Explanation: {top_pkg['explanation']['why_ranked']}")
+        print(f"   Top Package Explanation: {crew.explain_package(top_pkg)['why_ranked']}")
     except Exception as e:
         print(f"❌ Ranking Error: {e}")
         return
@@ -0,0 +1,115 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.agent_pool import AgentPool
+
+
+class CountingFactory:
+    """Builds numbered agents, optionally failing."""
+    
+    def __init__(self):
+        self.built = 0
+        self.fail = False
+    
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError("LLM client unavailable")
+        self.built += 1
+        return {"agent": self.built}
+
+
+def test_acquire_on_an_empty_pool_builds_an_agent():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    agent = pool.acquire()
+    assert agent == {"agent": 1}
+    stats = pool.stats()
+    assert (stats["created"], stats["reused"], stats["idle"], stats["in_use"]) == (1, 0, 0, 1)
+    
+    # A second caller never waits for the first: it gets its own agent
+    other = pool.acquire()
+    assert other is not agent
+    assert (factory.built, pool.stats()["in_use"]) == (2, 2)
+
+
+def test_released_agent_is_reused():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    agent = pool.acquire()
+    pool.release(agent)
+    assert pool.stats()["idle"] == 1
+    
+    assert pool.acquire() is agent
+    stats = pool.stats()
+    assert (factory.built, stats["reused"], stats["idle"], stats["in_use"]) == (1, 1, 0, 1)
+
+
+def test_discarded_agent_is_not_reused():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    agent = pool.acquire()
+    pool.release(agent, discard=True)
+    stats = pool.stats()
+    assert (stats["discarded"], stats["idle"], stats["in_use"]) == (1, 0, 0)
+    
+    assert pool.acquire() is not agent
+    assert factory.built == 2
+
+
+def test_idle_agents_are_capped():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    agents = [pool.acquire() for _ in range(3)]
+    for agent in agents:
+        pool.release(agent)
+    stats = pool.stats()
+    assert (stats["idle"], stats["discarded"], stats["in_use"]) == (2, 1, 0)
+
+
+def test_checkout_discards_the_agent_when_the_block_raises():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    with pytest.raises(ValueError):
+        with pool.checkout() as agent:
+            raise ValueError("bad LLM output")
+    assert pool.stats()["discarded"] == 1
+    
+    with pool.checkout() as fresh:
+        assert fresh is not agent
+    with pool.checkout() as reused:
+        assert reused is fresh
+    assert pool.stats()["in_use"] == 0
+
+
+def test_failed_build_does_not_leak_a_checkout():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    factory.fail = True
+    
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    stats = pool.stats()
+    assert (stats["created"], stats["in_use"]) == (0, 0)
+
+
+def test_warm_fills_up_to_max_idle():
+    factory = CountingFactory()
+    pool = AgentPool(factory, max_idle=2)
+    
+    pool.warm(5)
+    assert (factory.built, pool.stats()["idle"]) == (2, 2)
+    pool.warm(2)
+    assert factory.built == 2
+    
+    pool.acquire()
+    stats = pool.stats()
+    assert (factory.built, stats["reused"], stats["idle"]) == (2, 1, 1)
@@ -0,0 +1,123 @@
+import pytest
+import sqlite3
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services import cache as cache_module
+from src.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+def disk_rows(path, namespace="default"):
+    with sqlite3.connect(path) as db:
+        return dict(db.execute(
+            "SELECT key, expires_at FROM cache_entries WHERE namespace = ?", (namespace,)
+        ).fetchall())
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(default_ttl=10)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl=1)
+    
+    clock.now += 5
+    assert cache.get("default") == 1
+    assert cache.get("short") is None
+    
+    clock.now += 5
+    assert cache.get("default") is None
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expirations"] == 2
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    TTLCache(path=path, namespace="search").set("query", {"results": [1, 2]})
+    
+    restarted = TTLCache(path=path, namespace="search")
+    assert restarted.get("query") == {"results": [1, 2]}
+    assert restarted.stats()["disk_hits"] == 1
+    
+    # Namespaces sharing a file do not see each other's entries
+    assert TTLCache(path=path, namespace="other").get("query") is None
+
+
+def test_disk_tier_is_opened_lazily(tmp_path):
+    path = tmp_path / "cache.db"
+    cache = TTLCache(path=str(path))
+    cache.stats()
+    assert not path.exists()
+    
+    cache.set("key", 1)
+    assert path.exists()
+
+
+def test_disk_tier_drops_expired_rows(tmp_path, clock):
+    path = str(tmp_path / "cache.db")
+    TTLCache(path=path, default_ttl=10).set("old", 1)
+    
+    clock.now += 20
+    restarted = TTLCache(path=path)
+    assert restarted.get("old") is None
+    assert "old" not in disk_rows(path)
+
+
+def test_disk_tier_is_bounded_by_count(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(TTLCache, "PRUNE_EVERY", 1)
+    path = str(tmp_path / "cache.db")
+    cache = TTLCache(max_entries=2, path=path, max_disk_entries=3)
+    
+    for i in range(5):
+        clock.now += 1
+        cache.set(f"key{i}", i)
+    
+    # The rows closest to expiry (the oldest writes here) go first
+    assert sorted(disk_rows(path)) == ["key2", "key3", "key4"]
+    assert cache.stats()["disk_evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_access_uses_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = TTLCache(path=path)
+    await cache.aset("key", [1, 2, 3])
+    assert await cache.aget("key") == [1, 2, 3]
+    assert await cache.aget("missing") is None
+    
+    restarted = TTLCache(path=path)
+    assert await restarted.aget("key") == [1, 2, 3]
+    assert restarted.stats()["disk_hits"] == 1
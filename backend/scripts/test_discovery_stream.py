@@ -0,0 +1,164 @@
+import pytest
+import asyncio
+import json
+import sys
+import os
+
+import httpx
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import main
+from src.config import settings
+from src.crew.retreat_crew import RetreatPlannerCrew
+from src.services import search_client, tavily_service
+from src.services.search_client import AsyncSearchClient
+
+
+REQUIREMENTS = {
+    "attendees": 20,
+    "duration": "3 days",
+    "location": "Miami",
+    "origin": "Boston",
+    "budget": 30000,
+    "must_haves": [],
+}
+
+
+class SearchStandIn:
+    """Answers Tavily searches, finishing earlier queries last.
+    
+    Consecutive queries of a category share two of their three results, so
+    discovery has duplicates to drop.
+    """
+    
+    def __init__(self, release=None):
+        self.queries = []
+        self.release = release
+        self.active = 0
+        self.max_active = 0
+        self.cancelled = 0
+    
+    async def __call__(self, request):
+        query = json.loads(request.content)["query"]
+        index = self.queries.index(query)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.release is not None and index > 0:
+                await self.release.wait()
+            await asyncio.sleep(0.01 * (len(self.queries) - index))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        
+        first = index % 2
+        return httpx.Response(200, json={"results": [
+            {
+                "url": f"https://vendor{n}.example.com/listing",
+                "title": f"Listing {n}",
+                "content": f"Listing {n} from ${100 + n}",
+                "score": 0.8,
+            }
+            for n in range(first, first + 3)
+        ]})
+
+
+def planned_queries():
+    crew = RetreatPlannerCrew()
+    return crew.discovery_agent._plan_searches(REQUIREMENTS)
+
+
+@pytest.fixture
+def stand_in(monkeypatch):
+    """Route the shared search client to a SearchStandIn."""
+    monkeypatch.setattr(settings, "search_cache_enabled", False)
+    monkeypatch.setattr(tavily_service, "_search_semaphore", None)
+    
+    def install(release=None):
+        searches = SearchStandIn(release)
+        client = AsyncSearchClient(api_key="test", transport=httpx.MockTransport(searches))
+        monkeypatch.setattr(search_client, "_search_client", client)
+        searches.queries = [query for _, query in planned_queries()]
+        return searches
+    
+    return install
+
+
+def new_session():
+    crew = RetreatPlannerCrew()
+    crew.requirements = dict(REQUIREMENTS)
+    main.crew_instances[crew.session_id] = crew
+    return crew
+
+
+def sse_events(body):
+    events = []
+    for message in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_emits_batches_in_query_order_without_duplicates(stand_in):
+    searches = stand_in()
+    crew = new_session()
+    
+    response = TestClient(main.app).post(
+        "/api/v1/discover-options/stream", params={"session_id": crew.session_id}
+    )
+    assert response.status_code == 200
+    events = sse_events(response.text)
+    
+    # Searches ran concurrently and finished in reverse, yet batches are in order
+    assert searches.max_active > 1
+    assert [name for name, _ in events] == ["items"] * len(searches.queries) + ["summary"]
+    assert [data["query"] for _, data in events[:-1]] == searches.queries
+    
+    streamed = [item["item_id"] for _, data in events[:-1] for item in data["items"]]
+    assert len(streamed) == len(set(streamed))
+    # Each category's second query repeats two of the first query's three results
+    assert len(streamed) == 4 * len(crew.discovery_agent.CATEGORIES)
+    
+    summary = events[-1][1]
+    assert summary["items_count"] == len(streamed)
+    assert [item["item_id"] for item in crew.discovered_items] == streamed
+
+
+def test_stream_matches_batch_discovery(stand_in):
+    stand_in()
+    crew = new_session()
+    response = TestClient(main.app).post(
+        "/api/v1/discover-options/stream", params={"session_id": crew.session_id}
+    )
+    streamed = [item["item_id"] for item in crew.discovered_items]
+    assert response.status_code == 200
+    
+    stand_in()
+    batch = new_session()
+    response = TestClient(main.app).post(
+        "/api/v1/discover-options", params={"session_id": batch.session_id}
+    )
+    assert response.status_code == 200
+    assert [item["item_id"] for item in response.json()["items"]] == streamed
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_remaining_searches(stand_in):
+    release = asyncio.Event()
+    searches = stand_in(release)
+    crew = new_session()
+    
+    stream = crew.discovery_agent.discover_stream(REQUIREMENTS)
+    first = await stream.__anext__()
+    assert first["index"] == 0
+    
+    # The consumer leaves (as on a client disconnect) while the rest still wait
+    await stream.aclose()
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert searches.cancelled == len(searches.queries) - 1
@@ -0,0 +1,86 @@
+import pytest
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.diversity import iter_mmr, iter_quota
+
+
+def random_candidates(rng, count, categories=3, keys_per_category=3):
+    """Candidates in descending score order, with frequent score and key ties."""
+    scores = sorted((rng.randint(40, 100) for _ in range(count)), reverse=True)
+    return [
+        (score, tuple(f"c{c}k{rng.randrange(keys_per_category)}" for c in range(categories)), index)
+        for index, score in enumerate(scores)
+    ]
+
+
+def naive_mmr(candidates, lambda_, pool_limit):
+    """MMR over the first pool_limit candidates, rescoring everything each pick."""
+    pool = list(candidates[:pool_limit])
+    picked = []
+    while pool:
+        def value(candidate):
+            similarity = max(
+                (sum(a == b for a, b in zip(candidate[1], other[1])) / len(candidate[1]) for other in picked),
+                default=0.0
+            )
+            return lambda_ * candidate[0] / 100 - (1 - lambda_) * similarity
+        
+        # max() keeps the first of equal values, i.e. the higher-ranked candidate
+        best = max(pool, key=value)
+        pool.remove(best)
+        picked.append(best)
+    return picked
+
+
+def naive_quota(candidates, quota, pool_limit):
+    """Greedy quota over the first pool_limit candidates, then the rest in order."""
+    pool, rest = candidates[:pool_limit], candidates[pool_limit:]
+    usage = {}
+    accepted = []
+    for candidate in pool:
+        if all(usage.get(key, 0) < quota for key in candidate[1]):
+            for key in candidate[1]:
+                usage[key] = usage.get(key, 0) + 1
+            accepted.append(candidate)
+    return accepted + [c for c in pool if c not in accepted] + rest
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_mmr_matches_naive_order(seed):
+    rng = random.Random(seed)
+    candidates = random_candidates(rng, rng.randint(1, 80))
+    lambda_ = rng.choice([0.0, 0.3, 0.5, 0.7, 1.0])
+    pool_limit = rng.choice([5, 40, 1000])
+    
+    result = list(iter_mmr(iter(candidates), lambda_, pool_limit))
+    assert result == naive_mmr(candidates, lambda_, pool_limit)
+
+
+def test_mmr_with_lambda_one_keeps_score_order():
+    candidates = random_candidates(random.Random(3), 50)
+    assert list(iter_mmr(iter(candidates), 1.0, 1000)) == candidates
+
+
+def test_mmr_pulls_lazily():
+    candidates = random_candidates(random.Random(5), 500)
+    stream = iter(candidates)
+    first = next(iter_mmr(stream, 0.7, 1000))
+    
+    assert first == candidates[0]
+    assert len(list(stream)) > 400  # Most of the stream was never pulled
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_quota_matches_naive_order(seed):
+    rng = random.Random(seed)
+    candidates = random_candidates(rng, rng.randint(1, 80))
+    quota = rng.randint(1, 4)
+    pool_limit = rng.choice([5, 40, 1000])
+    
+    result = list(iter_quota(iter(candidates), quota, pool_limit))
+    assert result == naive_quota(candidates, quota, pool_limit)
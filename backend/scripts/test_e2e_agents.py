@@ -74,8 +74,8 @@ async def test_full_workflow_e2e(mock_requirements, mock_discovered_items):
     """Test the full 5-agent workflow with mocks where necessary."""
     
     with patch('src.agents.requirements_analyst.Agent'), \
-         patch('src.agents.requirements_analyst.Crew'), \
-         patch('src.agents.discovery_agent.TavilyClient'):
+         patch('src.agents.requirements_analyst.Task'), \
+         patch('src.agents.requirements_analyst.Crew'):
         
         # 1. Setup Crew
         crew = RetreatPlannerCrew()
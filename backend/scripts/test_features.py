@@ -0,0 +1,110 @@
+import pytest
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.ranking_agent import RankingAgent
+from src.services.features import (
+    CATEGORY_FEATURES,
+    FEATURE_BITS,
+    item_feature_bits,
+    parse_must_have,
+    satisfies,
+)
+
+
+def matches(category, metadata, must_have):
+    constraint = parse_must_have(must_have)
+    assert constraint["category"] == category
+    return satisfies(*item_feature_bits(category, metadata), constraint["mask"])
+
+
+def test_amenities_are_matched_through_synonyms():
+    metadata = {"amenities": ["Wi-Fi", "Gym", "Pool"]}
+    assert matches("hotels", metadata, "wifi and a fitness center")
+    assert matches("hotels", metadata, "hotel with pool")
+    assert not matches("hotels", metadata, "hotel with spa")
+
+
+@pytest.mark.parametrize("must_have", ["meeting room", "Hotel with meeting rooms", "meeting space"])
+def test_meeting_room_asks_for_the_meeting_rooms_category(must_have):
+    constraint = parse_must_have(must_have)
+    assert constraint["category"] == "meeting_rooms"
+    assert constraint["mask"] == 0
+    assert matches("meeting_rooms", {"equipment": []}, must_have)
+
+
+def test_conference_room_is_a_hotel_amenity():
+    assert parse_must_have("conference rooms")["mask"] == FEATURE_BITS[("hotels", "conference room")]
+    assert matches("hotels", {"amenities": ["Conference Room"]}, "hotel with conference room")
+    assert not matches("hotels", {"amenities": ["Spa"]}, "hotel with conference room")
+
+
+def test_meeting_room_features_are_still_matched():
+    assert matches("meeting_rooms", {"equipment": ["Projector"]}, "meeting room with projector")
+    assert not matches("meeting_rooms", {"equipment": ["Whiteboard"]}, "meeting room with projector")
+
+
+def test_category_must_have_is_reported_as_applied():
+    items = [
+        {"item_id": f"room-{n}", "category": "meeting_rooms", "metadata": {"equipment": equipment}}
+        for n, equipment in enumerate([[], ["Projector"]])
+    ]
+    report = RankingAgent().check_must_haves(items, {"must_haves": ["meeting room", "ocean view"]})
+    assert [(r["category"], r["applied"], r["items_total"], r["items_matched"]) for r in report] == [
+        ("meeting_rooms", True, 2, 2),
+        (None, False, 0, 0),
+    ]
+
+
+@pytest.mark.parametrize("rating, must_have, expected", [
+    (4, "4-star hotel", True),
+    (4, "4.5-star hotel", False),
+    (4.5, "4.5-star hotel", True),
+    (4.5, "4.5 stars", True),
+    (5, "4.5-star hotel", True),
+    (4.5, "5-star hotel", False),
+    (3.5, "3 star", True),
+    (4.5, "4.2-star hotel", True),  # Rounded up to the next half star
+    (4, "4.2-star hotel", False),
+])
+def test_star_ratings_including_half_stars(rating, must_have, expected):
+    assert matches("hotels", {"star_rating": rating}, must_have) is expected
+
+
+def test_out_of_range_stars_are_not_star_constraints():
+    assert parse_must_have("10-star service")["mask"] == 0
+    assert parse_must_have("0.5-star")["mask"] == 0
+
+
+def test_flights_nonstop():
+    assert matches("flights", {"stops": 0}, "direct flights")
+    assert not matches("flights", {"stops": 1}, "non-stop flights")
+
+
+def test_unknown_metadata_is_not_held_against_an_item():
+    assert matches("hotels", {}, "4-star hotel")
+    assert matches("hotels", {"star_rating": 5}, "hotel with spa")
+    # A listed amenity list does say something: a missing amenity fails
+    assert not matches("hotels", {"amenities": []}, "hotel with spa")
+
+
+def test_unrecognized_must_have_has_no_mask():
+    assert parse_must_have("ocean view") == {"constraint": "ocean view", "category": None, "mask": 0}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitset_matching_equals_set_matching(seed):
+    rng = random.Random(seed)
+    for category, key in (("hotels", "amenities"), ("meeting_rooms", "equipment"), ("catering", "dietary_options")):
+        vocabulary = [f for f in CATEGORY_FEATURES[category] if not f.endswith("-star")]
+        for _ in range(20):
+            listed = set(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+            wanted = set(rng.sample(vocabulary, rng.randint(1, 3)))
+            mask = sum(FEATURE_BITS[(category, f)] for f in wanted)
+            
+            has, known = item_feature_bits(category, {key: sorted(listed)})
+            assert satisfies(has, known, mask) == (wanted <= listed)
@@ -0,0 +1,95 @@
+import pytest
+import itertools
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.ranking_agent import RankingAgent
+from src.services.package_search import pareto_frontier
+
+
+REQUIREMENTS = {"attendees": 20, "duration": "3 days", "location": "Miami", "budget": 40000}
+
+
+def non_dominated(points):
+    """(cost, value) pairs no other pair beats on one side and matches on the other."""
+    points = set(points)
+    return {
+        (cost, value) for cost, value in points
+        if not any(
+            other_cost <= cost and other_value >= value and (other_cost, other_value) != (cost, value)
+            for other_cost, other_value in points
+        )
+    }
+
+
+def catalog(rng):
+    """Near-identical items, so distinct packages round to the same final_score.
+    
+    Prices are a few dollars apart and ratings a thousandth of a star apart.
+    """
+    items = []
+    for category in RankingAgent.CATEGORIES:
+        for n in range(rng.randint(1, 4)):
+            items.append({
+                "item_id": f"{category}-{n}",
+                "category": category,
+                "vendor": f"{category}-vendor-{n}",
+                "title": f"{category} option {n}",
+                "price": 1000 + rng.randint(0, 20) * 5,
+                "metadata": {"capacity": 20},
+                "trust_score": {"rating": 4 + rng.randint(0, 20) * 0.001},
+            })
+    return items
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_pareto_frontier_matches_brute_force(seed):
+    rng = random.Random(seed)
+    dims = rng.randint(1, 4)
+    columns = [[rng.randint(0, 9) for _ in range(rng.randint(1, 5))] for _ in range(dims)]
+    costs = [[rng.randint(0, 20) for _ in column] for column in columns]
+    
+    frontier = pareto_frontier(columns, costs)
+    
+    for cost, value, combo in frontier:
+        assert cost == sum(costs[d][i] for d, i in enumerate(combo))
+        assert value == sum(columns[d][i] for d, i in enumerate(combo))
+    pairs = [(cost, value) for cost, value, _ in frontier]
+    assert len(pairs) == len(set(pairs))
+    assert pairs == sorted(pairs)
+    
+    every = [
+        (sum(costs[d][i] for d, i in enumerate(combo)), sum(columns[d][i] for d, i in enumerate(combo)))
+        for combo in itertools.product(*(range(len(column)) for column in columns))
+    ]
+    assert set(pairs) == non_dominated(every)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_frontier_matches_brute_force_over_returned_scores(seed):
+    rng = random.Random(seed)
+    agent = RankingAgent()
+    items = catalog(rng)
+    
+    frontier = agent.frontier(items, REQUIREMENTS)["packages"]
+    
+    grouped = agent._group_for_packages(items, REQUIREMENTS)
+    every = [
+        agent._score_package(dict(zip(agent.CATEGORIES, combo)), REQUIREMENTS, None)
+        for combo in itertools.product(*(grouped[cat] for cat in agent.CATEGORIES))
+    ]
+    scored = {package["package_id"]: package for package in every}
+    
+    pairs = [(package["total_cost"], package["final_score"]) for package in frontier]
+    # No two frontier packages share a (total_cost, final_score) point
+    assert len(pairs) == len(set(pairs))
+    assert pairs == sorted(pairs)
+    assert set(pairs) == non_dominated((p["total_cost"], p["final_score"]) for p in every)
+    
+    for package in frontier:
+        assert scored[package["package_id"]]["final_score"] == package["final_score"]
+        assert scored[package["package_id"]]["total_cost"] == package["total_cost"]
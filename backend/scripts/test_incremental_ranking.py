@@ -0,0 +1,102 @@
+import pytest
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents.ranking_agent import RankingAgent
+
+
+REQUIREMENTS = {
+    "attendees": 20,
+    "duration": "3 days",
+    "location": "Miami",
+    "budget": 30000,
+    "must_haves": ["hotel with pool", "vegetarian options"],
+}
+
+FEATURES = {
+    "hotels": ("amenities", ["Pool", "WiFi", "Spa"]),
+    "meeting_rooms": ("equipment", ["Projector", "Whiteboard"]),
+    "catering": ("dietary_options", ["Vegetarian", "Vegan", "Halal"]),
+}
+
+
+def discovery_batches(rng):
+    """Items as discovery returns them: one batch per search, in search order.
+    
+    Prices and ratings come from short lists, so many packages tie on score
+    and only discovery order can break the ties.
+    """
+    batches = []
+    for index in range(rng.randint(2, 6)):
+        batch = []
+        for n in range(rng.randint(0, 4)):
+            category = rng.choice(RankingAgent.CATEGORIES)
+            metadata = {"capacity": rng.choice([15, 20, 30])}
+            if category in FEATURES:
+                key, names = FEATURES[category]
+                metadata[key] = rng.sample(names, rng.randint(0, len(names)))
+            batch.append({
+                "item_id": f"{category}-{index}-{n}",
+                "category": category,
+                "vendor": f"vendor-{rng.randint(0, 3)}",
+                "title": f"{category} option {index}-{n}",
+                "price": rng.choice([800, 1200, 2500]),
+                "metadata": metadata,
+                "trust_score": {"rating": rng.choice([3, 4, 5])},
+            })
+        batches.append(batch)
+    return batches
+
+
+def summary(packages):
+    return [
+        (p["rank"], p["package_id"], p["final_score"], p["total_cost"], p["category_scores"])
+        for p in packages
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(40))
+async def test_random_arrival_order_matches_batch_ranking(seed):
+    rng = random.Random(seed)
+    agent = RankingAgent()
+    batches = discovery_batches(rng)
+    items = [item for batch in batches for item in batch]
+    
+    ranking = agent.incremental(REQUIREMENTS, top_k=10)
+    arrivals = list(enumerate(batches))
+    rng.shuffle(arrivals)
+    for index, batch in arrivals:
+        ranking.add_items(batch, order=index)
+    
+    everything = await agent.rank(items, REQUIREMENTS, top_k=10 ** 6)
+    
+    assert summary(ranking.iter_ranked()) == summary(everything)
+    if ranking.items_ranked:
+        assert summary(ranking.packages()) == summary(everything[:10])
+    else:
+        # Every item failed a must-have: nothing beyond the placeholders yet
+        assert ranking.packages() == []
+
+
+@pytest.mark.asyncio
+async def test_items_failing_must_haves_are_dropped():
+    agent = RankingAgent()
+    ranking = agent.incremental(REQUIREMENTS)
+    pool = {
+        "item_id": "hotels-pool", "category": "hotels", "price": 1000,
+        "metadata": {"amenities": ["Pool"]}, "trust_score": {"rating": 4},
+    }
+    spa = {
+        "item_id": "hotels-spa", "category": "hotels", "price": 900,
+        "metadata": {"amenities": ["Spa"]}, "trust_score": {"rating": 5},
+    }
+    
+    assert ranking.add_items([spa, pool]) == 1
+    ranked = list(ranking.iter_ranked())
+    assert [p["items"]["hotels"]["item_id"] for p in ranked] == ["hotels-pool"]
+    assert summary(ranked) == summary(await agent.rank([spa, pool], REQUIREMENTS))
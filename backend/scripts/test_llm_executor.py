@@ -0,0 +1,133 @@
+import pytest
+import asyncio
+import threading
+import time
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.llm_executor import BoundedExecutor
+
+
+class SleepingCall:
+    """A blocking call that holds its thread until released."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = []
+        self.finished = []
+    
+    def __call__(self, name):
+        self.started.append(name)
+        self.release.wait(5)
+        self.finished.append(name)
+        return name
+
+
+async def until(condition, timeout=5.0):
+    """Wait for a condition another thread makes true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.001)
+
+
+@pytest.fixture
+def executor():
+    pool = BoundedExecutor(1, name="test")
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_running_call_past_its_timeout_is_abandoned(executor):
+    call = SleepingCall()
+    slow = asyncio.ensure_future(executor.run(call, "slow", timeout=0.2))
+    await until(lambda: call.started == ["slow"])
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await slow
+    
+    # Threads cannot be interrupted: it keeps its worker until it returns
+    stats = executor.stats()
+    assert stats["timeouts"] == 1
+    assert stats["running"] == 1 and stats["queued"] == 0
+    
+    call.release.set()
+    await until(lambda: executor.stats()["running"] == 0)
+    assert call.finished == ["slow"]
+    assert executor.stats()["completed"] == 0
+    
+    # The worker is free again
+    assert await executor.run(call, "next", timeout=1) == "next"
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_call_past_its_timeout_never_runs(executor):
+    call = SleepingCall()
+    busy = asyncio.ensure_future(executor.run(call, "busy"))
+    await until(lambda: call.started == ["busy"])
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await executor.run(call, "queued", timeout=0.05)
+    assert executor.stats()["queued"] == 0
+    
+    call.release.set()
+    assert await busy == "busy"
+    assert call.started == ["busy"]
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["timeouts"]) == (2, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_abandons_its_queued_call(executor):
+    call = SleepingCall()
+    busy = asyncio.ensure_future(executor.run(call, "busy"))
+    await until(lambda: call.started == ["busy"])
+    
+    waiting = asyncio.ensure_future(executor.run(call, "queued"))
+    await until(lambda: executor.stats()["queued"] == 1)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert executor.stats()["queued"] == 0
+    
+    call.release.set()
+    await busy
+    assert call.started == ["busy"]
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_and_average_wait(executor):
+    call = SleepingCall()
+    first = asyncio.ensure_future(executor.run(call, 0))
+    await until(lambda: call.started == [0])
+    
+    rest = [asyncio.ensure_future(executor.run(call, n)) for n in (1, 2)]
+    await until(lambda: executor.stats()["queued"] == 2)
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"], stats["max_queue_depth"]) == (1, 2, 2)
+    
+    # The two queued calls wait at least as long as the first one holds the worker
+    await asyncio.sleep(0.2)
+    call.release.set()
+    assert await asyncio.gather(first, *rest) == [0, 1, 2]
+    
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"], stats["completed"]) == (0, 0, 3)
+    assert stats["max_queue_depth"] == 2
+    assert 2 * 200 / 3 <= stats["avg_queue_wait_ms"] < 5000
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_are_counted_and_raised(executor):
+    def fail():
+        raise ValueError("bad response")
+    
+    with pytest.raises(ValueError):
+        await executor.run(fail)
+    stats = executor.stats()
+    assert (stats["failed"], stats["completed"], stats["running"]) == (1, 0, 0)
@@ -0,0 +1,75 @@
+import pytest
+import itertools
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.package_search import iter_top_combinations, iter_top_combinations_within
+
+
+def random_columns(rng, dims, max_items):
+    """Descending per-category values; small integers so ties are common and sums exact."""
+    return [
+        sorted((rng.randint(0, 9) for _ in range(rng.randint(1, max_items))), reverse=True)
+        for _ in range(dims)
+    ]
+
+
+def random_costs(rng, columns):
+    return [[rng.randint(0, 20) for _ in column] for column in columns]
+
+
+def brute_force(columns, costs=None, limit=None):
+    """Every combination (within limit) ordered by descending total, ties by index tuple."""
+    combos = itertools.product(*(range(len(column)) for column in columns))
+    if limit is not None:
+        combos = (c for c in combos if sum(costs[d][i] for d, i in enumerate(c)) <= limit)
+    ranked = [(sum(columns[d][i] for d, i in enumerate(combo)), combo) for combo in combos]
+    return sorted(ranked, key=lambda entry: (-entry[0], entry[1]))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_brute_force_order(seed):
+    rng = random.Random(seed)
+    columns = random_columns(rng, dims=rng.randint(1, 4), max_items=5)
+    
+    assert list(iter_top_combinations(columns)) == brute_force(columns)
+
+
+def test_prefix_is_the_brute_force_top_k():
+    rng = random.Random(7)
+    columns = random_columns(rng, dims=4, max_items=6)
+    
+    top = list(itertools.islice(iter_top_combinations(columns), 10))
+    assert top == brute_force(columns)[:10]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_within_limit_matches_brute_force_order(seed):
+    rng = random.Random(seed)
+    columns = random_columns(rng, dims=rng.randint(1, 4), max_items=5)
+    costs = random_costs(rng, columns)
+    limit = rng.randint(0, 20 * len(columns))
+    
+    assert list(iter_top_combinations_within(columns, costs, limit)) == brute_force(columns, costs, limit)
+
+
+def test_within_limit_without_bound_matches_unconstrained_search():
+    rng = random.Random(11)
+    columns = random_columns(rng, dims=3, max_items=6)
+    costs = random_costs(rng, columns)
+    
+    assert list(iter_top_combinations_within(columns, costs, float("inf"))) == list(iter_top_combinations(columns))
+
+
+def test_within_limit_below_cheapest_package_yields_nothing():
+    assert list(iter_top_combinations_within([[5, 3], [4]], [[10, 8], [6]], 13)) == []
+
+
+def test_empty_inputs_yield_nothing():
+    assert list(iter_top_combinations([])) == []
+    assert list(iter_top_combinations([[3, 1], []])) == []
+    assert list(iter_top_combinations_within([[3, 1], []], [[1, 1], []], 10)) == []
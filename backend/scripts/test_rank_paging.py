@@ -0,0 +1,134 @@
+import pytest
+import random
+import sys
+import os
+
+from fastapi.testclient import TestClient
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src import main
+from src.crew.retreat_crew import RetreatPlannerCrew
+from src.utils.ids import decode_cursor, encode_cursor, make_item_id, make_package_id
+
+
+REQUIREMENTS = {"attendees": 20, "duration": "3 days", "location": "Miami", "budget": 60000}
+
+RANK_URL = "/api/v1/rank-packages"
+
+
+def catalog(seed, per_category=3):
+    """per_category items in each category (81 packages to page through by default)."""
+    rng = random.Random(seed)
+    items = []
+    for category in ("flights", "hotels", "meeting_rooms", "catering"):
+        for n in range(per_category):
+            source = f"https://{category}-{n}.example.com"
+            items.append({
+                "item_id": make_item_id(category, source),
+                "category": category,
+                "vendor": f"{category}-vendor-{n}",
+                "source": source,
+                "title": f"{category} option {n}",
+                "description": "",
+                "price": rng.randint(500, 20000),
+                "metadata": {"capacity": rng.randint(10, 40)},
+                "trust_score": {"rating": rng.randint(2, 5), "source": "test"},
+            })
+    return items
+
+
+def new_session(items):
+    crew = RetreatPlannerCrew()
+    crew.requirements = dict(REQUIREMENTS)
+    crew.discovered_items = [dict(item) for item in items]
+    main.crew_instances[crew.session_id] = crew
+    return crew.session_id
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def rank(client, session_id, **params):
+    body = params.pop("weights", None)
+    return client.post(RANK_URL, params={"session_id": session_id, **params}, json=body)
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("abc123", 40)) == ("abc123", 40)
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("abc123", -1))
+
+
+def test_same_inputs_give_the_same_package_ids(client):
+    items = catalog(1)
+    first = rank(client, new_session(items), limit=20).json()["packages"]
+    second = rank(client, new_session(list(reversed(items))), limit=20).json()["packages"]
+    
+    assert [p["package_id"] for p in first] == [p["package_id"] for p in second]
+    for package in first:
+        member_ids = [item["item_id"] for item in package["items"].values()]
+        assert package["package_id"] == make_package_id(member_ids)
+
+
+def test_pages_follow_their_cursor(client):
+    session_id = new_session(catalog(2))
+    whole = rank(client, session_id, limit=12).json()
+    
+    first = rank(client, session_id, limit=5).json()
+    assert first["offset"] == 0 and first["next_cursor"]
+    
+    second = rank(client, session_id, limit=7, cursor=first["next_cursor"]).json()
+    assert second["offset"] == 5
+    
+    paged = first["packages"] + second["packages"]
+    assert [p["package_id"] for p in paged] == [p["package_id"] for p in whole["packages"]]
+    assert [p["rank"] for p in paged] == list(range(1, 13))
+
+
+def test_last_page_has_no_cursor(client):
+    session_id = new_session(catalog(3, per_category=2))
+    assert rank(client, session_id, limit=10).json()["next_cursor"]
+    
+    response = rank(client, session_id, limit=10, offset=10).json()
+    assert len(response["packages"]) == 6
+    assert response["next_cursor"] is None
+
+
+def test_changed_ranking_makes_cursor_stale(client):
+    session_id = new_session(catalog(4))
+    cursor = rank(client, session_id, limit=5).json()["next_cursor"]
+    
+    # Re-ranking with other weights replaces the ranking the cursor points into
+    reranked = rank(client, session_id, limit=5, weights={"category_importance": {"flights": 70, "hotels": 10}})
+    assert reranked.status_code == 200
+    
+    response = rank(client, session_id, limit=5, cursor=cursor)
+    assert response.status_code == 409
+
+
+@pytest.mark.parametrize("change", [
+    {"weights": {"category_importance": {"flights": 70, "hotels": 10}}},
+    {"within_budget": True},
+    {"diversity": "mmr"},
+    {"vendor_quota": 2},
+])
+def test_paging_rejects_weight_and_option_changes(client, change):
+    session_id = new_session(catalog(5))
+    cursor = rank(client, session_id, limit=5).json()["next_cursor"]
+    
+    response = rank(client, session_id, limit=5, cursor=cursor, **change)
+    assert response.status_code == 400
+    assert "Paging cannot change" in response.json()["detail"]
+
+
+def test_malformed_cursor_is_rejected(client):
+    session_id = new_session(catalog(6))
+    rank(client, session_id, limit=5)
+    
+    assert rank(client, session_id, cursor="%%%").status_code == 400
@@ -0,0 +1,104 @@
+import pytest
+import copy
+import random
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config import settings
+from src.crew import retreat_crew
+from src.crew.retreat_crew import RetreatPlannerCrew, ranking_cache_stats
+
+
+REQUIREMENTS = {"attendees": 20, "duration": "3 days", "location": "Miami", "budget": 60000}
+
+
+def catalog(seed, per_category=3):
+    rng = random.Random(seed)
+    return [
+        {
+            "item_id": f"{category}-{seed}-{n}",
+            "category": category,
+            "vendor": f"{category}-vendor-{n}",
+            "title": f"{category} option {n}",
+            "price": rng.randint(500, 20000),
+            "metadata": {"capacity": rng.randint(10, 40)},
+            "trust_score": {"rating": rng.randint(2, 5)},
+        }
+        for category in ("flights", "hotels", "meeting_rooms", "catering")
+        for n in range(per_category)
+    ]
+
+
+def new_session(items):
+    crew = RetreatPlannerCrew()
+    crew.requirements = dict(REQUIREMENTS)
+    crew.discovered_items = copy.deepcopy(items)
+    return crew
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    """Start every test with an empty shared cache and zeroed session counters."""
+    monkeypatch.setattr(settings, "ranking_cache_enabled", True)
+    monkeypatch.setattr(retreat_crew, "_ranking_cache", None)
+    monkeypatch.setattr(retreat_crew, "_session_ranking_lookups", {"hits": 0, "misses": 0})
+
+
+@pytest.mark.asyncio
+async def test_mutating_one_sessions_packages_does_not_leak_into_another():
+    items = catalog(1)
+    first = new_session(items)
+    packages = await first.run_ranking_agent()
+    expected = copy.deepcopy(packages)
+    
+    # Everything a session (or its API caller) may do to its own ranking
+    first.ranking_agent.explain(packages[0], first.requirements)
+    packages[0]["final_score"] = -1
+    packages[1]["items"]["hotels"]["title"] = "Changed"
+    packages.append({"package_id": "extra"})
+    first.must_have_report.append({"must_have": "extra"})
+    
+    second = new_session(items)
+    reused = await second.run_ranking_agent()
+    assert ranking_cache_stats()["shared"]["hits"] == 1
+    assert reused == expected
+    assert second.must_have_report == []
+    
+    # Nor do the second session's changes reach a third
+    reused[0]["category_scores"]["flights"] = 0
+    third = new_session(items)
+    assert await third.run_ranking_agent() == expected
+    assert ranking_cache_stats()["shared"]["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_repeating_a_ranking_hits_the_session_cache():
+    crew = new_session(catalog(2))
+    packages = await crew.run_ranking_agent()
+    
+    assert await crew.run_ranking_agent() is packages
+    stats = ranking_cache_stats()
+    assert stats["session"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+    assert stats["shared"]["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_replacing_discovered_items_invalidates_session_rankings():
+    crew = new_session(catalog(3))
+    stale = await crew.run_ranking_agent()
+    assert len(crew._rankings) == 1
+    
+    crew.discovered_items = catalog(4)
+    assert len(crew._rankings) == 0
+    
+    packages = await crew.run_ranking_agent()
+    assert ranking_cache_stats()["session"]["hits"] == 0
+    new_ids = {item["item_id"] for item in catalog(4)}
+    assert all(
+        item["item_id"] in new_ids
+        for package in packages for item in package["items"].values()
+    )
+    assert packages != stale
@@ -0,0 +1,137 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.agents import requirements_analyst
+from src.agents.requirements_analyst import (
+    RequirementsAnalystAgent,
+    normalize_request,
+    requirements_cache_stats,
+)
+from src.config import settings
+
+
+REQUEST = "We need a 3 day offsite in Austin for 25 people, budget $60,000."
+
+
+class LLMStandIn:
+    """Replaces the LLM call, counting calls and returning a fixed path."""
+    
+    def __init__(self, path="llm"):
+        self.path = path
+        self.calls = []
+    
+    async def analyze(self, user_input):
+        self.calls.append(user_input)
+        return {
+            "attendees": 25,
+            "duration": "3 days",
+            "location": "Austin, TX",
+            "budget": 60000,
+            "must_haves": ["wifi"],
+        }, self.path
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Empty memory-only cache, every request sent to a stand-in LLM."""
+    monkeypatch.setattr(requirements_analyst, "_requirements_cache", None)
+    monkeypatch.setattr(settings, "requirements_cache_enabled", True)
+    monkeypatch.setattr(settings, "requirements_cache_path", "")
+    monkeypatch.setattr(settings, "requirements_fast_path_enabled", False)
+    
+    def install(path="llm"):
+        stand_in = LLMStandIn(path)
+        monkeypatch.setattr(RequirementsAnalystAgent, "_analyze_with_llm", stand_in.analyze)
+        return stand_in
+    
+    return install
+
+
+@pytest.mark.parametrize("variant", [
+    "we need a 3 day offsite in austin for 25 people, budget $60000",
+    "  We need a 3 day offsite in Austin for 25 people,\nbudget $ 60,000!",
+    "WE NEED A 3 DAY OFFSITE IN AUSTIN FOR 25 PEOPLE, BUDGET $60,000...",
+])
+def test_trivial_differences_normalize_alike(variant):
+    assert normalize_request(variant) == normalize_request(REQUEST)
+
+
+def test_different_requests_normalize_apart():
+    assert normalize_request(REQUEST) != normalize_request(REQUEST.replace("25", "250"))
+    assert normalize_request(REQUEST) != normalize_request(REQUEST.replace("Austin", "Boston"))
+
+
+@pytest.mark.asyncio
+async def test_rephrased_request_hits_the_cache(llm):
+    stand_in = llm()
+    agent = RequirementsAnalystAgent()
+    
+    first_report = {}
+    first = await agent.analyze(REQUEST, report=first_report)
+    assert first_report["path"] == "llm"
+    
+    report = {}
+    again = await agent.analyze("  we need a 3 day offsite in AUSTIN for 25 people, budget $ 60000 ", report=report)
+    assert again == first
+    assert len(stand_in.calls) == 1
+    assert report["path"] == "cache"
+    assert report["cached_path"] == "llm"
+    assert report["confidence"] == first_report["confidence"]
+    
+    stats = requirements_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_cached_requirements_are_copies(llm):
+    llm()
+    agent = RequirementsAnalystAgent()
+    
+    first = await agent.analyze(REQUEST)
+    first["must_haves"].append("pool")
+    first["attendees"] = 1
+    
+    again = await agent.analyze(REQUEST)
+    assert again["must_haves"] == ["wifi"]
+    assert again["attendees"] == 25
+
+
+@pytest.mark.asyncio
+async def test_fallback_results_are_not_cached(llm):
+    stand_in = llm(path="fallback")
+    agent = RequirementsAnalystAgent()
+    
+    report = {}
+    await agent.analyze(REQUEST, report=report)
+    assert report["path"] == "fallback"
+    assert requirements_cache_stats()["size"] == 0
+    
+    # The next request tries the LLM again, and caches what it returns
+    stand_in.path = "llm"
+    report = {}
+    await agent.analyze(REQUEST, report=report)
+    assert report["path"] == "llm"
+    assert len(stand_in.calls) == 2
+    
+    report = {}
+    await agent.analyze(REQUEST, report=report)
+    assert report["path"] == "cache"
+    assert len(stand_in.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_analyzes(llm, monkeypatch):
+    stand_in = llm()
+    monkeypatch.setattr(settings, "requirements_cache_enabled", False)
+    agent = RequirementsAnalystAgent()
+    
+    for _ in range(2):
+        report = {}
+        await agent.analyze(REQUEST, report=report)
+        assert report["path"] == "llm"
+    assert len(stand_in.calls) == 2
+    assert requirements_cache_stats() is None
@@ -0,0 +1,66 @@
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.requirements_parser import parse_requirements
+
+
+def test_location_stops_at_sentence_end():
+    result = parse_requirements("Plan a 2-day retreat in Las Vegas. Budget $60,000 for 50 managers.")
+    assert result["requirements"]["location"] == "Las Vegas"
+    assert result["confidence"]["location"] == 1.0
+
+
+def test_origin_stops_at_sentence_end():
+    result = parse_requirements("Retreat for 20 people flying from Boston. Need a hotel in Miami, 3 days, $30k budget.")
+    assert result["requirements"]["origin"] == "Boston"
+    assert result["requirements"]["location"] == "Miami"
+
+
+def test_destination_drops_trailing_period():
+    assert parse_requirements("Destination: Seattle.")["requirements"]["location"] == "Seattle"
+
+
+@pytest.mark.parametrize("text, location", [
+    ("Offsite for 30 people in St. Louis. 2 days, $40k.", "St. Louis"),
+    ("Retreat in Ft. Lauderdale for 20 people", "Ft. Lauderdale"),
+    ("Summit in Washington D.C. Budget $50,000 for 25 leaders, 2 days.", "Washington D.C."),
+    ("Team offsite in Austin, TX for 25 engineers, 3 days", "Austin, TX"),
+])
+def test_abbreviations_stay_in_place_names(text, location):
+    assert parse_requirements(text)["requirements"]["location"] == location
+
+
+@pytest.mark.parametrize("text", [
+    "Offsite in San Francisco for 25 people, 3 days, $50k.",
+    "Team retreat. Offsite in San Francisco for 25 people, 3 days, $50k.",
+    "DESTINATION: San Francisco. 25 people, 3 days, $50k.",
+])
+def test_trigger_words_match_in_any_case(text):
+    result = parse_requirements(text)
+    assert result["requirements"]["location"] == "San Francisco"
+    assert result["confidence"]["location"] == 1.0
+
+
+def test_places_must_still_be_capitalized():
+    result = parse_requirements("Offsite in person for 25 people, 3 days, $50k, in Denver")
+    assert result["requirements"]["location"] == "Denver"
+    assert result["confidence"]["location"] == 0.9
+
+
+def test_origin_is_scored_and_counts_towards_overall():
+    text = "Retreat in Denver for 10 people, 2 days, $20k, flights from Boston or from Chicago"
+    result = parse_requirements(text)
+    assert result["confidence"]["origin"] < 1.0
+    assert result["overall"] <= result["confidence"]["origin"]
+    assert "origin ambiguous" in result["reasons"]
+
+
+def test_missing_origin_does_not_lower_confidence():
+    result = parse_requirements("Company retreat in Denver for 80 employees, 4 days, $120,000 total")
+    assert result["requirements"]["origin"] is None
+    assert result["confidence"]["origin"] == 1.0
+    assert result["overall"] == 1.0
@@ -0,0 +1,204 @@
+import pytest
+import random
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services import scoring_kernel
+from src.services.scoring_service import ScoringService
+
+
+CATEGORIES = ["flights", "hotels", "meeting_rooms", "catering", "transport"]
+
+
+def random_item(rng, category):
+    """An item with the sparse, mixed-type fields discovery produces."""
+    metadata = {}
+    if rng.random() < 0.8:
+        metadata["capacity"] = rng.choice([rng.randint(1, 200), rng.uniform(1, 200)])
+    for key in ("amenities", "equipment", "dietary_options"):
+        if rng.random() < 0.8:
+            metadata[key] = ["x"] * rng.randint(0, 12)
+    
+    item = {"category": category, "metadata": metadata}
+    if rng.random() < 0.9:
+        item["price"] = rng.choice([0, rng.randint(1, 90000), rng.uniform(1, 90000)])
+    trust = rng.random()
+    if trust < 0.8:
+        item["trust_score"] = {"rating": rng.choice([rng.randint(0, 5), rng.uniform(0, 5)])}
+    elif trust < 0.9:
+        item["trust_score"] = {}
+    return item
+
+
+def random_weights(rng, category):
+    """Component weights: defaults, custom integers, or custom fractions."""
+    weights = {}
+    for _, key, default in scoring_kernel.components_for(category):
+        if key:
+            weights[key] = rng.choice([default, rng.randint(0, 60), rng.uniform(0, 1)])
+    return weights
+
+
+def reference_price_score(price, budget):
+    """The per-item price score formula the kernel replaced."""
+    if budget <= 0:
+        return 50
+    price_ratio = price / budget
+    if price_ratio > 0.5:
+        return max(0, 100 - (price_ratio * 150))
+    elif price_ratio > 0.3:
+        return 100 - (price_ratio * 100)
+    else:
+        return 100 - (price_ratio * 50)
+
+
+def reference_item_score(item, category, requirements, weights):
+    """The per-item category score formula the kernel replaced."""
+    price_score = reference_price_score(item.get("price", 0), requirements.get("budget", 100000))
+    
+    trust_rating = item.get("trust_score", {})
+    if isinstance(trust_rating, dict):
+        trust_score = trust_rating.get("rating", 3) * 20
+    else:
+        trust_score = 60
+    
+    metadata = item.get("metadata", {})
+    if category == "flights":
+        components = [
+            (price_score, weights.get("price_weight", 50)),
+            (75, weights.get("timing_weight", 25)),
+            (trust_score, weights.get("trust_weight", 15)),
+            (70, weights.get("comfort_weight", 10)),
+        ]
+    elif category == "hotels":
+        components = [
+            (price_score, weights.get("price_weight", 20)),
+            (trust_score, weights.get("trust_weight", 40)),
+            (85, weights.get("location_weight", 25)),
+            (min(100, len(metadata.get("amenities", [])) * 12), weights.get("amenities_weight", 15)),
+        ]
+    elif category == "meeting_rooms":
+        capacity = metadata.get("capacity", 50)
+        required_capacity = requirements.get("attendees", 50)
+        capacity_score = 100 if capacity >= required_capacity else (capacity / required_capacity) * 100
+        components = [
+            (price_score, weights.get("price_weight", 25)),
+            (capacity_score, weights.get("capacity_weight", 35)),
+            (min(100, len(metadata.get("equipment", [])) * 25), weights.get("equipment_weight", 25)),
+            (trust_score, weights.get("trust_weight", 15)),
+        ]
+    elif category == "catering":
+        components = [
+            (price_score, weights.get("price_weight", 30)),
+            (trust_score, weights.get("trust_weight", 30)),
+            (min(100, len(metadata.get("dietary_options", [])) * 20), weights.get("dietary_weight", 25)),
+            (80, weights.get("service_weight", 15)),
+        ]
+    else:
+        components = [(price_score, 50), (trust_score, 50)]
+    
+    final_score = 0
+    total_weight = 0
+    for score, weight in components:
+        final_score += score * weight
+        total_weight += weight
+    if total_weight > 0:
+        final_score = final_score / total_weight
+    return round(final_score, 2)
+
+
+def reference_package_score(category_scores, importance):
+    """The per-package score formula the kernel replaced (unrounded)."""
+    total_importance = sum(importance.get(cat, 0) for cat in category_scores)
+    if total_importance == 0:
+        total_importance = 100
+    return sum(
+        category_scores.get(cat, 0) * (importance.get(cat, 25) / total_importance)
+        for cat in category_scores
+    )
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_item_scores_match_per_item_formula(seed):
+    rng = random.Random(seed)
+    requirements = {}
+    if rng.random() < 0.9:
+        requirements["budget"] = rng.choice([0, rng.randint(1000, 200000), rng.uniform(1000, 200000)])
+    if rng.random() < 0.9:
+        requirements["attendees"] = rng.randint(1, 150)
+    
+    for category in CATEGORIES:
+        items = [random_item(rng, category) for _ in range(rng.randint(1, 30))]
+        weights = random_weights(rng, category)
+        
+        scores, _ = scoring_kernel.category_scores(items, category, requirements, weights)
+        
+        # Bit-for-bit, not approximately
+        assert scores.tolist() == [
+            reference_item_score(item, category, requirements, weights) for item in items
+        ]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_package_scores_match_per_package_formula(seed):
+    rng = random.Random(seed)
+    categories = rng.sample(CATEGORIES[:4], rng.randint(1, 4))
+    scores = {cat: [round(rng.uniform(0, 100), 2) for _ in range(rng.randint(1, 5))] for cat in categories}
+    importance = {
+        cat: rng.choice([0, rng.randint(1, 60), rng.uniform(0, 1)])
+        for cat in categories if rng.random() < 0.8
+    }
+    
+    grid = scoring_kernel.package_scores(
+        [np.array(scores[cat]) for cat in categories],
+        scoring_kernel.importance_shares(importance, categories)
+    )
+    
+    for index in np.ndindex(grid.shape):
+        package = {cat: scores[cat][i] for cat, i in zip(categories, index)}
+        assert grid[index] == reference_package_score(package, importance)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_scoring_service_helpers_match_original_formulas(seed):
+    rng = random.Random(seed)
+    for _ in range(200):
+        price = rng.choice([0, -5, rng.uniform(1, 50000), rng.randint(1, 50000)])
+        budget = rng.uniform(1000, 100000)
+        ratio = rng.choice([0.25, rng.uniform(0.05, 0.6)])
+        expected_price = budget * ratio
+        if price <= 0:
+            expected = 50
+        elif price <= expected_price * 0.5:
+            expected = 100
+        elif price <= expected_price:
+            expected = 100 - ((price / expected_price) * 30)
+        elif price <= expected_price * 1.5:
+            expected = 70 - ((price - expected_price) / expected_price * 40)
+        else:
+            expected = max(0, 30 - ((price - expected_price * 1.5) / expected_price * 30))
+        assert ScoringService.price_to_score(price, budget, ratio) == expected
+        
+        capacity, required = rng.randint(0, 300), rng.randint(1, 150)
+        if capacity >= required:
+            excess_ratio = capacity / required
+            expected = 100 if excess_ratio <= 1.2 else 90 if excess_ratio <= 1.5 else 80
+        else:
+            expected = (capacity / required) * 70
+        assert ScoringService.capacity_to_score(capacity, required) == expected
+        
+        rating = rng.choice([0, rng.uniform(0, 6)])
+        expected = 50 if rating <= 0 else min(100, (rating / 5.0) * 100)
+        assert ScoringService.rating_to_score(rating) == expected
+        
+        keys = ["price", "trust", "location", "amenities"][:rng.randint(1, 4)]
+        weights = {key: rng.choice([0, rng.randint(1, 60), rng.uniform(0, 1)]) for key in keys}
+        scores = {key: rng.uniform(0, 100) for key in keys if rng.random() < 0.9}
+        normalized = ScoringService.normalize_weights(weights)
+        expected = round(sum(scores.get(key, 0) * weight for key, weight in normalized.items()), 2)
+        assert ScoringService.calculate_weighted_score(scores, weights) == expected
@@ -0,0 +1,138 @@
+import pytest
+import asyncio
+import gc
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.services.single_flight import SingleFlight
+
+
+class Upstream:
+    """Counts calls and finishes only when released."""
+    
+    def __init__(self, result="result", error=None):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+        self.error = error
+    
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    upstream = Upstream()
+    
+    callers = [asyncio.ensure_future(flight.do("key", upstream)) for _ in range(5)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    
+    assert await asyncio.gather(*callers) == ["result"] * 5
+    assert upstream.calls == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 4, "unclaimed_errors": 0, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    upstream = Upstream()
+    
+    callers = [asyncio.ensure_future(flight.do(key, upstream)) for key in ("a", "b")]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    
+    await asyncio.gather(*callers)
+    assert upstream.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller_and_is_not_cached():
+    flight = SingleFlight()
+    upstream = Upstream(error=RuntimeError("boom"))
+    
+    callers = [asyncio.ensure_future(flight.do("key", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    
+    # The failed call is forgotten, so the next caller retries
+    retry = Upstream()
+    retry.release.set()
+    assert await flight.do("key", retry) == "result"
+    assert retry.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+    upstream = Upstream()
+    
+    leaving = asyncio.ensure_future(flight.do("key", upstream))
+    staying = asyncio.ensure_future(flight.do("key", upstream))
+    await asyncio.sleep(0)
+    
+    leaving.cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+    
+    assert await staying == "result"
+    assert leaving.cancelled()
+    assert upstream.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_when_every_caller_leaves():
+    flight = SingleFlight()
+    upstream = Upstream()
+    
+    callers = [asyncio.ensure_future(flight.do("key", upstream)) for _ in range(2)]
+    await asyncio.sleep(0)
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+    
+    assert flight.stats()["in_flight"] == 0
+    
+    # A new caller starts a fresh call instead of joining the abandoned one
+    fresh = Upstream()
+    fresh.release.set()
+    assert await flight.do("key", fresh) == "result"
+    assert upstream.calls == 1 and fresh.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_error_after_every_caller_left_is_retrieved():
+    flight = SingleFlight()
+    unretrieved = []
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(lambda _, context: unretrieved.append(context))
+    
+    async def ignores_cancellation():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            pass
+        raise RuntimeError("failed late")
+    
+    caller = asyncio.ensure_future(flight.do("key", ignores_cancellation))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.gather(caller, return_exceptions=True)
+    for _ in range(3):
+        await asyncio.sleep(0)
+    gc.collect()
+    
+    assert unretrieved == []
+    assert flight.stats()["unclaimed_errors"] == 1
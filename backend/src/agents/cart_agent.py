@@ -4,6 +4,8 @@ from typing import Dict, Any, List, Optional
 import uuid
 from datetime import datetime
 
+from src.utils.quantities import calculate_quantity
+
 
 class CartAgent:
     """Agent that builds and optimizes shopping carts from selected packages."""
@@ -34,7 +36,7 @@ class CartAgent:
         
         for category, item in items.items():
             price = item.get("price", 0)
-            quantity = self._calculate_quantity(category, item, requirements)
+            quantity = calculate_quantity(category, item, requirements)
             item_subtotal = price * quantity
             
             cart_items[category] = {
@@ -90,46 +92,6 @@ class CartAgent:
         else:
             return cart
     
-    def _calculate_quantity(
-        self,
-        category: str,
-        item: Dict[str, Any],
-        requirements: Dict[str, Any]
-    ) -> int:
-        """Calculate quantity needed based on category and requirements.
-        
-        Args:
-            category: Item category
-            item: Item dictionary
-            requirements: User requirements
-            
-        Returns:
-            Quantity needed
-        """
-        attendees = requirements.get("attendees", 50)
-        
-        # Extract duration in days
-        duration = requirements.get("duration", "2 days")
-        import re
-        days_match = re.search(r'(\d+)', duration)
-        num_days = int(days_match.group(1)) if days_match else 2
-        
-        if category == "flights":
-            # One flight per attendee (round trip typically priced together)
-            return attendees
-        elif category == "hotels":
-            # Rooms for all attendees (assuming double occupancy)
-            rooms = (attendees // 2) + (attendees % 2)
-            return rooms * num_days  # Room-nights
-        elif category == "meeting_rooms":
-            # One room for the duration
-            return num_days
-        elif category == "catering":
-            # Meals per person per day
-            return attendees * num_days
-        else:
-            return 1
-    
     def _calculate_savings(
         self,
         package: Dict[str, Any],
@@ -5,16 +5,22 @@ import uuid
 from datetime import datetime
 import os
 
-try:
-    import stripe
-except ImportError:
-    stripe = None
+
+def _load_stripe():
+    """Import the Stripe SDK on first use; None if it is not installed."""
+    try:
+        import stripe
+    except ImportError:
+        return None
+    return stripe
 
 
 class CheckoutAgent:
     """Agent that orchestrates checkout across multiple retailers."""
     
     def __init__(self):
+        # Imported here, not at module load, to keep it off the startup path
+        stripe = _load_stripe()
         if stripe:
             stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
     
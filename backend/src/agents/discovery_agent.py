@@ -1,17 +1,15 @@
 """Agent 2: Discovery Agent - Search and discover options using Tavily."""
 
-from typing import Dict, Any, List
-import os
+from typing import Dict, Any, List, AsyncIterator, Tuple
+import asyncio
 from datetime import datetime
 from urllib.parse import urlparse
 import re
 
-try:
-    from tavily import TavilyClient
-except ImportError:
-    TavilyClient = None
-
 from src.config import settings
+from src.services.features import item_feature_bits
+from src.services.tavily_service import TavilyService
+from src.utils.ids import make_item_id
 
 
 class DiscoveryAgent:
@@ -20,46 +18,131 @@ class DiscoveryAgent:
     CATEGORIES = ["flights", "hotels", "meeting_rooms", "catering"]
     
     def __init__(self):
-        if TavilyClient is None:
-            raise ImportError("tavily-python is required. Install with: pip install tavily-python")
-        
-        api_key = settings.tavily_api_key or os.getenv("TAVILY_API_KEY")
-        if not api_key:
-            raise ValueError("TAVILY_API_KEY is required")
-        
-        self.tavily_client = TavilyClient(api_key=api_key)
+        # Backed by the process-wide pooled search client
+        self.search_service = TavilyService()
         self.max_results = settings.max_search_results
+        
+        # Per-session cap on in-flight searches (one agent per session)
+        self._session_semaphore = asyncio.Semaphore(settings.search_session_concurrency)
     
     async def discover(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Search multiple vendors using Tavily.
         
+        All category queries are sent concurrently (bounded per session and
+        globally); results are merged in CATEGORIES/query order.
+        
         Args:
             requirements: Structured requirements from Agent 1
             
         Returns:
             List of discovered items across all categories
         """
+        searches = self._plan_searches(requirements)
+        
+        results = await asyncio.gather(*(
+            self._search_and_parse(category, query, requirements)
+            for category, query in searches
+        ))
+        
+        # Queries overlap, so the same listing can come back more than once
+        seen = set()
         all_items = []
+        for items in results:
+            all_items.extend(self._drop_seen(items, seen))
+        
+        return all_items
+    
+    async def discover_stream(
+        self,
+        requirements: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Search like discover(), yielding each query's items as soon as they are final.
+        
+        All searches run concurrently, but batches are released in
+        CATEGORIES/query order: a finished search waits for the ones before
+        it. Duplicates are therefore dropped in the same order as
+        discover(), so the streamed items match it exactly whatever order
+        the searches finish in.
         
-        for category in self.CATEGORIES:
-            queries = self._generate_queries(category, requirements)
+        Args:
+            requirements: Structured requirements from Agent 1
             
-            for query in queries:
-                try:
-                    results = self.tavily_client.search(
-                        query=query,
-                        search_depth="advanced",
-                        max_results=5
-                    )
-                    
-                    items = self._parse_results(category, results, requirements)
-                    all_items.extend(items)
-                except Exception as e:
-                    # Log error but continue with other queries
-                    print(f"Search error for '{query}': {e}")
-                    continue
+        Yields:
+            Batches with "index" (position in CATEGORIES/query order),
+            "category", "query" and "items" (items already yielded are dropped)
+        """
+        searches = self._plan_searches(requirements)
+        seen = set()
         
-        return all_items
+        tasks = [
+            asyncio.ensure_future(self._search_and_parse(category, query, requirements))
+            for category, query in searches
+        ]
+        try:
+            for index, task in enumerate(tasks):
+                category, query = searches[index]
+                yield {
+                    "index": index,
+                    "category": category,
+                    "query": query,
+                    "items": self._drop_seen(await task, seen)
+                }
+        finally:
+            # Consumer went away (e.g. client disconnected): stop remaining searches
+            for task in tasks:
+                task.cancel()
+    
+    def _drop_seen(self, items: List[Dict[str, Any]], seen: set) -> List[Dict[str, Any]]:
+        """Filter out items whose ID is in seen, recording the rest."""
+        fresh = []
+        for item in items:
+            if item["item_id"] not in seen:
+                seen.add(item["item_id"])
+                fresh.append(item)
+        return fresh
+    
+    def _plan_searches(self, requirements: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """List (category, query) pairs in stable CATEGORIES/query order."""
+        return [
+            (category, query)
+            for category in self.CATEGORIES
+            for query in self._generate_queries(category, requirements)
+        ]
+    
+    async def _search_and_parse(
+        self,
+        category: str,
+        query: str,
+        requirements: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run one search and parse its results.
+        
+        Identical searches from concurrent sessions share one upstream call
+        (see TavilyService.search); each caller parses its own copy.
+        
+        Args:
+            category: Category the query belongs to
+            query: Search query string
+            requirements: Requirements dictionary
+            
+        Returns:
+            Parsed items, or an empty list if the search failed
+        """
+        try:
+            # Bounds this session's searches, including ones joining another call
+            async with self._session_semaphore:
+                results = await self.search_service.search(
+                    query,
+                    search_depth="advanced",
+                    max_results=5,
+                    category=category
+                )
+            
+            return self._parse_results(category, results, requirements)
+        except Exception as e:
+            # Log error but continue with other queries
+            print(f"Search error for '{query}': {e}")
+            return []
     
     def _generate_queries(
         self, 
@@ -122,18 +205,20 @@ class DiscoveryAgent:
             List of standardized item dictionaries
         """
         items = []
-        timestamp = int(datetime.now().timestamp())
         
         for idx, result in enumerate(results.get("results", [])[:3]):
             url = result.get("url", "")
             content = result.get("content", "")
             
+            title = result.get("title", f"{category.replace('_', ' ').title()} Option {idx + 1}")
+            
             item = {
-                "item_id": f"{category}_{idx:03d}_{timestamp}",
+                # Content-addressed, so repeat results share one ID
+                "item_id": make_item_id(category, url or title),
                 "category": category,
                 "vendor": self._extract_vendor(url),
                 "source": url,
-                "title": result.get("title", f"{category.replace('_', ' ').title()} Option {idx + 1}"),
+                "title": title,
                 "description": content[:300] if content else f"Quality {category.replace('_', ' ')} option",
                 "price": self._extract_or_estimate_price(content, category, req),
                 "currency": "USD",
@@ -145,14 +230,22 @@ class DiscoveryAgent:
                     "review_count": None
                 }
             }
+            self._add_feature_bits(item)
             items.append(item)
         
         # If no results, generate reasonable mock items
         if not items:
-            items = self._generate_fallback_items(category, req, timestamp)
+            items = self._generate_fallback_items(category, req)
         
         return items
     
+    def _add_feature_bits(self, item: Dict[str, Any]) -> None:
+        """Precompute the item's feature bitset for must-have filtering."""
+        item["feature_bits"], item["feature_known"] = item_feature_bits(
+            item["category"],
+            item.get("metadata")
+        )
+    
     def _extract_vendor(self, url: str) -> str:
         """Extract vendor name from URL.
         
@@ -361,15 +454,13 @@ class DiscoveryAgent:
     def _generate_fallback_items(
         self,
         category: str,
-        req: Dict[str, Any],
-        timestamp: int
+        req: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
         """Generate fallback items when search returns no results.
         
         Args:
             category: Item category
             req: Requirements dictionary
-            timestamp: Timestamp for ID generation
             
         Returns:
             List of generated fallback items
@@ -388,12 +479,13 @@ class DiscoveryAgent:
         items = []
         for idx, (vendor, desc) in enumerate(fallback_vendors.get(category, [("Vendor", "Service")])):
             price = self._extract_or_estimate_price("", category, req)
+            source = f"https://{vendor.lower()}.com"
             
-            items.append({
-                "item_id": f"{category}_{idx:03d}_{timestamp}",
+            item = {
+                "item_id": make_item_id(category, source),
                 "category": category,
                 "vendor": vendor,
-                "source": f"https://{vendor.lower()}.com",
+                "source": source,
                 "title": f"{vendor} - {category.replace('_', ' ').title()} in {location}",
                 "description": f"{desc} for {attendees} guests in {location}",
                 "price": price,
@@ -405,6 +497,8 @@ class DiscoveryAgent:
                     "source": "Industry Rating",
                     "review_count": 500 + (idx * 100)
                 }
-            })
+            }
+            self._add_feature_bits(item)
+            items.append(item)
         
         return items
@@ -1,13 +1,29 @@
 """Agent 3: Ranking Agent - Score and rank packages with dynamic weights."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+import heapq
 import itertools
-import uuid
+
+import numpy as np
+
+from src.config import settings
+from src.services import features, scoring_kernel
+from src.services.diversity import iter_mmr, iter_quota
+from src.services.package_search import (
+    iter_top_combinations,
+    iter_top_combinations_within,
+    pareto_frontier,
+    skyline,
+)
+from src.utils.ids import make_package_id
+from src.utils.quantities import calculate_quantity
 
 
 class RankingAgent:
     """Agent that scores and ranks packages using transparent, adjustable weights."""
     
+    CATEGORIES = ["flights", "hotels", "meeting_rooms", "catering"]
+    
     def __init__(self):
         # Default weights per category (must sum to 100 within each category)
         self.default_category_weights = {
@@ -44,48 +60,342 @@ class RankingAgent:
             "meeting_rooms": 15,
             "catering": 15
         }
+        
+        # Weight-independent component scores for this session, so a weight
+        # change is only a matrix-vector product:
+        # (category, budget, attendees, item keys) -> (items, components) array
+        self._component_matrices: Dict[tuple, np.ndarray] = {}
     
     async def rank(
         self,
         items: List[Dict[str, Any]],
         requirements: Dict[str, Any],
-        custom_weights: Optional[Dict[str, Any]] = None
+        custom_weights: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None,
+        within_budget: bool = False,
+        quantity_adjusted: bool = False,
+        locked_items: Optional[Dict[str, str]] = None,
+        diversity: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Rank packages using transparent, adjustable scoring.
         
+        Each item is scored once and every category is sorted by score; the
+        best packages are then pulled best-first from a heap, so the cost
+        grows with top_k rather than with the product of category sizes.
+        Component scores are cached per session, so re-ranking the same items
+        with new weights skips straight to the weighted sum.
+        
         Args:
             items: List of discovered items from Agent 2
             requirements: Structured requirements from Agent 1
             custom_weights: Optional custom weights to override defaults
+            top_k: Number of packages to return (defaults to settings.ranking_top_k)
+            within_budget: Only return packages whose cost fits requirements["budget"]
+            quantity_adjusted: Check the budget against price x quantity (as the
+                cart computes it) instead of the summed item prices
+            locked_items: Optional category -> item_id choices every package
+                must keep; only the other categories are ranked
+            diversity: Optional diversified ordering: {"mode": "mmr",
+                "lambda": 0.7} or {"mode": "vendor_quota", "quota": 2}
+                
+        Returns:
+            List of the top_k ranked packages with scores (explanations are
+            built on demand by explain())
+        """
+        top_k = top_k or settings.ranking_top_k
+        return list(itertools.islice(
+            self.iter_ranked(
+                items,
+                requirements,
+                custom_weights,
+                within_budget,
+                quantity_adjusted,
+                locked_items,
+                diversity
+            ),
+            top_k
+        ))
+    
+    async def rank_presets(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any],
+        presets: List[Optional[Dict[str, Any]]],
+        top_k: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank packages under several weight presets in one pass.
+        
+        Items are scored for every preset together from the shared component
+        matrices; each preset then gets its own best-first package search.
+        
+        Args:
+            items: List of discovered items from Agent 2
+            requirements: Structured requirements from Agent 1
+            presets: Custom weights per preset (None for defaults)
+            top_k: Number of packages per preset (defaults to settings.ranking_top_k)
             
         Returns:
-            List of ranked packages with scores and explanations
+            One list of top_k ranked packages per preset, in preset order
         """
-        # Group items by category
-        grouped_items = self._group_by_category(items)
+        top_k = top_k or settings.ranking_top_k
         
-        # Ensure all categories have at least one item (for package generation)
-        for category in ["flights", "hotels", "meeting_rooms", "catering"]:
-            if category not in grouped_items or not grouped_items[category]:
-                grouped_items[category] = [self._create_placeholder_item(category, requirements)]
+        grouped_items = self._group_for_packages(items, requirements)
+        scored_by_preset = self._score_categories_batch(grouped_items, requirements, presets)
+        
+        rankings = []
+        for preset, scored in zip(presets, scored_by_preset):
+            weights = self.resolve_weights(preset)
+            packages = []
+            for rank, (final_score, package) in enumerate(
+                itertools.islice(self._generate_packages(scored, weights["category_importance"]), top_k),
+                1
+            ):
+                ranked = self._build_package(package, final_score, weights)
+                ranked["rank"] = rank
+                packages.append(ranked)
+            rankings.append(packages)
         
-        # Generate all possible packages (one item per category)
-        packages = self._generate_packages(grouped_items)
+        return rankings
+    
+    def incremental(
+        self,
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
+    ) -> "IncrementalRanking":
+        """Start a ranking that is updated as items are discovered.
+        
+        Args:
+            requirements: Structured requirements from Agent 1
+            custom_weights: Optional custom weights to override defaults
+            top_k: Size of the maintained top set (defaults to settings.ranking_top_k)
+            
+        Returns:
+            Empty IncrementalRanking; feed it with add_items()
+        """
+        return IncrementalRanking(self, requirements, custom_weights, top_k)
+    
+    def iter_ranked(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]] = None,
+        within_budget: bool = False,
+        quantity_adjusted: bool = False,
+        locked_items: Optional[Dict[str, str]] = None,
+        diversity: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield ranked packages best-first, computing each only when pulled.
+        
+        Lets callers page through a ranking without re-scoring: keep the
+        iterator and pull more packages from it as needed.
+        
+        Args:
+            items: List of discovered items from Agent 2
+            requirements: Structured requirements from Agent 1
+            custom_weights: Optional custom weights to override defaults
+            within_budget: Only yield packages whose cost fits requirements["budget"]
+            quantity_adjusted: Check the budget against price x quantity
+            locked_items: Optional category -> item_id choices every package
+                must keep
+            diversity: Optional diversified ordering (see rank())
+            
+        Yields:
+            Ranked packages with scores and a 1-based "rank"
+            
+        Raises:
+            ValueError: If a locked item is not among the discovered items,
+                or the diversity mode is unknown
+        """
+        grouped_items = self._group_for_packages(items, requirements)
         
-        # Score each package
-        scored_packages = []
-        for pkg in packages:
-            score_data = self._score_package(pkg, requirements, custom_weights)
-            scored_packages.append(score_data)
+        weights = self.resolve_weights(custom_weights)
         
-        # Sort by final score (descending)
-        scored_packages.sort(key=lambda x: x["final_score"], reverse=True)
+        # Score every item exactly once, best first within each category
+        scored = self._score_categories(grouped_items, requirements, custom_weights)
+        if locked_items:
+            scored = self._lock_items(scored, locked_items)
         
-        # Add rank position
-        for rank, pkg in enumerate(scored_packages, 1):
-            pkg["rank"] = rank
+        budget = None
+        if within_budget:
+            budget = (
+                requirements.get("budget", 100000),
+                lambda category, item: self._budget_cost(category, item, requirements, quantity_adjusted)
+            )
+        
+        packages = self._generate_packages(scored, weights["category_importance"], budget)
+        if diversity:
+            packages = self._diversify(packages, scored, diversity)
+        
+        for rank, (final_score, package) in enumerate(packages, 1):
+            ranked = self._build_package(package, final_score, weights)
+            ranked["rank"] = rank
+            if within_budget:
+                ranked["budget_cost"] = round(sum(
+                    self._budget_cost(cat, item, requirements, quantity_adjusted)
+                    for cat, item in ranked["items"].items()
+                ), 2)
+            yield ranked
+    
+    def _diversify(
+        self,
+        packages: Iterator[Tuple[float, Dict[str, Tuple[float, int, Dict[str, Any]]]]],
+        scored: Dict[str, Dict[str, Any]],
+        diversity: Dict[str, Any]
+    ) -> Iterator[Tuple[float, Dict[str, Tuple[float, int, Dict[str, Any]]]]]:
+        """Re-order the best-first package stream for diversity.
+        
+        Packages are pulled from the stream only as far as the selection
+        needs them (at most settings.ranking_diversity_pool).
+        
+        Args:
+            packages: (final_score, package) tuples from _generate_packages
+            scored: Per-category tables the packages were built from
+            diversity: {"mode": "mmr", "lambda": float} to penalize packages
+                sharing items with ones already picked, or {"mode":
+                "vendor_quota", "quota": int} to cap packages per vendor
+                
+        Yields:
+            (final_score, package) tuples in diversified order
+            
+        Raises:
+            ValueError: If the diversity mode is unknown
+        """
+        mode = diversity.get("mode")
+        if mode == "mmr":
+            key_of = lambda entry: entry[2].get("item_id")
+        elif mode == "vendor_quota":
+            key_of = lambda entry: entry[2].get("vendor")
+        else:
+            raise ValueError(f"Unknown diversity mode: {mode}")
+        
+        # Categories with a single choice (e.g. locked) cannot be diversified
+        varied = [
+            cat for cat, table in scored.items()
+            if len({key_of(entry) for entry in table["entries"]}) > 1
+        ]
+        if not varied:
+            yield from packages
+            return
+        
+        candidates = (
+            (final_score, [(cat, key_of(package[cat])) for cat in varied], package)
+            for final_score, package in packages
+        )
+        
+        if mode == "mmr":
+            selected = iter_mmr(
+                candidates,
+                diversity.get("lambda", settings.ranking_mmr_lambda),
+                settings.ranking_diversity_pool
+            )
+        else:
+            selected = iter_quota(
+                candidates,
+                diversity.get("quota", settings.ranking_vendor_quota),
+                settings.ranking_diversity_pool
+            )
+        
+        for final_score, _, package in selected:
+            yield final_score, package
+    
+    def check_must_haves(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Report how many items meet each must-have.
+        
+        Args:
+            items: List of discovered items
+            requirements: Requirements with optional "must_haves"
+            
+        Returns:
+            One dict per must-have with "constraint", "category", "applied"
+            (whether it was recognized and enforced), "items_total" and
+            "items_matched" (items in its category before and after filtering;
+            a must-have asking only for the category keeps every item)
+        """
+        grouped = self._group_by_category(items)
+        
+        report = []
+        for constraint in self._must_have_constraints(requirements):
+            category = constraint["category"]
+            candidates = grouped.get(category, []) if category else []
+            applied = category is not None and settings.ranking_enforce_must_haves
+            report.append({
+                "constraint": constraint["constraint"],
+                "category": category,
+                "applied": applied,
+                "items_total": len(candidates),
+                "items_matched": sum(
+                    1 for item in candidates
+                    if features.satisfies(*self._item_features(item), constraint["mask"])
+                ),
+            })
+        
+        return report
+    
+    def _must_have_constraints(self, requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Parse requirements["must_haves"] into bitmask constraints."""
+        return [
+            features.parse_must_have(text)
+            for text in requirements.get("must_haves") or []
+            if isinstance(text, str)
+        ]
+    
+    def _must_have_masks(self, requirements: Dict[str, Any]) -> Dict[str, int]:
+        """Combine recognized must-haves into one required mask per category."""
+        masks = {}
+        for constraint in self._must_have_constraints(requirements):
+            if constraint["mask"]:
+                category = constraint["category"]
+                masks[category] = masks.get(category, 0) | constraint["mask"]
+        return masks
+    
+    def _item_features(self, item: Dict[str, Any]) -> Tuple[int, int]:
+        """Get an item's (has, known) feature bits, computing them if missing."""
+        if "feature_bits" in item:
+            return item["feature_bits"], item.get("feature_known", 0)
+        return features.item_feature_bits(item.get("category", ""), item.get("metadata"))
+    
+    def _lock_items(
+        self,
+        scored: Dict[str, Dict[str, Any]],
+        locked_items: Dict[str, str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Narrow locked categories to their chosen item.
+        
+        A locked category becomes a one-entry list, so the best-first search
+        only walks the free categories' sorted lists and the first K
+        completions cost O(K log K). Scores are unchanged, so completions
+        score exactly as they would in the full ranking.
+        
+        Args:
+            scored: Per-category tables from _score_categories
+            locked_items: Category -> item_id to keep
+            
+        Returns:
+            Tables with locked categories narrowed (others shared, not copied)
+            
+        Raises:
+            ValueError: If a locked category or item is unknown
+        """
+        narrowed = dict(scored)
+        for category, item_id in locked_items.items():
+            if category not in scored:
+                raise ValueError(f"Unknown category to lock: {category}")
+            
+            entry = next(
+                (entry for entry in scored[category]["entries"] if entry[2].get("item_id") == item_id),
+                None
+            )
+            if entry is None:
+                raise ValueError(f"Item {item_id} not found in {category}")
+            
+            narrowed[category] = {**scored[category], "entries": [entry]}
         
-        return scored_packages
+        return narrowed
     
     def _group_by_category(
         self, 
@@ -107,41 +417,293 @@ class RankingAgent:
             grouped[category].append(item)
         return grouped
     
-    def _generate_packages(
-        self, 
-        grouped: Dict[str, List[Dict[str, Any]]]
+    def _group_for_packages(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Group items by category, filling empty categories with a placeholder.
+        
+        Items failing a recognized must-have are dropped here, before any
+        scoring or package generation.
+        
+        Args:
+            items: List of all discovered items
+            requirements: User requirements
+            
+        Returns:
+            Dict mapping category names to lists of items
+        """
+        # Group items by category
+        grouped_items = self._group_by_category(items)
+        
+        if settings.ranking_enforce_must_haves:
+            for category, mask in self._must_have_masks(requirements).items():
+                if category in grouped_items:
+                    grouped_items[category] = [
+                        item for item in grouped_items[category]
+                        if features.satisfies(*self._item_features(item), mask)
+                    ]
+        
+        # Ensure all categories have at least one item (for package generation)
+        for category in self.CATEGORIES:
+            if category not in grouped_items or not grouped_items[category]:
+                grouped_items[category] = [self._create_placeholder_item(category, requirements)]
+        
+        return grouped_items
+    
+    def _score_categories(
+        self,
+        grouped: Dict[str, List[Dict[str, Any]]],
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Score each item once and sort every category best-first.
+        
+        Args:
+            grouped: Items grouped by category
+            requirements: User requirements
+            custom_weights: Optional custom scoring weights
+            
+        Returns:
+            Dict mapping category to a table with "entries" ((score, row,
+            item) tuples sorted by descending score, ties keeping discovery
+            order), "components" (component matrix, indexed by row) and
+            "weights" (component weight vector)
+        """
+        return self._score_categories_batch(grouped, requirements, [custom_weights])[0]
+    
+    def _score_categories_batch(
+        self,
+        grouped: Dict[str, List[Dict[str, Any]]],
+        requirements: Dict[str, Any],
+        presets: List[Optional[Dict[str, Any]]]
     ) -> List[Dict[str, Dict[str, Any]]]:
-        """Generate all combinations of packages (one item per category).
+        """Score each item under several weight presets at once.
+        
+        Component scores are shared by every preset, so each category needs
+        a single (items x components) by (components x presets) product.
         
         Args:
             grouped: Items grouped by category
+            requirements: User requirements
+            presets: Custom scoring weights per preset (None for defaults)
             
         Returns:
-            List of package dictionaries (category -> item mapping)
+            One table dict per preset, as returned by _score_categories
         """
-        categories = ["flights", "hotels", "meeting_rooms", "catering"]
+        scored = [{} for _ in presets]
+        for category in self.CATEGORIES:
+            items = grouped.get(category, [])
+            if not items:
+                continue
+            
+            # Weight changes only redo this product; components are cached
+            matrix = self._get_component_matrix(category, items, requirements)
+            weights = np.column_stack([
+                scoring_kernel.weight_vector(category, self._category_weights(category, preset))
+                for preset in presets
+            ])
+            scores = scoring_kernel.weighted_scores(matrix, weights)
+            
+            for column, table in enumerate(scored):
+                entries = [
+                    (score, row, item)
+                    for row, (score, item) in enumerate(zip(scores[:, column].tolist(), items))
+                ]
+                entries.sort(key=lambda entry: entry[0], reverse=True)
+                
+                table[category] = {
+                    "entries": entries,
+                    "components": matrix,
+                    "weights": weights[:, column],
+                }
         
-        # Get items for each category (use empty list if category missing)
-        items_by_category = [grouped.get(cat, []) for cat in categories]
+        return scored
+    
+    def _generate_packages(
+        self,
+        scored: Dict[str, Dict[str, Any]],
+        importance: Dict[str, int],
+        budget: Optional[Tuple[float, Callable[[str, Dict[str, Any]], float]]] = None
+    ):
+        """Lazily generate packages (one item per category) best-first.
         
-        # Filter out empty categories
-        valid_categories = []
-        valid_items = []
-        for cat, items in zip(categories, items_by_category):
-            if items:
-                valid_categories.append(cat)
-                valid_items.append(items)
+        Args:
+            scored: Per-category tables from _score_categories
+            importance: Category importance weights
+            budget: Optional (limit, cost function); packages whose summed
+                cost exceeds the limit are skipped
+                
+        Yields:
+            Tuples of (final_score, package) where package maps category to
+            its (score, row, item) entry
+        """
+        categories, shares = self._category_shares(scored, importance)
+        if not categories:
+            return
         
-        if not valid_items:
-            return []
+        entries = [scored[cat]["entries"] for cat in categories]
+        
+        costs = None
+        if budget is not None:
+            limit, cost_of = budget
+            costs = [[cost_of(cat, entry[2]) for entry in column] for cat, column in zip(categories, entries)]
+        
+        if int(np.prod([len(column) for column in entries])) <= settings.ranking_dense_limit:
+            # Small catalogs: score every package at once as a broadcast sum
+            totals = scoring_kernel.package_scores(
+                [np.array([entry[0] for entry in column]) for column in entries],
+                shares
+            )
+            flat = totals.ravel()
+            # Stable sort keeps the same tie order as the heap search
+            order = np.argsort(-flat, kind="stable")
+            if costs is not None:
+                package_costs = scoring_kernel.package_scores(
+                    [np.array(column) for column in costs],
+                    [1.0] * len(costs)
+                ).ravel()
+                order = order[package_costs[order] <= limit]
+            combos = (
+                (float(flat[i]), np.unravel_index(i, totals.shape))
+                for i in order
+            )
+        else:
+            columns = [
+                [entry[0] * share for entry in column]
+                for column, share in zip(entries, shares)
+            ]
+            if costs is not None:
+                # Branch and bound: infeasible packages are pruned, not filtered
+                combos = iter_top_combinations_within(columns, costs, limit)
+            else:
+                combos = iter_top_combinations(columns)
+        
+        for final_score, combo in combos:
+            yield final_score, {
+                cat: column[int(idx)] for cat, column, idx in zip(categories, entries, combo)
+            }
+    
+    def _category_shares(
+        self,
+        scored: Dict[str, Dict[str, Any]],
+        importance: Dict[str, int]
+    ) -> Tuple[List[str], List[float]]:
+        """Get the scored categories and their normalized importance shares.
+        
+        Args:
+            scored: Per-category tables from _score_categories
+            importance: Category importance weights
+            
+        Returns:
+            Tuple of (categories in CATEGORIES order, share per category)
+        """
+        categories = [cat for cat in self.CATEGORIES if scored.get(cat)]
+        return categories, scoring_kernel.importance_shares(importance, categories)
+    
+    def frontier(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]] = None,
+        per_category: bool = False,
+        max_points: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Compute the Pareto frontier of packages on cost vs score.
+        
+        A package is on the frontier if no other package is at most as
+        expensive and scores at least as high, comparing total_cost and
+        final_score as returned (rounded); of packages tied on both, one is
+        kept. With per_category, a package is only dominated by one that is
+        at most as expensive and scores at least as high in every category.
+        Items are scored exactly as in rank(). That frontier can be huge, so
+        at most settings.ranking_diversity_pool of its best-scoring packages
+        (plus the cheapest) are considered.
+        
+        Args:
+            items: List of discovered items from Agent 2
+            requirements: Structured requirements from Agent 1
+            custom_weights: Optional custom weights to override defaults
+            per_category: Compare per-category scores instead of final_score
+            max_points: Return at most this many frontier packages, evenly
+                spaced along the frontier (cheapest and best always kept)
+                
+        Returns:
+            Dict with "packages" (cheapest first, "rank" is the position on
+            the frontier) and "frontier_size" (points on the full frontier)
+        """
+        grouped_items = self._group_for_packages(items, requirements)
+        
+        weights = self.resolve_weights(custom_weights)
+        scored = self._score_categories(grouped_items, requirements, custom_weights)
+        
+        categories, shares = self._category_shares(scored, weights["category_importance"])
+        entries = [scored[cat]["entries"] for cat in categories]
+        columns = [
+            [entry[0] * share for entry in column]
+            for column, share in zip(entries, shares)
+        ]
+        costs = [[entry[2].get("price", 0) for entry in column] for column in entries]
+        
+        if per_category:
+            # Within a category a pricier item must score higher, so every mix
+            # of per-category skyline items is non-dominated
+            options = [
+                [combo[0] for _, _, combo in skyline([
+                    (cost, value, (i,)) for i, (value, cost) in enumerate(zip(column, column_costs))
+                ])]
+                for column, column_costs in zip(columns, costs)
+            ]
+            frontier_size = int(np.prod([len(option) for option in options]))
+            
+            # The mixes multiply, so only the best-scoring pool of them is
+            # pulled best-first (skylines reversed to descending value), plus
+            # the cheapest mix
+            descending = [option[::-1] for option in options]
+            best = iter_top_combinations([
+                [columns[d][i] for i in option] for d, option in enumerate(descending)
+            ])
+            picked = [
+                tuple(descending[d][i] for d, i in enumerate(combo))
+                for _, combo in itertools.islice(best, settings.ranking_diversity_pool)
+            ]
+            cheapest = tuple(option[0] for option in options)
+            if cheapest not in picked:
+                picked.append(cheapest)
+            
+            points = sorted(
+                (
+                    (
+                        sum(costs[d][i] for d, i in enumerate(combo)),
+                        sum(columns[d][i] for d, i in enumerate(combo)),
+                        combo
+                    )
+                    for combo in picked
+                ),
+                key=lambda p: (p[0], -p[1], p[2])
+            )
+        else:
+            # Compared as returned: total_cost and final_score are rounded, so
+            # packages the rounding ties collapse to one point
+            points = skyline([
+                (round(cost, 2), round(value, 2), combo)
+                for cost, value, combo in pareto_frontier(columns, costs)
+            ])
+            frontier_size = len(points)
+        
+        if max_points and len(points) > max_points:
+            picks = np.unique(np.linspace(0, len(points) - 1, max_points).round().astype(int))
+            points = [points[i] for i in picks]
         
         packages = []
-        for combo in itertools.product(*valid_items):
-            pkg = {cat: item for cat, item in zip(valid_categories, combo)}
-            packages.append(pkg)
+        for position, (_, value, combo) in enumerate(points, 1):
+            package = {cat: column[i] for cat, column, i in zip(categories, entries, combo)}
+            built = self._build_package(package, value, weights)
+            built["rank"] = position
+            packages.append(built)
         
-        # Limit to top 50 packages for performance
-        return packages[:50]
+        return {"packages": packages, "frontier_size": frontier_size}
     
     def _score_package(
         self,
@@ -159,161 +721,265 @@ class RankingAgent:
         Returns:
             Dict with package details, scores, and explanation
         """
-        category_scores = {}
-        category_breakdowns = {}
-        
-        for category, item in package.items():
-            score, breakdown = self._score_item(
-                item,
-                category,
-                requirements,
-                custom_weights
-            )
-            category_scores[category] = score
-            category_breakdowns[category] = breakdown
-        
-        # Get category importance weights
-        importance = self.default_category_importance.copy()
-        if custom_weights and custom_weights.get("category_importance"):
-            importance.update(custom_weights["category_importance"])
+        scored = self._score_categories(
+            {category: [item] for category, item in package.items()},
+            requirements,
+            custom_weights
+        )
+        scored_package = {cat: table["entries"][0] for cat, table in scored.items()}
         
-        # Normalize importance weights if they don't sum to 100
-        total_importance = sum(importance.get(cat, 0) for cat in category_scores)
-        if total_importance == 0:
-            total_importance = 100
+        weights = self.resolve_weights(custom_weights)
+        shares = scoring_kernel.importance_shares(weights["category_importance"], list(scored_package))
         
         # Calculate weighted final score
         final_score = sum(
-            category_scores.get(cat, 0) * (importance.get(cat, 25) / total_importance)
-            for cat in category_scores
+            score * share
+            for (score, _, _), share in zip(scored_package.values(), shares)
         )
         
+        package = self._build_package(scored_package, final_score, weights)
+        self.explain(package, requirements)
+        return package
+    
+    def _build_package(
+        self,
+        scored_package: Dict[str, Tuple[float, int, Dict[str, Any]]],
+        final_score: float,
+        weights: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Assemble the package record from already-scored items.
+        
+        The explanation is not built here; see explain().
+        
+        Args:
+            scored_package: Dict mapping category to its (score, row, item) entry
+            final_score: Weighted final package score
+            weights: Resolved weights of the ranking, from resolve_weights()
+            
+        Returns:
+            Dict with package details, scores, and the weights they used
+        """
+        package = {cat: entry[2] for cat, entry in scored_package.items()}
+        
         # Calculate total cost
         total_cost = sum(item.get("price", 0) for item in package.values())
         
+        # Cheap record; explain() builds the explanation only when needed
         return {
-            "package_id": f"pkg_{str(uuid.uuid4())[:8]}",
+            "package_id": make_package_id(item.get("item_id", "") for item in package.values()),
             "final_score": round(final_score, 2),
-            "category_scores": {cat: round(score, 2) for cat, score in category_scores.items()},
+            "category_scores": {cat: round(entry[0], 2) for cat, entry in scored_package.items()},
             "items": package,
             "total_cost": round(total_cost, 2),
-            "explanation": self._generate_explanation(
-                category_scores,
-                category_breakdowns,
+            "weights": weights
+        }
+    
+    def explain(
+        self,
+        package: Dict[str, Any],
+        requirements: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Get a package's explanation, building it on first request.
+        
+        Component scores are recomputed for the package's items only, so
+        ranked packages do not carry per-item score arrays.
+        
+        Args:
+            package: Ranked package record from rank()
+            requirements: User requirements
+            
+        Returns:
+            Dict with explanation and detailed breakdowns
+        """
+        if "explanation" not in package:
+            weights = package["weights"]
+            breakdowns = {}
+            for cat, item in package["items"].items():
+                row = scoring_kernel.component_matrix(
+                    cat,
+                    scoring_kernel.item_columns([item]),
+                    requirements
+                )[0]
+                breakdowns[cat] = scoring_kernel.breakdown(
+                    cat,
+                    row,
+                    scoring_kernel.weight_vector(cat, weights.get(cat, {}))
+                )
+            package["explanation"] = self._generate_explanation(
+                package["category_scores"],
+                breakdowns,
                 requirements,
-                total_cost,
-                importance
+                sum(item.get("price", 0) for item in package["items"].values()),
+                weights["category_importance"]
             )
-        }
+        
+        return package["explanation"]
     
-    def _score_item(
+    def _budget_cost(
         self,
-        item: Dict[str, Any],
         category: str,
+        item: Dict[str, Any],
         requirements: Dict[str, Any],
-        custom_weights: Optional[Dict[str, Any]]
-    ) -> tuple:
-        """Score an individual item based on category-specific criteria.
+        quantity_adjusted: bool
+    ) -> float:
+        """Cost an item contributes when checking a package against the budget.
         
         Args:
-            item: Item to score
             category: Item category
+            item: Item dictionary
             requirements: User requirements
-            custom_weights: Optional custom weights
+            quantity_adjusted: Multiply the price by the cart quantity
             
         Returns:
-            Tuple of (final_score, breakdown_dict)
+            Item cost
         """
-        # Get weights for this category
-        default_weights = self.default_category_weights.get(category, {})
-        weights = default_weights.copy()
+        price = item.get("price", 0)
+        if quantity_adjusted:
+            return price * calculate_quantity(category, item, requirements)
+        return price
+    
+    def resolve_weights(self, custom_weights: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Resolve custom weights against the defaults.
         
-        if custom_weights and custom_weights.get(category):
-            weights.update(custom_weights[category])
+        Weight dicts that resolve to the same result rank identically, so the
+        result can be used to fingerprint a ranking.
         
-        # Calculate base scores
-        price_score = self._calculate_price_score(
-            item.get("price", 0),
-            requirements.get("budget", 100000)
-        )
+        Args:
+            custom_weights: Optional custom weights
+            
+        Returns:
+            Dict with "category_importance" and every category's full weights
+        """
+        resolved = {"category_importance": self._resolve_importance(custom_weights)}
+        for category in self.CATEGORIES:
+            resolved[category] = self._category_weights(category, custom_weights)
+        return resolved
+    
+    def _resolve_importance(self, custom_weights: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Get category importance weights with custom overrides applied."""
+        importance = self.default_category_importance.copy()
+        if custom_weights and custom_weights.get("category_importance"):
+            importance.update(custom_weights["category_importance"])
+        return importance
+    
+    def _category_weights(
+        self,
+        category: str,
+        custom_weights: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Get scoring weights for a category with custom overrides applied.
         
-        trust_rating = item.get("trust_score", {})
-        if isinstance(trust_rating, dict):
-            trust_score = trust_rating.get("rating", 3) * 20  # Convert 5-star to 100
-        else:
-            trust_score = 60  # Default
+        Args:
+            category: Item category
+            custom_weights: Optional custom weights
+            
+        Returns:
+            Dict of component weights for the category
+        """
+        weights = self.default_category_weights.get(category, {}).copy()
         
-        breakdown = {}
-        final_score = 0
-        total_weight = 0
+        if custom_weights and custom_weights.get(category):
+            # Unset fields (None) keep their defaults
+            weights.update({
+                key: value for key, value in custom_weights[category].items()
+                if value is not None
+            })
         
-        if category == "flights":
-            timing_score = 75  # Could be calculated from departure times
-            comfort_score = 70  # Could be based on class, stops, etc.
-            
-            components = [
-                ("price", price_score, weights.get("price_weight", 50)),
-                ("timing", timing_score, weights.get("timing_weight", 25)),
-                ("trust", trust_score, weights.get("trust_weight", 15)),
-                ("comfort", comfort_score, weights.get("comfort_weight", 10)),
-            ]
+        return weights
+    
+    def _item_key(self, item: Dict[str, Any]) -> tuple:
+        """Identity of an item for score caching."""
+        # Discovery item IDs are not guaranteed unique, so include source and price
+        return (item.get("item_id"), item.get("source"), item.get("price"))
+    
+    def _get_component_matrix(
+        self,
+        category: str,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any]
+    ) -> np.ndarray:
+        """Get a category's component matrix, computing it on first use.
         
-        elif category == "hotels":
-            location_score = 85  # Could be based on proximity to venue
-            amenities = item.get("metadata", {}).get("amenities", [])
-            amenities_score = min(100, len(amenities) * 12)  # More amenities = higher score
+        Args:
+            category: Item category
+            items: Items of the category
+            requirements: User requirements
             
-            components = [
-                ("price", price_score, weights.get("price_weight", 20)),
-                ("trust", trust_score, weights.get("trust_weight", 40)),
-                ("location", location_score, weights.get("location_weight", 25)),
-                ("amenities", amenities_score, weights.get("amenities_weight", 15)),
-            ]
+        Returns:
+            Array of shape (items, components)
+        """
+        key = (
+            category,
+            requirements.get("budget", 100000),
+            requirements.get("attendees", 50),
+            tuple(self._item_key(item) for item in items),
+        )
         
-        elif category == "meeting_rooms":
-            capacity = item.get("metadata", {}).get("capacity", 50)
-            required_capacity = requirements.get("attendees", 50)
-            capacity_score = 100 if capacity >= required_capacity else (capacity / required_capacity) * 100
-            
-            equipment = item.get("metadata", {}).get("equipment", [])
-            equipment_score = min(100, len(equipment) * 25)
-            
-            components = [
-                ("price", price_score, weights.get("price_weight", 25)),
-                ("capacity", capacity_score, weights.get("capacity_weight", 35)),
-                ("equipment", equipment_score, weights.get("equipment_weight", 25)),
-                ("trust", trust_score, weights.get("trust_weight", 15)),
-            ]
+        matrix = self._component_matrices.get(key)
+        if matrix is None:
+            matrix = scoring_kernel.component_matrix(
+                category,
+                scoring_kernel.item_columns(items),
+                requirements
+            )
+            # Only the latest item set per category is worth keeping
+            if len(self._component_matrices) >= 4 * len(self.CATEGORIES):
+                self._component_matrices.clear()
+            self._component_matrices[key] = matrix
         
-        elif category == "catering":
-            dietary_options = item.get("metadata", {}).get("dietary_options", [])
-            dietary_score = min(100, len(dietary_options) * 20)
-            service_score = 80  # Could be based on service style
-            
-            components = [
-                ("price", price_score, weights.get("price_weight", 30)),
-                ("trust", trust_score, weights.get("trust_weight", 30)),
-                ("dietary", dietary_score, weights.get("dietary_weight", 25)),
-                ("service", service_score, weights.get("service_weight", 15)),
-            ]
+        return matrix
+    
+    def _score_item(
+        self,
+        item: Dict[str, Any],
+        category: str,
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]],
+        weights: Optional[Dict[str, Any]] = None
+    ) -> tuple:
+        """Score an individual item based on category-specific criteria.
         
-        else:
-            # Default scoring for unknown categories
-            components = [
-                ("price", price_score, 50),
-                ("trust", trust_score, 50),
-            ]
+        Args:
+            item: Item to score
+            category: Item category
+            requirements: User requirements
+            custom_weights: Optional custom weights
+            weights: Already-resolved category weights (skips resolving them)
+            
+        Returns:
+            Tuple of (final_score, breakdown_dict)
+        """
+        # Get weights for this category
+        if weights is None:
+            weights = self._category_weights(category, custom_weights)
         
-        # Calculate weighted score
-        for name, score, weight in components:
-            final_score += score * weight
-            total_weight += weight
-            breakdown[name] = {"score": round(score, 1), "weight": weight}
+        return self._score_items([item], category, requirements, weights)[0]
+    
+    def _score_items(
+        self,
+        items: List[Dict[str, Any]],
+        category: str,
+        requirements: Dict[str, Any],
+        weights: Dict[str, Any]
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Score items of one category in batch with the vectorized kernel.
         
-        if total_weight > 0:
-            final_score = final_score / total_weight
+        Args:
+            items: Items to score
+            category: Item category
+            requirements: User requirements
+            weights: Resolved weights for the category
+            
+        Returns:
+            List of (final_score, breakdown_dict) tuples, one per item
+        """
+        scores, matrix = scoring_kernel.category_scores(items, category, requirements, weights)
+        weight_vector = scoring_kernel.weight_vector(category, weights)
         
-        return round(final_score, 2), breakdown
+        return [
+            (score, scoring_kernel.breakdown(category, row, weight_vector))
+            for score, row in zip(scores.tolist(), matrix)
+        ]
     
     def _calculate_price_score(self, price: float, budget: float) -> float:
         """Calculate price score (lower price = higher score, within budget).
@@ -325,18 +991,7 @@ class RankingAgent:
         Returns:
             Score from 0-100
         """
-        if budget <= 0:
-            return 50
-        
-        # Price as percentage of total budget
-        price_ratio = price / budget
-        
-        if price_ratio > 0.5:  # More than 50% of budget for single category
-            return max(0, 100 - (price_ratio * 150))
-        elif price_ratio > 0.3:
-            return 100 - (price_ratio * 100)
-        else:
-            return 100 - (price_ratio * 50)
+        return float(scoring_kernel.price_scores(np.array([price], dtype=float), budget)[0])
     
     def _generate_explanation(
         self,
@@ -413,3 +1068,204 @@ class RankingAgent:
             "metadata": {},
             "trust_score": {"rating": 0, "source": "N/A"}
         }
+
+
+class IncrementalRanking:
+    """Top-K packages kept up to date while discovery results stream in.
+    
+    Arriving items are scored once and merged into their category's sorted
+    list; items already ranked are never rescored. Every package that was
+    possible before a batch is still scored the same, so the new top-K is
+    the old top-K merged with the best packages containing at least one new
+    item, which a best-first search over the new items finds directly.
+    """
+    
+    def __init__(
+        self,
+        agent: RankingAgent,
+        requirements: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
+    ):
+        """Start an empty ranking.
+        
+        Args:
+            agent: Ranking agent whose scoring and package search are used
+            requirements: Structured requirements from Agent 1
+            custom_weights: Optional custom weights to override defaults
+            top_k: Size of the maintained top set (defaults to settings.ranking_top_k)
+        """
+        self.agent = agent
+        self.requirements = requirements
+        self.top_k = top_k or settings.ranking_top_k
+        self.weights = agent.resolve_weights(custom_weights)
+        self.importance = self.weights["category_importance"]
+        self.items_ranked = 0
+        
+        self._masks = agent._must_have_masks(requirements) if settings.ranking_enforce_must_haves else {}
+        # Every category starts as its placeholder, as in a batch ranking
+        self._tables = agent._score_categories(
+            agent._group_for_packages([], requirements),
+            requirements,
+            custom_weights
+        )
+        self._discovered = set()  # Categories holding real items
+        self._order: Dict[str, List[Tuple[int, int]]] = {}  # (batch, position) per row
+        self._top: List[Tuple[float, Dict[str, Tuple[float, int, Dict[str, Any]]]]] = []
+        self._batches = 0
+    
+    def add_items(self, items: List[Dict[str, Any]], order: Optional[int] = None) -> int:
+        """Score a batch of new items and update the top-K set.
+        
+        Args:
+            items: Newly discovered items (not previously added)
+            order: Position of the batch in discovery order (e.g. the search
+                index); ties between equal scores are broken by it, so the
+                final ranking matches a batch ranking of the same items.
+                Defaults to arrival order.
+                
+        Returns:
+            Number of items added (items failing a must-have are dropped)
+        """
+        batch = self._batches if order is None else order
+        self._batches += 1
+        
+        grouped: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+        for position, item in enumerate(items):
+            category = item.get("category", "unknown")
+            if category not in self._tables:
+                continue
+            mask = self._masks.get(category)
+            if mask and not features.satisfies(*self.agent._item_features(item), mask):
+                continue
+            grouped.setdefault(category, []).append((position, item))
+        
+        for category in self.agent.CATEGORIES:
+            if category in grouped:
+                self._merge_category(category, grouped[category], batch)
+        
+        added = sum(len(pairs) for pairs in grouped.values())
+        self.items_ranked += added
+        return added
+    
+    def _merge_category(
+        self,
+        category: str,
+        pairs: List[Tuple[int, Dict[str, Any]]],
+        batch: int
+    ):
+        """Score one category's new items and fold them into the ranking.
+        
+        Args:
+            category: Item category
+            pairs: (position in batch, item) for each new item
+            batch: Batch order used to break score ties
+        """
+        table = self._tables[category]
+        items = [item for _, item in pairs]
+        matrix = scoring_kernel.component_matrix(
+            category,
+            scoring_kernel.item_columns(items),
+            self.requirements
+        )
+        scores = scoring_kernel.weighted_scores(matrix, table["weights"]).tolist()
+        
+        first = category not in self._discovered
+        base = 0 if first else len(table["components"])
+        new_order = [(batch, position) for position, _ in pairs]
+        # Positions increase within a batch, so a stable sort breaks ties
+        new_entries = sorted(
+            ((score, base + i, item) for i, (score, item) in enumerate(zip(scores, items))),
+            key=lambda entry: entry[0],
+            reverse=True
+        )
+        
+        if first:
+            # Every earlier package used this category's placeholder
+            self._discovered.add(category)
+            self._order[category] = new_order
+            self._tables[category] = {**table, "entries": new_entries, "components": matrix}
+            self._top = list(itertools.islice(
+                self.agent._generate_packages(self._tables, self.importance),
+                self.top_k
+            ))
+            return
+        
+        order = self._order[category] + new_order
+        self._order[category] = order
+        
+        # Best packages using a new item; all others were already ranked.
+        # Both lists are in final order, so merging them on score and the
+        # batch ranking's tie-break gives the new top-K
+        delta = self.agent._generate_packages(
+            {**self._tables, category: {**table, "entries": new_entries}},
+            self.importance
+        )
+        self._top = list(itertools.islice(
+            heapq.merge(
+                self._top,
+                itertools.islice(delta, self.top_k),
+                key=lambda package: (-package[0], self._tie_key(package[1]))
+            ),
+            self.top_k
+        ))
+        
+        self._tables[category] = {
+            **table,
+            "entries": list(heapq.merge(
+                table["entries"],
+                new_entries,
+                key=lambda entry: (-entry[0], order[entry[1]])
+            )),
+            "components": np.vstack([table["components"], matrix]),
+        }
+    
+    def _tie_key(self, package: Dict[str, Tuple[float, int, Dict[str, Any]]]) -> tuple:
+        """Order packages of equal score as the batch ranking does.
+        
+        Ties go to the package whose items sit earlier in their categories'
+        sorted lists, comparing categories in order; an item's place there
+        is fixed by its score and then its discovery order.
+        
+        Args:
+            package: Dict mapping category to its (score, row, item) entry
+            
+        Returns:
+            Sort key; lower comes first
+        """
+        return tuple(
+            (-entry[0], self._order[category][entry[1]] if category in self._discovered else ())
+            for category, entry in package.items()
+        )
+    
+    def packages(self) -> List[Dict[str, Any]]:
+        """Get the current (provisional) top-K packages.
+        
+        Returns:
+            Ranked packages with scores and a 1-based "rank"; empty until
+            the first item is added
+        """
+        if not self._discovered:
+            return []
+        
+        packages = []
+        for rank, (final_score, package) in enumerate(self._top, 1):
+            ranked = self.agent._build_package(package, final_score, self.weights)
+            ranked["rank"] = rank
+            packages.append(ranked)
+        return packages
+    
+    def iter_ranked(self) -> Iterator[Dict[str, Any]]:
+        """Yield the full ranking of the items added so far, best-first.
+        
+        Uses the already-scored, already-sorted category lists, so finishing
+        the ranking after discovery costs only the package search.
+        
+        Yields:
+            Ranked packages with scores and a 1-based "rank"
+        """
+        packages = self.agent._generate_packages(self._tables, self.importance)
+        for rank, (final_score, package) in enumerate(packages, 1):
+            ranked = self.agent._build_package(package, final_score, self.weights)
+            ranked["rank"] = rank
+            yield ranked
@@ -1,38 +1,195 @@
 """Agent 1: Requirements Analyst - Parse and structure retreat requirements."""
 
-from crewai import Agent, Task, Crew
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import copy
+import hashlib
 import json
 import re
+import threading
 from datetime import datetime
 
+from src.config import settings
+from src.services.agent_pool import AgentPool
+from src.services.cache import TTLCache
+from src.services.llm_executor import get_llm_executor
+from src.services.requirements_parser import parse_requirements
+
+
+# CrewAI pulls in a very large dependency tree, so it is imported on first
+# use (or by the startup warm-up) rather than when this module loads
+Agent = Task = Crew = None
+_crewai_lock = threading.Lock()
+
+
+def load_crewai() -> None:
+    """Import CrewAI's Agent, Task and Crew into this module, if not yet done."""
+    global Agent, Task, Crew
+    with _crewai_lock:
+        if Agent is None or Task is None or Crew is None:
+            import crewai
+            Agent = Agent or crewai.Agent
+            Task = Task or crewai.Task
+            Crew = Crew or crewai.Crew
+
+
+def build_analyst() -> "Agent":
+    """Build the CrewAI agent that analyzes requirements."""
+    load_crewai()
+    return Agent(
+        role="Requirements Analyst",
+        goal="Extract and structure retreat requirements from natural language",
+        backstory="""You are an expert at parsing complex event planning 
+        requirements. You extract key details like attendee count, budget, 
+        location, dates, and preferences with high accuracy. You always 
+        return valid JSON and validate that all required fields are present.""",
+        verbose=True,
+        allow_delegation=False
+    )
+
+
+# Process-wide pool of analyst agents (created on first use)
+_analyst_pool: Optional[AgentPool] = None
+
+
+def get_analyst_pool() -> AgentPool:
+    """Get the shared analyst agent pool, creating it if needed."""
+    global _analyst_pool
+    if _analyst_pool is None:
+        _analyst_pool = AgentPool(build_analyst, max_idle=settings.analyst_pool_size)
+    return _analyst_pool
+
+
+# Process-wide analysis cache (created on first use)
+_requirements_cache: Optional[TTLCache] = None
+
+
+def get_requirements_cache() -> TTLCache:
+    """Get the shared requirements-analysis cache, creating it if needed."""
+    global _requirements_cache
+    if _requirements_cache is None:
+        _requirements_cache = TTLCache(
+            max_entries=settings.requirements_cache_max_entries,
+            default_ttl=settings.requirements_cache_ttl_seconds,
+            path=settings.requirements_cache_path or None,
+            namespace="requirements"
+        )
+    return _requirements_cache
+
+
+def requirements_cache_stats() -> Optional[Dict[str, Any]]:
+    """Get the requirements cache's stats without creating it (None until first used)."""
+    return _requirements_cache.stats() if _requirements_cache is not None else None
+
+
+def normalize_request(text: str) -> str:
+    """Normalize a request so trivially different phrasings share a cache entry.
+    
+    Lowercases, drops thousands separators ("$60,000" -> "$60000") and the
+    space after a currency sign, collapses whitespace and strips trailing
+    punctuation.
+    
+    Args:
+        text: Natural language retreat request
+        
+    Returns:
+        Normalized request text
+    """
+    text = text.lower()
+    text = re.sub(r"(?<=\d),(?=\d{3}\b)", "", text)
+    text = re.sub(r"\$\s+", "$", text)
+    return " ".join(text.split()).rstrip(" .!")
+
 
 class RequirementsAnalystAgent:
-    """Agent that extracts structured requirements from natural language input."""
+    """Agent that extracts structured requirements from natural language input.
     
-    def __init__(self):
-        self.agent = Agent(
-            role="Requirements Analyst",
-            goal="Extract and structure retreat requirements from natural language",
-            backstory="""You are an expert at parsing complex event planning 
-            requirements. You extract key details like attendee count, budget, 
-            location, dates, and preferences with high accuracy. You always 
-            return valid JSON and validate that all required fields are present.""",
-            verbose=True,
-            allow_delegation=False
-        )
+    Holds no per-session state: the CrewAI agent doing the LLM call is
+    checked out of the shared analyst pool (see get_analyst_pool) for the
+    duration of that call.
+    """
     
-    async def analyze(self, user_input: str) -> Dict[str, Any]:
+    async def analyze(self, user_input: str, report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Parse user input and extract structured requirements.
         
+        Results are cached by the normalized input (see normalize_request),
+        so repeats of a request skip analysis. Otherwise the rule-based
+        parser runs first; when it extracts every required
+        field unambiguously, its result is used and the LLM is skipped.
+        Otherwise the LLM call runs on the shared, size-capped LLM thread
+        pool, so the event loop keeps serving other sessions meanwhile. If it
+        takes longer than settings.llm_timeout_seconds, requirements are
+        extracted with the regex fallback parser instead.
+        
         Args:
             user_input: Natural language description of retreat requirements
-            
+            report: Optional dict filled with how the input was analyzed:
+                "path" ("rules", "llm", "fallback" or "cache"), the rule parser's
+                "confidence" and "field_confidence", and "reasons" it was
+                not confident
+                
         Returns:
             Dict containing structured requirements
         """
-        task = Task(
-            description=f"""
+        cache = get_requirements_cache() if settings.requirements_cache_enabled else None
+        key = self._cache_key(user_input)
+        if cache is not None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                if report is not None:
+                    report.update(copy.deepcopy(cached["report"]), path="cache", cached_path=cached["report"]["path"])
+                # Cached values are shared; callers may mutate theirs
+                return copy.deepcopy(cached["requirements"])
+        
+        parsed = parse_requirements(user_input)
+        if (
+            settings.requirements_fast_path_enabled
+            and parsed["overall"] >= settings.requirements_fast_path_min_confidence
+        ):
+            requirements, path = parsed["requirements"], "rules"
+        else:
+            requirements, path = await self._analyze_with_llm(user_input)
+        
+        # Ensure required fields and validate
+        requirements = self._ensure_required_fields(requirements, user_input)
+        self._validate_requirements(requirements)
+        
+        analysis = {
+            "path": path,
+            "confidence": parsed["overall"],
+            "field_confidence": parsed["confidence"],
+            "reasons": parsed["reasons"],
+        }
+        if report is not None:
+            report.update(analysis)
+        
+        # A fallback result stands in for a failed LLM call; retry next time
+        if cache is not None and path != "fallback":
+            await cache.aset(key, {"requirements": copy.deepcopy(requirements), "report": analysis})
+        
+        return requirements
+    
+    def _cache_key(self, user_input: str) -> str:
+        """Cache key for a request: its normalized text plus what shapes the result."""
+        payload = json.dumps({
+            "input": normalize_request(user_input),
+            "model": settings.default_llm_model,
+            "fast_path": settings.requirements_fast_path_enabled,
+            "min_confidence": settings.requirements_fast_path_min_confidence,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    async def _analyze_with_llm(self, user_input: str) -> Tuple[Dict[str, Any], str]:
+        """Extract requirements with the LLM.
+        
+        Args:
+            user_input: Natural language description of retreat requirements
+            
+        Returns:
+            Tuple of (raw requirements, "llm" or "fallback" if the LLM timed
+            out or returned malformed JSON)
+        """
+        description = f"""
             Analyze this retreat planning request and extract the following information.
             Return ONLY valid JSON with no additional explanation or markdown formatting.
             
@@ -52,19 +209,14 @@ class RequirementsAnalystAgent:
             User request: {user_input}
             
             Return valid JSON only, no explanation, no markdown code blocks.
-            """,
-            agent=self.agent,
-            expected_output="JSON object with retreat requirements"
-        )
+            """
         
-        # Use Crew to execute the task
-        crew = Crew(
-            agents=[self.agent],
-            tasks=[task],
-            verbose=True
-        )
+        try:
+            result = await get_llm_executor().run(self._kickoff, description, timeout=settings.llm_timeout_seconds)
+        except asyncio.TimeoutError:
+            # A stalled completion must not fail the request
+            return self._fallback_parse(user_input), "fallback"
         
-        result = crew.kickoff()
         result_str = str(result.raw) if hasattr(result, 'raw') else str(result)
         
         # Parse LLM output to JSON
@@ -74,13 +226,37 @@ class RequirementsAnalystAgent:
             requirements = json.loads(cleaned)
         except json.JSONDecodeError:
             # Fallback parsing if LLM returns malformed JSON
-            requirements = self._fallback_parse(user_input)
+            return self._fallback_parse(user_input), "fallback"
         
-        # Ensure required fields and validate
-        requirements = self._ensure_required_fields(requirements, user_input)
-        self._validate_requirements(requirements)
+        return requirements, "llm"
+    
+    def _kickoff(self, description: str) -> Any:
+        """Run the analysis task on a pooled agent (blocking).
         
-        return requirements
+        The agent stays checked out until kickoff returns, even if the
+        caller has stopped waiting, so no two calls ever share one.
+        
+        Args:
+            description: Task prompt
+            
+        Returns:
+            Crew output
+        """
+        load_crewai()
+        with get_analyst_pool().checkout() as agent:
+            task = Task(
+                description=description,
+                agent=agent,
+                expected_output="JSON object with retreat requirements"
+            )
+            
+            # Use Crew to execute the task
+            crew = Crew(
+                agents=[agent],
+                tasks=[task],
+                verbose=True
+            )
+            return crew.kickoff()
     
     def _clean_json_output(self, text: str) -> str:
         """Clean LLM output to extract valid JSON."""
@@ -1,7 +1,7 @@
 """Environment configuration using Pydantic Settings."""
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import os
 
 
@@ -22,6 +22,62 @@ class Settings(BaseSettings):
     default_llm_model: str = "gpt-4-turbo-preview"
     max_search_results: int = 10
     
+    # Search Client (shared connection pool)
+    tavily_base_url: str = "https://api.tavily.com"
+    search_pool_max_connections: int = 20
+    search_pool_max_keepalive: int = 10
+    search_pool_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    search_http2: bool = True  # Needs h2, from the httpx[http2] extra
+    search_timeout_seconds: float = 30.0
+    
+    # Search Result Cache
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = 1024
+    search_cache_ttl_seconds: int = 3600
+    search_cache_category_ttls: Dict[str, int] = {
+        "flights": 900,  # Fares move fastest
+        "hotels": 6 * 3600,
+        "meeting_rooms": 6 * 3600,
+        "catering": 12 * 3600,
+    }
+    search_cache_path: str = ""  # SQLite file for the on-disk tier (empty = memory only)
+    
+    # Ranking
+    ranking_top_k: int = 50  # Packages kept per ranking
+    ranking_dense_limit: int = 4096  # Score all packages at once up to this many
+    ranking_diversity_pool: int = 2000  # Max candidates scanned by diversified ranking and per-category frontiers
+    ranking_mmr_lambda: float = 0.7  # MMR trade-off: 1.0 = pure score, 0.0 = pure diversity
+    ranking_vendor_quota: int = 2  # Max packages sharing a vendor in a category
+    ranking_enforce_must_haves: bool = True  # Drop items failing recognized must-haves
+    
+    # Ranking Result Cache
+    ranking_cache_enabled: bool = True
+    ranking_cache_max_entries: int = 256  # Rankings shared across sessions
+    ranking_cache_session_entries: int = 8  # Rankings (with paging state) kept per session
+    ranking_cache_ttl_seconds: int = 900
+    
+    # Requirements Analysis
+    requirements_fast_path_enabled: bool = True  # Skip the LLM for requests the rules parse confidently
+    requirements_fast_path_min_confidence: float = 0.9
+    
+    # Requirements Analysis Cache
+    requirements_cache_enabled: bool = True
+    requirements_cache_max_entries: int = 512
+    requirements_cache_ttl_seconds: int = 24 * 3600
+    requirements_cache_path: str = ""  # SQLite file for the on-disk tier (empty = memory only)
+    
+    # Analyst Agent Pool
+    analyst_pool_size: int = 4  # Idle analyst agents kept for reuse (and built at startup)
+    background_warmup_enabled: bool = True  # Import CrewAI and build agents after startup
+    
+    # LLM Calls
+    llm_max_concurrency: int = 4  # Blocking LLM calls running at once; the rest queue
+    llm_timeout_seconds: float = 60.0  # Per call, queueing included
+    
+    # Discovery Concurrency
+    search_max_concurrency: int = 16  # In-flight searches across all sessions
+    search_session_concurrency: int = 8  # In-flight searches per session
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
@@ -1,14 +1,57 @@
 """Retreat Planner Crew - Orchestrates all agents for retreat planning."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator, Iterator
+import copy
+import itertools
 import uuid
 from datetime import datetime
 
+from src.config import settings
+
 from src.agents.requirements_analyst import RequirementsAnalystAgent
 from src.agents.discovery_agent import DiscoveryAgent
 from src.agents.ranking_agent import RankingAgent
 from src.agents.cart_agent import CartAgent
 from src.agents.checkout_agent import CheckoutAgent
+from src.services.cache import TTLCache
+from src.utils.ids import fingerprint
+
+
+# Process-wide ranking cache shared by all sessions (created on first use)
+_ranking_cache: Optional[TTLCache] = None
+
+# Lookups in the per-session ranking caches, summed over all sessions
+_session_ranking_lookups = {"hits": 0, "misses": 0}
+
+
+def get_ranking_cache() -> TTLCache:
+    """Get the shared ranking result cache, creating it if needed."""
+    global _ranking_cache
+    if _ranking_cache is None:
+        _ranking_cache = TTLCache(
+            max_entries=settings.ranking_cache_max_entries,
+            default_ttl=settings.ranking_cache_ttl_seconds,
+            namespace="ranking"
+        )
+    return _ranking_cache
+
+
+def ranking_cache_stats() -> Dict[str, Any]:
+    """Hit rates of the per-session and shared ranking caches.
+    
+    A ranking is looked up in its session first and in the shared cache
+    only on a session miss. Session lookups are counted as they happen, so
+    this does not touch any session; "shared" is None until first used.
+    """
+    hits, misses = _session_ranking_lookups["hits"], _session_ranking_lookups["misses"]
+    return {
+        "session": {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        },
+        "shared": _ranking_cache.stats() if _ranking_cache is not None else None,
+    }
 
 
 class RetreatPlannerCrew:
@@ -27,10 +70,27 @@ class RetreatPlannerCrew:
         self.session_id = str(uuid.uuid4())
         self.created_at = datetime.now().isoformat()
         
+        # This session's recent rankings of the current items, with their
+        # paging streams; cleared whenever discovered_items is replaced
+        self._rankings = TTLCache(
+            max_entries=settings.ranking_cache_session_entries,
+            default_ttl=settings.ranking_cache_ttl_seconds,
+            namespace="session_ranking"
+        )
+        self._items_fingerprint: Optional[str] = None
+        
         # Workflow state
         self.requirements: Optional[Dict[str, Any]] = None
+        self.requirements_analysis: Optional[Dict[str, Any]] = None
         self.discovered_items: Optional[List[Dict[str, Any]]] = None
         self.ranked_packages: Optional[List[Dict[str, Any]]] = None
+        self.ranking_id: Optional[str] = None
+        self.ranking_weights: Optional[Dict[str, Any]] = None
+        self.must_have_report: Optional[List[Dict[str, Any]]] = None
+        self.frontier_packages: Optional[List[Dict[str, Any]]] = None
+        self.preset_packages: Optional[List[Dict[str, Any]]] = None
+        self.completion_packages: Optional[List[Dict[str, Any]]] = None
+        self.provisional_packages: Optional[List[Dict[str, Any]]] = None
         self.cart: Optional[Dict[str, Any]] = None
         
         # Initialize agents (lazy loading for some)
@@ -39,6 +99,21 @@ class RetreatPlannerCrew:
         self._ranking_agent: Optional[RankingAgent] = None
         self._cart_agent: Optional[CartAgent] = None
         self._checkout_agent: Optional[CheckoutAgent] = None
+        
+        # Rest of the current ranking, pulled lazily when paging past it
+        self._ranking_stream: Optional[Iterator[Dict[str, Any]]] = None
+    
+    @property
+    def discovered_items(self) -> Optional[List[Dict[str, Any]]]:
+        """Items found by the discovery agent."""
+        return self._discovered_items
+    
+    @discovered_items.setter
+    def discovered_items(self, items: Optional[List[Dict[str, Any]]]):
+        # Rankings of the previous items can never be hit again
+        self._discovered_items = items
+        self._items_fingerprint = None
+        self._rankings.clear()
     
     @property
     def requirements_agent(self) -> RequirementsAnalystAgent:
@@ -80,11 +155,16 @@ class RetreatPlannerCrew:
         
         Args:
             user_input: Natural language retreat requirements
-            
+        
+        How the input was analyzed (rules or LLM) is kept in
+        requirements_analysis.
+        
         Returns:
             Structured requirements dictionary
         """
-        self.requirements = await self.requirements_agent.analyze(user_input)
+        report = {}
+        self.requirements = await self.requirements_agent.analyze(user_input, report)
+        self.requirements_analysis = report or None
         return self.requirements
     
     async def run_discovery_agent(self) -> List[Dict[str, Any]]:
@@ -102,14 +182,74 @@ class RetreatPlannerCrew:
         self.discovered_items = await self.discovery_agent.discover(self.requirements)
         return self.discovered_items
     
+    async def run_discovery_agent_stream(self, rank: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """Execute Agent 2, yielding item batches as each search completes.
+        
+        Once the stream is exhausted, discovered_items holds every item in the
+        same order run_discovery_agent() would produce.
+        
+        With rank, each batch is also fed to an incremental ranking while the
+        remaining searches are still running, so ranking overlaps discovery:
+        every batch carries the provisional top packages, and when the stream
+        ends the session is ranked exactly as run_ranking_agent() would rank
+        it (with default weights), without scoring any item twice.
+        
+        Args:
+            rank: Rank packages incrementally as items arrive
+            
+        Yields:
+            Batches with "index", "category", "query" and "items" (plus
+            "packages", the provisional ranking, when rank is set)
+            
+        Raises:
+            ValueError: If requirements not analyzed yet
+        """
+        if not self.requirements:
+            raise ValueError("Requirements not analyzed yet. Run requirements analyst first.")
+        
+        ranking = self.ranking_agent.incremental(self.requirements) if rank else None
+        
+        batches = []
+        async for batch in self.discovery_agent.discover_stream(self.requirements):
+            batches.append(batch)
+            if ranking is not None:
+                ranking.add_items(batch["items"], order=batch["index"])
+                self.provisional_packages = ranking.packages()
+                batch = {**batch, "packages": self.provisional_packages}
+            yield batch
+        
+        self.discovered_items = [
+            item
+            for batch in sorted(batches, key=lambda b: b["index"])
+            for item in batch["items"]
+        ]
+        
+        if ranking is not None and self.discovered_items:
+            stream = ranking.iter_ranked()
+            self._use_ranking(self._ranking_key(None, False, False, None), {
+                "packages": list(itertools.islice(stream, settings.ranking_top_k)),
+                "stream": stream,
+                "report": self.ranking_agent.check_must_haves(self.discovered_items, self.requirements),
+            }, None, shared=True)
+    
     async def run_ranking_agent(
         self, 
-        custom_weights: Optional[Dict[str, Any]] = None
+        custom_weights: Optional[Dict[str, Any]] = None,
+        within_budget: bool = False,
+        quantity_adjusted: bool = False,
+        diversity: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Execute Agent 3: Intelligent Ranking.
         
+        Rankings are cached by item set and resolved weights: repeating a
+        ranking this session resumes it where it was (paging included), and
+        another session with the same items and weights reuses its packages.
+        
         Args:
             custom_weights: Optional custom weights for scoring
+            within_budget: Only rank packages that fit the budget
+            quantity_adjusted: Check the budget against quantity-adjusted costs
+            diversity: Optional diversified ordering (see RankingAgent.rank)
             
         Returns:
             List of ranked packages with scores and explanations
@@ -120,12 +260,246 @@ class RetreatPlannerCrew:
         if not self.discovered_items:
             raise ValueError("Items not discovered yet. Run discovery agent first.")
         
-        self.ranked_packages = await self.ranking_agent.rank(
+        key = self._ranking_key(custom_weights, within_budget, quantity_adjusted, diversity)
+        options = (custom_weights, within_budget, quantity_adjusted, None, diversity)
+        
+        if settings.ranking_cache_enabled:
+            ranking = self._rankings.get(key)
+            _session_ranking_lookups["hits" if ranking is not None else "misses"] += 1
+            if ranking is not None:
+                self._use_ranking(key, ranking, custom_weights)
+                return self.ranked_packages
+            
+            shared = get_ranking_cache().get(key)
+            if shared is not None:
+                # Sessions annotate their packages (explain() adds the
+                # explanation), so each one works on its own copy
+                packages, report = copy.deepcopy(shared)
+                self._use_ranking(key, {
+                    "packages": packages,
+                    "stream": self._resume_ranking(
+                        self.discovered_items, self.requirements, len(packages), options
+                    ),
+                    "report": report,
+                }, custom_weights)
+                return self.ranked_packages
+        
+        stream = self.ranking_agent.iter_ranked(self.discovered_items, self.requirements, *options)
+        self._use_ranking(key, {
+            "packages": list(itertools.islice(stream, settings.ranking_top_k)),
+            "stream": stream,
+            "report": self.ranking_agent.check_must_haves(self.discovered_items, self.requirements),
+        }, custom_weights, shared=True)
+        return self.ranked_packages
+    
+    def _ranking_key(
+        self,
+        custom_weights: Optional[Dict[str, Any]],
+        within_budget: bool,
+        quantity_adjusted: bool,
+        diversity: Optional[Dict[str, Any]]
+    ) -> str:
+        """Fingerprint a ranking of the current items.
+        
+        Same items (in discovery order), requirements and resolved weights
+        always produce the same ranking, so this is both the cache key and
+        the ranking_id cursors are checked against.
+        
+        Args:
+            custom_weights: Custom weights of the ranking
+            within_budget: Whether the ranking is budget-constrained
+            quantity_adjusted: Whether budget costs are quantity-adjusted
+            diversity: Diversified ordering of the ranking
+            
+        Returns:
+            Ranking fingerprint
+        """
+        if self._items_fingerprint is None:
+            self._items_fingerprint = fingerprint(self.discovered_items)
+        
+        return fingerprint({
+            "items": self._items_fingerprint,
+            "requirements": self.requirements,
+            "weights": self.ranking_agent.resolve_weights(custom_weights),
+            "within_budget": within_budget,
+            "quantity_adjusted": quantity_adjusted,
+            "diversity": diversity,
+        })
+    
+    def _resume_ranking(
+        self,
+        items: List[Dict[str, Any]],
+        requirements: Dict[str, Any],
+        skip: int,
+        options: tuple
+    ) -> Iterator[Dict[str, Any]]:
+        """Packages after the first skip of a ranking, ranked only if paged into.
+        
+        Args:
+            items: Items the ranking is over
+            requirements: Requirements the ranking used
+            skip: Number of packages already known
+            options: Remaining RankingAgent.iter_ranked arguments
+            
+        Yields:
+            Ranked packages from position skip + 1 on
+        """
+        yield from itertools.islice(
+            self.ranking_agent.iter_ranked(items, requirements, *options),
+            skip,
+            None
+        )
+    
+    def _use_ranking(
+        self,
+        key: str,
+        ranking: Dict[str, Any],
+        custom_weights: Optional[Dict[str, Any]],
+        shared: bool = False
+    ):
+        """Make a ranking the session's current one and cache it.
+        
+        Args:
+            key: Ranking fingerprint from _ranking_key
+            ranking: Dict with "packages", "stream" (rest of the ranking) and
+                "report" (must-have report)
+            custom_weights: Custom weights the ranking used
+            shared: Also offer the packages to other sessions
+        """
+        if settings.ranking_cache_enabled:
+            self._rankings.set(key, ranking)
+            if shared:
+                # Deep-copied: the session's own list grows as it is paged
+                # through and its packages are annotated as they are explained
+                get_ranking_cache().set(key, copy.deepcopy((ranking["packages"], ranking["report"])))
+        
+        self.ranked_packages = ranking["packages"]
+        self._ranking_stream = ranking["stream"]
+        self.must_have_report = ranking["report"]
+        self.ranking_weights = custom_weights
+        self.ranking_id = key
+        self.provisional_packages = None
+    
+    async def run_batch_ranking(
+        self,
+        presets: List[Optional[Dict[str, Any]]],
+        top_k: int
+    ) -> List[List[Dict[str, Any]]]:
+        """Rank packages under several weight presets at once.
+        
+        Does not replace the session's current ranking.
+        
+        Args:
+            presets: Custom weights per preset
+            top_k: Number of packages per preset
+            
+        Returns:
+            One list of ranked packages per preset
+            
+        Raises:
+            ValueError: If items not discovered yet
+        """
+        if not self.discovered_items:
+            raise ValueError("Items not discovered yet. Run discovery agent first.")
+        
+        rankings = await self.ranking_agent.rank_presets(
             self.discovered_items,
             self.requirements,
-            custom_weights
+            presets,
+            top_k
         )
-        return self.ranked_packages
+        self.preset_packages = [pkg for packages in rankings for pkg in packages]
+        return rankings
+    
+    async def run_locked_ranking(
+        self,
+        locked_items: Dict[str, str],
+        custom_weights: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Rank the best packages that keep the given items.
+        
+        Does not replace the session's current ranking.
+        
+        Args:
+            locked_items: Category -> item_id choices to keep
+            custom_weights: Optional custom weights for scoring
+            top_k: Number of packages to return
+            
+        Returns:
+            Ranked packages containing every locked item
+            
+        Raises:
+            ValueError: If items not discovered yet or a locked item is unknown
+        """
+        if not self.discovered_items:
+            raise ValueError("Items not discovered yet. Run discovery agent first.")
+        
+        self.completion_packages = await self.ranking_agent.rank(
+            self.discovered_items,
+            self.requirements,
+            custom_weights,
+            top_k,
+            locked_items=locked_items
+        )
+        return self.completion_packages
+    
+    async def run_frontier(
+        self,
+        custom_weights: Optional[Dict[str, Any]] = None,
+        per_category: bool = False,
+        max_points: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Compute the cost vs score Pareto frontier of packages.
+        
+        Args:
+            custom_weights: Optional custom weights for scoring
+            per_category: Compare per-category scores instead of final_score
+            max_points: Maximum number of frontier packages to return
+            
+        Returns:
+            Dict with frontier packages (cheapest first) and frontier_size
+            
+        Raises:
+            ValueError: If items not discovered yet
+        """
+        if not self.discovered_items:
+            raise ValueError("Items not discovered yet. Run discovery agent first.")
+        
+        result = self.ranking_agent.frontier(
+            self.discovered_items,
+            self.requirements,
+            custom_weights,
+            per_category,
+            max_points
+        )
+        self.frontier_packages = result["packages"]
+        return result
+    
+    def get_ranked_page(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Get a page of the current ranking without re-ranking.
+        
+        Packages past those already ranked are pulled from the live ranking
+        stream on demand.
+        
+        Args:
+            offset: Number of packages to skip
+            limit: Maximum number of packages to return
+            
+        Returns:
+            Ranked packages at positions offset .. offset + limit - 1
+            
+        Raises:
+            ValueError: If packages not ranked yet
+        """
+        if self.ranked_packages is None:
+            raise ValueError("Packages not ranked yet. Run ranking agent first.")
+        
+        missing = offset + limit - len(self.ranked_packages)
+        if missing > 0 and self._ranking_stream is not None:
+            self.ranked_packages.extend(itertools.islice(self._ranking_stream, missing))
+        
+        return self.ranked_packages[offset:offset + limit]
     
     async def run_cart_agent(self, package_id: str) -> Dict[str, Any]:
         """Execute Agent 4: Cart Building.
@@ -139,23 +513,56 @@ class RetreatPlannerCrew:
         Raises:
             ValueError: If packages not ranked yet or package not found
         """
-        if not self.ranked_packages:
+        selected_package = self.get_ranked_package(package_id)
+        
+        self.cart = await self.cart_agent.build_cart(
+            selected_package,
+            self.requirements
+        )
+        return self.cart
+    
+    def get_ranked_package(self, package_id: str) -> Dict[str, Any]:
+        """Find a ranked (or frontier, preset or locked-item) package by ID.
+        
+        Args:
+            package_id: ID of the package
+            
+        Returns:
+            The ranked package dictionary
+            
+        Raises:
+            ValueError: If packages not ranked yet or package not found
+        """
+        # Frontier, preset and locked-item packages can be selected too
+        candidates = (
+            (self.ranked_packages or [])
+            + (self.frontier_packages or [])
+            + (self.preset_packages or [])
+            + (self.completion_packages or [])
+        )
+        if not candidates:
             raise ValueError("Packages not ranked yet. Run ranking agent first.")
         
-        # Find the selected package
-        selected_package = next(
-            (p for p in self.ranked_packages if p.get("package_id") == package_id),
+        package = next(
+            (p for p in candidates if p.get("package_id") == package_id),
             None
         )
         
-        if not selected_package:
+        if not package:
             raise ValueError(f"Package {package_id} not found in ranked packages")
         
-        self.cart = await self.cart_agent.build_cart(
-            selected_package,
-            self.requirements
-        )
-        return self.cart
+        return package
+    
+    def explain_package(self, package: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a ranked package's explanation, generating it on first use.
+        
+        Args:
+            package: Ranked package dictionary
+            
+        Returns:
+            Explanation dictionary with why_ranked and category breakdowns
+        """
+        return self.ranking_agent.explain(package, self.requirements)
     
     async def modify_cart(self, modification: Dict[str, Any]) -> Dict[str, Any]:
         """Modify cart and potentially re-rank.
@@ -177,11 +584,7 @@ class RetreatPlannerCrew:
         # If weights changed, re-rank and rebuild cart
         if action == "adjust_weights":
             weights = modification.get("weights")
-            self.ranked_packages = await self.ranking_agent.rank(
-                self.discovered_items,
-                self.requirements,
-                weights
-            )
+            await self.run_ranking_agent(weights)
             # Rebuild cart with top package
             if self.ranked_packages:
                 top_package = self.ranked_packages[0]
@@ -231,6 +634,8 @@ class RetreatPlannerCrew:
             "has_requirements": self.requirements is not None,
             "discovered_items_count": len(self.discovered_items) if self.discovered_items else 0,
             "ranked_packages_count": len(self.ranked_packages) if self.ranked_packages else 0,
+            "ranking_id": self.ranking_id,
+            "ranking_cache": self._rankings.stats(),
             "has_cart": self.cart is not None,
             "cart_total": self.cart.get("total") if self.cart else None
         }
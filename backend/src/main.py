@@ -2,15 +2,26 @@
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, AsyncIterator
+import asyncio
+import json
 import os
 from dotenv import load_dotenv
 
 from src.config import settings
-from src.crew.retreat_crew import RetreatPlannerCrew
+from src.crew.retreat_crew import RetreatPlannerCrew, ranking_cache_stats
+from src.services.search_client import get_search_client, close_search_client
+from src.services.tavily_service import search_cache_stats, search_flights
+from src.agents.requirements_analyst import get_analyst_pool, load_crewai, requirements_cache_stats
+from src.services.llm_executor import get_llm_executor, shutdown_llm_executor
+from src.utils.ids import encode_cursor, decode_cursor
 from src.models.requests import (
     RetreatRequirementsRequest,
     WeightAdjustmentRequest,
+    BatchRankingRequest,
+    LockedRankingRequest,
     CartModificationRequest,
     CheckoutRequest,
 )
@@ -18,6 +29,9 @@ from src.models.responses import (
     RequirementsResponse,
     DiscoveryResponse,
     RankingResponse,
+    BatchRankingResponse,
+    PresetRanking,
+    FrontierResponse,
     CartResponse,
     CheckoutResponse,
     ParsedRequirements,
@@ -31,6 +45,34 @@ from src.models.responses import (
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    # Shared search connection pool, reused by every session
+    if settings.tavily_api_key or os.getenv("TAVILY_API_KEY"):
+        get_search_client()
+    # Heavy imports and agent construction run in the background, so /health
+    # is served as soon as the app itself has loaded
+    warm_up = asyncio.create_task(_warm_up()) if settings.background_warmup_enabled else None
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    await close_search_client()
+    shutdown_llm_executor()
+
+
+async def _warm_up() -> None:
+    """Import CrewAI and build the analyst agents off the request path."""
+    try:
+        await asyncio.to_thread(load_crewai)
+        if settings.openai_api_key or os.getenv("OPENAI_API_KEY"):
+            await asyncio.to_thread(get_analyst_pool().warm, settings.analyst_pool_size)
+    except Exception as e:
+        # The first request loads whatever is missing instead
+        print(f"Warm-up failed: {e}")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Retreat Planner API",
@@ -38,6 +80,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -73,7 +116,13 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "active_sessions": len(crew_instances)
+        "active_sessions": len(crew_instances),
+        "search_cache": search_cache_stats(),
+        "search_coalescing": search_flights.stats(),
+        "requirements_cache": requirements_cache_stats(),
+        "analyst_pool": get_analyst_pool().stats(),
+        "ranking_cache": ranking_cache_stats(),
+        "llm_executor": get_llm_executor().stats()
     }
 
 
@@ -110,9 +159,12 @@ async def analyze_requirements(request: RetreatRequirementsRequest):
             preferences=result.get("preferences"),
         )
         
+        analysis = crew.requirements_analysis or {}
         return RequirementsResponse(
             session_id=session_id,
             requirements=requirements,
+            analysis_path=analysis.get("path"),
+            analysis_confidence=analysis.get("confidence"),
             status="success",
             message="Requirements analyzed successfully"
         )
@@ -160,15 +212,120 @@ async def discover_options(session_id: str = Query(..., description="Session ID
         raise HTTPException(status_code=500, detail=f"Discovery failed: {str(e)}")
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _package_summary(pkg: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a ranked package for progress and demo responses."""
+    return {
+        "package_id": pkg["package_id"],
+        "rank": pkg["rank"],
+        "score": pkg["final_score"],
+        "total_cost": pkg["total_cost"]
+    }
+
+
+@app.post("/api/v1/discover-options/stream", tags=["Agents"])
+async def discover_options_stream(
+    session_id: str = Query(..., description="Session ID from analyze-requirements"),
+    rank: bool = Query(default=False, description="Also emit provisional rankings as items arrive")
+):
+    """Agent 2 (streaming): Emit discovered items as searches complete.
+    
+    Returns a Server-Sent Events stream with one `items` event per search
+    query (flights, hotels, ... in query order; searches run concurrently
+    and a finished one waits for those before it) and a final `summary`
+    event. The session's discovered items are fully populated at the end,
+    exactly as with /discover-options.
+    
+    With `rank`, every `items` event is followed by a `ranking` event with
+    the provisional top packages, and the session is ranked (default
+    weights) by the time `summary` is sent, so /rank-packages can page
+    through it without re-ranking.
+    """
+    crew = crew_instances.get(session_id)
+    if not crew:
+        raise HTTPException(status_code=404, detail="Session not found. Please analyze requirements first.")
+    if not crew.requirements:
+        raise HTTPException(status_code=400, detail="Requirements not analyzed yet. Run requirements analyst first.")
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for batch in crew.run_discovery_agent_stream(rank=rank):
+                yield _sse_event("items", {
+                    "category": batch["category"],
+                    "query": batch["query"],
+                    "items": [DiscoveredItem(**item).model_dump() for item in batch["items"]]
+                })
+                if rank:
+                    yield _sse_event("ranking", {
+                        "provisional": True,
+                        "top_packages": [_package_summary(p) for p in batch["packages"][:10]]
+                    })
+            
+            items = crew.discovered_items or []
+            categories = sorted(set(item["category"] for item in items))
+            yield _sse_event("summary", {
+                "session_id": session_id,
+                "items_count": len(items),
+                "items_by_category": {
+                    cat: len([i for i in items if i["category"] == cat])
+                    for cat in categories
+                },
+                "categories_searched": categories,
+                "status": "success",
+                "message": f"Discovered {len(items)} options across {len(categories)} categories"
+            })
+        except Exception as e:
+            yield _sse_event("error", {"status": "error", "message": f"Discovery failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/v1/rank-packages", response_model=RankingResponse, tags=["Agents"])
 async def rank_packages(
     session_id: str = Query(..., description="Session ID"),
-    weights: Optional[WeightAdjustmentRequest] = None
+    weights: Optional[WeightAdjustmentRequest] = None,
+    limit: int = Query(default=10, ge=1, le=100, description="Packages per page"),
+    offset: int = Query(default=0, ge=0, description="Packages to skip"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from a previous page"),
+    within_budget: bool = Query(default=False, description="Only rank packages that fit the budget"),
+    quantity_adjusted: bool = Query(
+        default=False,
+        description="With within_budget, cost packages as price x cart quantity"
+    ),
+    diversity: Optional[str] = Query(
+        default=None,
+        pattern="^(mmr|vendor_quota)$",
+        description="Diversify the ranking: 'mmr' or 'vendor_quota'"
+    ),
+    diversity_lambda: Optional[float] = Query(
+        default=None,
+        ge=0,
+        le=1,
+        description="MMR trade-off (1.0 = pure score, 0.0 = pure diversity)"
+    ),
+    vendor_quota: Optional[int] = Query(
+        default=None,
+        ge=1,
+        description="Max packages sharing a vendor in a category"
+    )
 ):
     """Agent 3: Rank packages with optional custom weights.
     
     Creates package combinations from discovered items and scores them
     based on configurable criteria weights.
+    
+    Passing a cursor (or an offset > 0) pages through the session's current
+    ranking instead of re-ranking it. With within_budget, only packages whose
+    cost fits the budget are ranked. With diversity, near-identical packages
+    are pushed down in favour of ones using different items or vendors.
     """
     try:
         crew = crew_instances.get(session_id)
@@ -176,43 +333,61 @@ async def rank_packages(
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Convert weights to dict if provided
-        custom_weights = None
-        if weights:
-            custom_weights = {}
-            if weights.category_importance:
-                custom_weights["category_importance"] = weights.category_importance.model_dump()
-            if weights.flights:
-                custom_weights["flights"] = weights.flights.model_dump(exclude_none=True)
-            if weights.hotels:
-                custom_weights["hotels"] = weights.hotels.model_dump(exclude_none=True)
-            if weights.meeting_rooms:
-                custom_weights["meeting_rooms"] = weights.meeting_rooms.model_dump(exclude_none=True)
-            if weights.catering:
-                custom_weights["catering"] = weights.catering.model_dump(exclude_none=True)
-        
-        # Run ranking
-        result = await crew.run_ranking_agent(custom_weights)
-        
-        # Convert to response model (simplified for now)
-        packages = []
-        for pkg in result[:10]:  # Limit to top 10
-            packages.append(RankedPackage(
-                package_id=pkg["package_id"],
-                rank=pkg["rank"],
-                final_score=pkg["final_score"],
-                category_scores=pkg["category_scores"],
-                items={cat: DiscoveredItem(**item) for cat, item in pkg["items"].items()},
-                total_cost=pkg["total_cost"],
-                explanation={
-                    "why_ranked": pkg["explanation"]["why_ranked"],
-                    "category_breakdowns": pkg["explanation"].get("category_breakdowns", {})
-                }
-            ))
+        custom_weights = _weights_to_dict(weights)
+        
+        if cursor:
+            ranking_id, offset = decode_cursor(cursor)
+            if ranking_id != crew.ranking_id:
+                raise HTTPException(status_code=409, detail="Cursor is stale; the ranking has changed")
+        
+        if cursor or offset:
+            if custom_weights:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Paging cannot change weights; re-rank without a cursor first"
+                )
+            # Pages come from the current ranking, so its options cannot change either
+            options = {
+                "within_budget": within_budget,
+                "quantity_adjusted": quantity_adjusted,
+                "diversity": diversity,
+                "diversity_lambda": diversity_lambda,
+                "vendor_quota": vendor_quota,
+            }
+            changed = [name for name, value in options.items() if value not in (None, False)]
+            if changed:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Paging cannot change {', '.join(changed)}; re-rank without a cursor first"
+                )
+            custom_weights = crew.ranking_weights
+        else:
+            # Unset options fall back to the settings defaults in the agent
+            diversity_options = None
+            if diversity:
+                diversity_options = {"mode": diversity}
+                if diversity_lambda is not None:
+                    diversity_options["lambda"] = diversity_lambda
+                if vendor_quota is not None:
+                    diversity_options["quota"] = vendor_quota
+            
+            # Run ranking
+            await crew.run_ranking_agent(custom_weights, within_budget, quantity_adjusted, diversity_options)
+        
+        # One extra package tells whether there is a next page
+        page = crew.get_ranked_page(offset, limit + 1)
+        next_cursor = encode_cursor(crew.ranking_id, offset + limit) if len(page) > limit else None
+        
+        # Convert to response model; only returned packages get explanations
+        packages = [_to_ranked_package(crew, pkg) for pkg in page[:limit]]
         
         return RankingResponse(
             session_id=session_id,
             packages=packages,
             weights_used=custom_weights,
+            constraints=crew.must_have_report or [],
+            offset=offset,
+            next_cursor=next_cursor,
             status="success",
             message=f"Ranked {len(packages)} packages"
         )
@@ -224,6 +399,186 @@ async def rank_packages(
         raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
 
 
+@app.post("/api/v1/rank-packages/batch", response_model=BatchRankingResponse, tags=["Agents"])
+async def rank_packages_batch(
+    request: BatchRankingRequest,
+    session_id: str = Query(..., description="Session ID"),
+    top_k: int = Query(default=10, ge=1, le=50, description="Packages per preset")
+):
+    """Agent 3: Rank packages under several weight presets side by side.
+    
+    All presets are scored together from shared component scores, so
+    comparing 20 presets costs far less than 20 /rank-packages calls. The
+    session's current ranking is left unchanged.
+    """
+    try:
+        crew = crew_instances.get(session_id)
+        if not crew:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        presets = [_weights_to_dict(preset) for preset in request.presets]
+        rankings = await crew.run_batch_ranking(presets, top_k)
+        
+        results = [
+            PresetRanking(
+                name=preset.name,
+                weights_used=weights,
+                packages=[_to_ranked_package(crew, pkg) for pkg in packages]
+            )
+            for preset, weights, packages in zip(request.presets, presets, rankings)
+        ]
+        
+        return BatchRankingResponse(
+            session_id=session_id,
+            results=results,
+            status="success",
+            message=f"Ranked packages under {len(results)} presets"
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch ranking failed: {str(e)}")
+
+
+@app.post("/api/v1/rank-packages/complete", response_model=RankingResponse, tags=["Agents"])
+async def rank_packages_complete(
+    request: LockedRankingRequest,
+    session_id: str = Query(..., description="Session ID"),
+    top_k: int = Query(default=10, ge=1, le=50, description="Packages to return")
+):
+    """Agent 3: Best packages that keep the locked items.
+    
+    Pin e.g. a hotel and get the best flights, rooms and catering around it.
+    The session's current ranking is left unchanged.
+    """
+    try:
+        crew = crew_instances.get(session_id)
+        if not crew:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        custom_weights = _weights_to_dict(request.weights)
+        result = await crew.run_locked_ranking(request.locked_items, custom_weights, top_k)
+        
+        packages = [_to_ranked_package(crew, pkg) for pkg in result]
+        
+        return RankingResponse(
+            session_id=session_id,
+            packages=packages,
+            weights_used=custom_weights,
+            status="success",
+            message=f"Ranked {len(packages)} packages around {len(request.locked_items)} locked items"
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ranking failed: {str(e)}")
+
+
+@app.post("/api/v1/rank-packages/frontier", response_model=FrontierResponse, tags=["Agents"])
+async def rank_packages_frontier(
+    session_id: str = Query(..., description="Session ID"),
+    weights: Optional[WeightAdjustmentRequest] = None,
+    per_category: bool = Query(
+        default=False,
+        description="Compare per-category scores instead of final_score"
+    ),
+    limit: int = Query(default=50, ge=2, le=500, description="Maximum frontier packages to return")
+):
+    """Agent 3: Pareto frontier of packages on total cost vs score.
+    
+    Returns the packages no other package beats on both price and quality,
+    cheapest first, using the same item scores as /rank-packages.
+    """
+    try:
+        crew = crew_instances.get(session_id)
+        if not crew:
+            raise HTTPException(status_code=404, detail="Session not found")
+        
+        custom_weights = _weights_to_dict(weights)
+        result = await crew.run_frontier(custom_weights, per_category, limit)
+        
+        packages = [_to_ranked_package(crew, pkg) for pkg in result["packages"]]
+        
+        return FrontierResponse(
+            session_id=session_id,
+            packages=packages,
+            frontier_size=result["frontier_size"],
+            per_category=per_category,
+            weights_used=custom_weights,
+            status="success",
+            message=f"{result['frontier_size']} packages on the frontier, {len(packages)} returned"
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Frontier failed: {str(e)}")
+
+
+@app.get("/api/v1/packages/{package_id}", response_model=RankedPackage, tags=["Agents"])
+async def get_package(
+    package_id: str,
+    session_id: str = Query(..., description="Session ID")
+):
+    """Get one ranked package with its explanation.
+    
+    Explanations are generated on first request, so packages beyond the
+    top 10 returned by /rank-packages can be explained on demand.
+    """
+    crew = crew_instances.get(session_id)
+    if not crew:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        package = crew.get_ranked_package(package_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return _to_ranked_package(crew, package)
+
+
+def _weights_to_dict(weights: Optional[WeightAdjustmentRequest]) -> Optional[Dict[str, Any]]:
+    """Convert a weight adjustment request to the ranking agent's weights dict."""
+    if not weights:
+        return None
+    
+    custom_weights = {}
+    if weights.category_importance:
+        custom_weights["category_importance"] = weights.category_importance.model_dump()
+    if weights.flights:
+        custom_weights["flights"] = weights.flights.model_dump(exclude_none=True)
+    if weights.hotels:
+        custom_weights["hotels"] = weights.hotels.model_dump(exclude_none=True)
+    if weights.meeting_rooms:
+        custom_weights["meeting_rooms"] = weights.meeting_rooms.model_dump(exclude_none=True)
+    if weights.catering:
+        custom_weights["catering"] = weights.catering.model_dump(exclude_none=True)
+    return custom_weights
+
+
+def _to_ranked_package(crew: RetreatPlannerCrew, pkg: Dict[str, Any]) -> RankedPackage:
+    """Convert a ranked package dict to the response model, explaining it."""
+    explanation = crew.explain_package(pkg)
+    return RankedPackage(
+        package_id=pkg["package_id"],
+        rank=pkg["rank"],
+        final_score=pkg["final_score"],
+        category_scores=pkg["category_scores"],
+        items={cat: DiscoveredItem(**item) for cat, item in pkg["items"].items()},
+        total_cost=pkg["total_cost"],
+        budget_cost=pkg.get("budget_cost"),
+        explanation={
+            "why_ranked": explanation["why_ranked"],
+            "category_breakdowns": explanation.get("category_breakdowns", {})
+        }
+    )
+
+
 @app.post("/api/v1/cart/build", response_model=CartResponse, tags=["Cart"])
 async def build_cart(
     session_id: str = Query(..., description="Session ID"),
@@ -388,7 +743,8 @@ async def run_full_flow(request: RetreatRequirementsRequest):
     """Run all agents in sequence (for testing/demo).
     
     Executes the complete flow: requirements -> discovery -> ranking
-    Returns a summary of results.
+    Returns a summary of results. Ranking runs incrementally while discovery
+    searches are still in flight, so it adds little time after the last one.
     """
     try:
         crew = RetreatPlannerCrew()
@@ -397,11 +753,11 @@ async def run_full_flow(request: RetreatRequirementsRequest):
         # Agent 1: Requirements
         requirements = await crew.run_requirements_analyst(request.user_input)
         
-        # Agent 2: Discovery
-        items = await crew.run_discovery_agent()
-        
-        # Agent 3: Ranking
-        packages = await crew.run_ranking_agent()
+        # Agents 2 + 3: rank each search's items while the others are running
+        async for _ in crew.run_discovery_agent_stream(rank=True):
+            pass
+        items = crew.discovered_items or []
+        packages = crew.ranked_packages or []
         
         # Store crew for potential follow-up
         crew_instances[session_id] = crew
@@ -414,15 +770,7 @@ async def run_full_flow(request: RetreatRequirementsRequest):
                 cat: len([i for i in items if i["category"] == cat])
                 for cat in set(i["category"] for i in items)
             },
-            "top_packages": [
-                {
-                    "package_id": p["package_id"],
-                    "rank": p["rank"],
-                    "score": p["final_score"],
-                    "total_cost": p["total_cost"]
-                }
-                for p in packages[:3]
-            ],
+            "top_packages": [_package_summary(p) for p in packages[:3]],
             "status": "success"
         }
     except Exception as e:
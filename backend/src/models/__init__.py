@@ -3,6 +3,8 @@
 from src.models.requests import (
     RetreatRequirementsRequest,
     WeightAdjustmentRequest,
+    BatchRankingRequest,
+    LockedRankingRequest,
     CartModificationRequest,
     CheckoutRequest,
 )
@@ -10,6 +12,8 @@ from src.models.responses import (
     RequirementsResponse,
     DiscoveryResponse,
     RankingResponse,
+    BatchRankingResponse,
+    FrontierResponse,
     CartResponse,
     CheckoutResponse,
 )
@@ -17,11 +21,15 @@ from src.models.responses import (
 __all__ = [
     "RetreatRequirementsRequest",
     "WeightAdjustmentRequest",
+    "BatchRankingRequest",
+    "LockedRankingRequest",
     "CartModificationRequest",
     "CheckoutRequest",
     "RequirementsResponse",
     "DiscoveryResponse",
     "RankingResponse",
+    "BatchRankingResponse",
+    "FrontierResponse",
     "CartResponse",
     "CheckoutResponse",
 ]
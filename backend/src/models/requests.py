@@ -67,6 +67,40 @@ class WeightAdjustmentRequest(BaseModel):
     )
 
 
+class WeightPreset(WeightAdjustmentRequest):
+    """A named set of ranking weights for what-if comparisons."""
+    
+    name: Optional[str] = Field(
+        default=None,
+        description="Preset label, e.g. 'cost-first' or 'exec retreat'"
+    )
+
+
+class BatchRankingRequest(BaseModel):
+    """Request model for ranking under several weight presets at once."""
+    
+    presets: List[WeightPreset] = Field(
+        ...,
+        min_length=1,
+        max_length=20,
+        description="Weight presets to rank under"
+    )
+
+
+class LockedRankingRequest(BaseModel):
+    """Request model for ranking completions around locked items."""
+    
+    locked_items: Dict[str, str] = Field(
+        ...,
+        min_length=1,
+        description="Category -> item_id choices to keep, e.g. {'hotels': 'hotels_3f2a...'}"
+    )
+    weights: Optional[WeightAdjustmentRequest] = Field(
+        default=None,
+        description="Optional custom weights"
+    )
+
+
 class CartModificationRequest(BaseModel):
     """Request model for modifying cart items."""
     
@@ -92,6 +92,10 @@ class RankedPackage(BaseModel):
     category_scores: Dict[str, float] = Field(..., description="Scores per category")
     items: Dict[str, DiscoveredItem] = Field(..., description="Items in the package")
     total_cost: float = Field(..., ge=0, description="Total package cost")
+    budget_cost: Optional[float] = Field(
+        default=None,
+        description="Cost checked against the budget (budget-constrained ranking only)"
+    )
     explanation: PackageExplanation = Field(..., description="Ranking explanation")
 
 
@@ -132,6 +136,14 @@ class RequirementsResponse(BaseModel):
     
     session_id: str = Field(..., description="Session ID for subsequent calls")
     requirements: ParsedRequirements = Field(..., description="Parsed requirements")
+    analysis_path: Optional[str] = Field(
+        default=None,
+        description="How the input was parsed: rules (no LLM call), llm, fallback, or cache (an earlier identical request)"
+    )
+    analysis_confidence: Optional[float] = Field(
+        default=None,
+        description="Rule parser confidence (0-1); the LLM is used below the threshold"
+    )
     status: str = Field(default="success", description="Response status")
     message: Optional[str] = Field(default=None, description="Optional message")
 
@@ -149,6 +161,16 @@ class DiscoveryResponse(BaseModel):
     message: Optional[str] = Field(default=None, description="Optional message")
 
 
+class ConstraintReport(BaseModel):
+    """How many items meet one must-have."""
+    
+    constraint: str = Field(..., description="Must-have text from the requirements")
+    category: Optional[str] = Field(default=None, description="Category it applies to")
+    applied: bool = Field(..., description="Whether it was recognized and enforced")
+    items_total: int = Field(..., ge=0, description="Items in the category")
+    items_matched: int = Field(..., ge=0, description="Items meeting the must-have")
+
+
 class RankingResponse(BaseModel):
     """Response from ranking endpoint."""
     
@@ -158,6 +180,56 @@ class RankingResponse(BaseModel):
         default=None,
         description="Weights used for ranking"
     )
+    constraints: List[ConstraintReport] = Field(
+        default_factory=list,
+        description="Must-have filtering applied before ranking"
+    )
+    offset: int = Field(default=0, description="Position of the first package in the ranking")
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Cursor for the next page (None when the ranking is exhausted)"
+    )
+    status: str = Field(default="success", description="Response status")
+    message: Optional[str] = Field(default=None, description="Optional message")
+
+
+class PresetRanking(BaseModel):
+    """Top packages under one weight preset."""
+    
+    name: Optional[str] = Field(default=None, description="Preset label")
+    weights_used: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Weights used for ranking"
+    )
+    packages: List[RankedPackage] = Field(..., description="Ranked packages")
+
+
+class BatchRankingResponse(BaseModel):
+    """Response from the batch ranking endpoint."""
+    
+    session_id: str = Field(..., description="Session ID")
+    results: List[PresetRanking] = Field(..., description="Rankings in preset order")
+    status: str = Field(default="success", description="Response status")
+    message: Optional[str] = Field(default=None, description="Optional message")
+
+
+class FrontierResponse(BaseModel):
+    """Response from the Pareto frontier endpoint."""
+    
+    session_id: str = Field(..., description="Session ID")
+    packages: List[RankedPackage] = Field(
+        ...,
+        description="Pareto-optimal packages, cheapest first (rank is the position on the frontier)"
+    )
+    frontier_size: int = Field(..., ge=0, description="Packages on the full frontier")
+    per_category: bool = Field(
+        default=False,
+        description="Whether dominance compared per-category scores instead of final_score"
+    )
+    weights_used: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Weights used for ranking"
+    )
     status: str = Field(default="success", description="Response status")
     message: Optional[str] = Field(default=None, description="Optional message")
 
@@ -1,6 +1,7 @@
 """Service modules for retreat planning."""
 
+from src.services.cache import TTLCache
 from src.services.tavily_service import TavilyService
 from src.services.scoring_service import ScoringService
 
-__all__ = ["TavilyService", "ScoringService"]
+__all__ = ["TTLCache", "TavilyService", "ScoringService"]
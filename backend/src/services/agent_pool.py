@@ -0,0 +1,107 @@
+"""Pool of pre-built, reusable objects that must be used by one caller at a time."""
+
+from typing import Dict, Any, Callable, Generic, Iterator, List, TypeVar
+from contextlib import contextmanager
+import threading
+
+T = TypeVar("T")
+
+
+class AgentPool(Generic[T]):
+    """Reuse expensive-to-build agents across sessions.
+    
+    An agent is checked out exclusively for the duration of a call and
+    returned afterwards, so concurrent calls never share one. Checkout never
+    waits: when no idle agent is left a new one is built, and at most
+    max_idle agents are kept for reuse. An agent whose call raised is
+    discarded rather than reused, since its state is unknown.
+    """
+    
+    def __init__(self, factory: Callable[[], T], max_idle: int):
+        """Create an empty pool.
+        
+        Args:
+            factory: Builds a new agent
+            max_idle: Maximum number of idle agents kept for reuse
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: List[T] = []
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._stats = {
+            "created": 0,
+            "reused": 0,
+            "discarded": 0,
+        }
+    
+    def warm(self, count: int) -> None:
+        """Build agents until count are idle (capped at max_idle).
+        
+        Args:
+            count: Number of idle agents wanted
+        """
+        with self._lock:
+            missing = min(count, self.max_idle) - len(self._idle)
+        for _ in range(missing):
+            agent = self.factory()
+            with self._lock:
+                self._stats["created"] += 1
+                self._idle.append(agent)
+    
+    def acquire(self) -> T:
+        """Check out an idle agent, building one if none is left."""
+        with self._lock:
+            self._in_use += 1
+            if self._idle:
+                self._stats["reused"] += 1
+                return self._idle.pop()
+        
+        try:
+            agent = self.factory()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+        with self._lock:
+            self._stats["created"] += 1
+        return agent
+    
+    def release(self, agent: T, discard: bool = False) -> None:
+        """Return a checked-out agent.
+        
+        Args:
+            agent: Agent from acquire()
+            discard: Drop the agent instead of keeping it for reuse
+        """
+        with self._lock:
+            self._in_use -= 1
+            if discard or len(self._idle) >= self.max_idle:
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append(agent)
+    
+    @contextmanager
+    def checkout(self) -> Iterator[T]:
+        """Check out an agent for a with-block; it is discarded if the block raises."""
+        agent = self.acquire()
+        try:
+            yield agent
+        except BaseException:
+            self.release(agent, discard=True)
+            raise
+        self.release(agent)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get reuse counters.
+        
+        Returns:
+            Dict with counters and the number of "idle" and "in_use" agents
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "max_idle": self.max_idle,
+            }
@@ -0,0 +1,240 @@
+"""In-memory LRU cache with TTLs and an optional SQLite tier."""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a TTL.
+    
+    Entries live in memory; when a SQLite path is given they are also written
+    through to disk so they survive restarts. Values must be JSON-serializable
+    when the disk tier is enabled. Cached values are shared, so callers must
+    treat them as read-only.
+    
+    Async code should use aget()/aset(), which run disk reads and writes on a
+    worker thread; get()/set() touch the disk on the calling thread. The disk
+    tier is bounded too: expired rows and, past max_disk_entries, the rows
+    closest to expiry are deleted as new ones are written.
+    """
+    
+    # Prune the disk tier once every this many writes
+    PRUNE_EVERY = 64
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        default_ttl: float = 3600,
+        path: Optional[str] = None,
+        namespace: str = "default",
+        max_disk_entries: Optional[int] = None
+    ):
+        """Create the cache.
+        
+        Args:
+            max_entries: Maximum number of in-memory entries before LRU eviction
+            default_ttl: Default time-to-live in seconds
+            path: Optional SQLite file for the on-disk tier (opened on first use)
+            namespace: Table-level namespace so caches can share one file
+            max_disk_entries: Maximum rows kept on disk (defaults to 10x max_entries)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self.path = path
+        self.max_disk_entries = max_disk_entries or 10 * max_entries
+        
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "disk_hits": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_evictions": 0,
+        }
+        
+        # Disk access is serialized separately so memory lookups never wait on it
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Look up a key, checking memory first and then the disk tier.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None on a miss
+        """
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        return self._get_disk(key) if self.path else self._miss()
+    
+    async def aget(self, key: str) -> Optional[Any]:
+        """Like get(), but a disk lookup runs on a worker thread."""
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        return await asyncio.to_thread(self._get_disk, key) if self.path else self._miss()
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (defaults to default_ttl)
+        """
+        expires_at = self._set_memory(key, value, ttl)
+        if self.path:
+            self._put_disk(key, value, expires_at)
+    
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Like set(), but the disk write runs on a worker thread."""
+        expires_at = self._set_memory(key, value, ttl)
+        if self.path:
+            await asyncio.to_thread(self._put_disk, key, value, expires_at)
+    
+    def clear(self) -> None:
+        """Remove all entries from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._db_lock:
+                db = self._connect()
+                db.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                db.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters.
+        
+        Returns:
+            Dict with counters, current size, and hit rate
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "disk_tier": bool(self.path),
+            }
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _get_memory(self, key: str) -> Tuple[bool, Optional[Any]]:
+        """Look up the memory tier, dropping an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return True, value
+                del self._entries[key]
+                self._stats["expirations"] += 1
+        return False, None
+    
+    def _set_memory(self, key: str, value: Any, ttl: Optional[float]) -> float:
+        """Store in the memory tier and return the entry's expiry time."""
+        expires_at = time.time() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+        return expires_at
+    
+    def _miss(self) -> None:
+        """Count a miss."""
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+    
+    def _get_disk(self, key: str) -> Optional[Any]:
+        """Look up the disk tier, promoting a hit into memory (blocking)."""
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+        
+        if row is None or row[1] <= time.time():
+            return self._miss()
+        
+        value = json.loads(row[0])
+        with self._lock:
+            self._store(key, value, row[1])
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+        return value
+    
+    def _put_disk(self, key: str, value: Any, expires_at: float) -> None:
+        """Write an entry through to disk, pruning now and then (blocking)."""
+        payload = json.dumps(value)
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.namespace, key, payload, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(db)
+            db.commit()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the disk tier on first use (caller holds _db_lock)."""
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT, key TEXT, value TEXT, expires_at REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_expiry ON cache_entries (namespace, expires_at)"
+            )
+            self._prune(db)
+            db.commit()
+            self._db = db
+        return self._db
+    
+    def _prune(self, db: sqlite3.Connection) -> None:
+        """Delete expired rows, then the rows closest to expiry past max_disk_entries."""
+        db.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, time.time())
+        )
+        (count,) = db.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,)
+        ).fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM cache_entries WHERE rowid IN ("
+                "SELECT rowid FROM cache_entries WHERE namespace = ? ORDER BY expires_at LIMIT ?)",
+                (self.namespace, excess)
+            )
+            with self._lock:
+                self._stats["disk_evictions"] += excess
+    
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        """Insert into the memory tier, evicting least-recently-used entries."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
@@ -0,0 +1,117 @@
+"""Diversified selection over a best-first stream of scored candidates."""
+
+from typing import Any, Hashable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+# A candidate is (score, per-category keys, payload)
+Candidate = Tuple[float, Sequence[Hashable], Any]
+
+
+def iter_mmr(
+    candidates: Iterator[Candidate],
+    lambda_: float,
+    pool_limit: int
+) -> Iterator[Candidate]:
+    """Re-order candidates by maximal marginal relevance (MMR).
+    
+    Each pick maximizes lambda * score/100 - (1 - lambda) * similarity to the
+    closest already-picked candidate, where similarity is the share of
+    categories with the same key. Candidates must arrive in descending score
+    order, so an unseen candidate can never beat lambda * (last score)/100:
+    the stream is only pulled until the best pooled candidate reaches that
+    bound, which keeps the pool small instead of materializing every package.
+    
+    Args:
+        candidates: Candidates in descending score order
+        lambda_: Trade-off between score (1.0) and diversity (0.0)
+        pool_limit: Maximum number of candidates pulled from the stream
+        
+    Yields:
+        Candidates in MMR order
+    """
+    pool: List[Candidate] = []
+    key_codes = {}
+    codes = np.empty((0, 0), dtype=int)  # Key code per (candidate, category)
+    scores = np.empty(0)
+    max_sim = np.empty(0)
+    picked = np.empty(0, dtype=bool)
+    exhausted = False
+    
+    while True:
+        # Pull until nothing unseen can beat the best pooled candidate
+        values = lambda_ * scores / 100 - (1 - lambda_) * max_sim
+        values[picked] = -np.inf
+        best = int(np.argmax(values)) if len(pool) and not picked.all() else None
+        
+        if not exhausted and len(pool) < pool_limit and (
+            best is None or values[best] < lambda_ * scores[-1] / 100
+        ):
+            batch = []
+            for candidate in candidates:
+                batch.append(candidate)
+                if len(batch) >= 32 or len(pool) + len(batch) >= pool_limit:
+                    break
+            else:
+                exhausted = True
+            if batch:
+                pool.extend(batch)
+                batch_codes = np.array([
+                    [key_codes.setdefault(key, len(key_codes)) for key in keys]
+                    for _, keys, _ in batch
+                ])
+                batch_sim = np.zeros(len(batch))
+                for index in np.flatnonzero(picked):
+                    batch_sim = np.maximum(batch_sim, (batch_codes == codes[index]).mean(axis=1))
+                
+                codes = np.vstack([codes, batch_codes]) if len(codes) else batch_codes
+                scores = np.append(scores, [score for score, _, _ in batch])
+                max_sim = np.append(max_sim, batch_sim)
+                picked = np.append(picked, np.zeros(len(batch), dtype=bool))
+            continue
+        
+        if best is None:
+            return
+        
+        picked[best] = True
+        max_sim = np.maximum(max_sim, (codes == codes[best]).mean(axis=1))
+        yield pool[best]
+
+
+def iter_quota(
+    candidates: Iterator[Candidate],
+    quota: int,
+    pool_limit: int
+) -> Iterator[Candidate]:
+    """Yield candidates in order, capping how often each key is used.
+    
+    A candidate is deferred while any of its keys (e.g. a category's vendor)
+    has already been used quota times. Once pool_limit candidates have been
+    pulled or the stream ends, deferred candidates follow in score order so
+    the result is never shorter than the unconstrained ranking.
+    
+    Args:
+        candidates: Candidates in descending score order
+        quota: Maximum picks sharing any one key
+        pool_limit: Maximum number of candidates pulled before relaxing
+        
+    Yields:
+        Candidates, diverse ones first
+    """
+    usage = {}
+    deferred = []
+    
+    for pulled, candidate in enumerate(candidates, 1):
+        keys = candidate[1]
+        if all(usage.get(key, 0) < quota for key in keys):
+            for key in keys:
+                usage[key] = usage.get(key, 0) + 1
+            yield candidate
+        else:
+            deferred.append(candidate)
+        
+        if pulled >= pool_limit:
+            break
+    
+    yield from deferred
+    yield from candidates
@@ -0,0 +1,181 @@
+"""Feature bitsets for discovered items and must-have constraints.
+
+Each item's metadata is reduced to two integers: which features it has and
+which features its metadata says anything about. A must-have constraint is
+a (category, mask) pair, so checking an item is a single bitmask test.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import math
+import re
+
+
+# Star ratings in half-star steps; an item rated r has every level <= r
+STAR_LEVELS = [level / 2 for level in range(2, 11)]
+
+# A star rating in text, e.g. "4-star", "4 star" or "4.5 stars"
+STAR_PATTERN = re.compile(r"(?<![\d.])(\d(?:\.\d)?)\s*-?\s*star")
+
+# Feature vocabulary per category (lowercase names)
+CATEGORY_FEATURES: Dict[str, List[str]] = {
+    "flights": ["nonstop"],
+    "hotels": [
+        "wifi", "pool", "fitness center", "spa", "restaurant", "bar",
+        "business center", "parking", "conference room", "room service",
+        "concierge", "airport shuttle",
+        *(f"{level:g}-star" for level in STAR_LEVELS),
+    ],
+    "meeting_rooms": [
+        "projector", "whiteboard", "video conferencing", "wifi",
+        "sound system", "microphone",
+    ],
+    "catering": [
+        "vegetarian", "vegan", "gluten-free", "kosher", "halal",
+        "dairy-free", "nut-free",
+    ],
+}
+
+# Metadata list holding each category's named features
+FEATURE_LISTS = {
+    "hotels": "amenities",
+    "meeting_rooms": "equipment",
+    "catering": "dietary_options",
+}
+
+# One bit per (category, feature)
+FEATURE_BITS: Dict[Tuple[str, str], int] = {
+    key: 1 << bit
+    for bit, key in enumerate(
+        (category, feature)
+        for category, features in CATEGORY_FEATURES.items()
+        for feature in features
+    )
+}
+
+# Words in a must-have that point at a category
+CATEGORY_HINTS = {
+    "flights": ("flight", "airline", "nonstop", "non-stop", "direct"),
+    "hotels": ("hotel", "star", "stay", "lodging", "accommodation"),
+    "meeting_rooms": ("meeting", "conference", "venue", "room"),
+    "catering": ("catering", "food", "meal", "diet", "menu"),
+}
+
+# Alternative spellings of feature names
+SYNONYMS = {
+    "non-stop": "nonstop",
+    "direct": "nonstop",
+    "wi-fi": "wifi",
+    "gym": "fitness center",
+    "av": "video conferencing",
+    "gluten free": "gluten-free",
+    "dairy free": "dairy-free",
+    "nut free": "nut-free",
+    "conference rooms": "conference room",
+}
+
+# Must-haves asking for a category itself, which any of its items meets
+CATEGORY_REQUIREMENTS = {
+    "meeting_rooms": re.compile(r"\bmeeting (?:rooms?|spaces?)\b"),
+}
+
+
+def _category_mask(category: str) -> int:
+    """All feature bits of one category."""
+    return sum(bit for (cat, _), bit in FEATURE_BITS.items() if cat == category)
+
+
+def _star_mask(stars: float) -> int:
+    """Bits for a star rating of at least stars (ratings set every lower bit)."""
+    return sum(
+        FEATURE_BITS[("hotels", f"{level:g}-star")]
+        for level in STAR_LEVELS
+        if level <= stars
+    )
+
+
+def item_feature_bits(category: str, metadata: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """Compute an item's feature bitset from its metadata.
+    
+    Args:
+        category: Item category
+        metadata: Item metadata (as built by DiscoveryAgent._extract_metadata)
+        
+    Returns:
+        Tuple of (bits the item has, bits its metadata covers)
+    """
+    metadata = metadata or {}
+    has = 0
+    known = 0
+    
+    list_key = FEATURE_LISTS.get(category)
+    if list_key and metadata.get(list_key) is not None:
+        names = {str(name).strip().lower() for name in metadata[list_key]}
+        names = {SYNONYMS.get(name, name) for name in names}
+        for feature in CATEGORY_FEATURES[category]:
+            if feature in names and not feature.endswith("-star"):
+                has |= FEATURE_BITS[(category, feature)]
+        known |= _category_mask(category) & ~_star_mask(5)
+    
+    if category == "hotels" and metadata.get("star_rating") is not None:
+        has |= _star_mask(float(metadata["star_rating"]))
+        known |= _star_mask(5)
+    
+    if category == "flights" and metadata.get("stops") is not None:
+        if metadata["stops"] == 0:
+            has |= FEATURE_BITS[("flights", "nonstop")]
+        known |= FEATURE_BITS[("flights", "nonstop")]
+    
+    return has, known
+
+
+def parse_must_have(text: str) -> Dict[str, Any]:
+    """Turn a free-text must-have into a bitmask constraint.
+    
+    Args:
+        text: Must-have string, e.g. "4-star hotel" or "vegan options"
+        
+    Returns:
+        Dict with "constraint" (the text), "category" and "mask"; mask is 0
+        for a must-have that only asks for a category (e.g. "meeting room"),
+        and category is also None when nothing known is mentioned
+    """
+    lowered = text.lower()
+    for alias, name in SYNONYMS.items():
+        lowered = re.sub(rf"\b{re.escape(alias)}\b", name, lowered)
+    
+    hinted = [
+        category for category, hints in CATEGORY_HINTS.items()
+        if any(hint in lowered for hint in hints)
+    ]
+    # Hinted categories first, then the rest in vocabulary order
+    candidates = hinted + [category for category in CATEGORY_FEATURES if category not in hinted]
+    
+    stars = STAR_PATTERN.search(lowered)
+    if stars and 1 <= float(stars.group(1)) <= 5:
+        # Between two half-star levels, require the higher one
+        level = math.ceil(float(stars.group(1)) * 2) / 2
+        return {"constraint": text, "category": "hotels", "mask": _star_mask(level)}
+    
+    for category in candidates:
+        mask = 0
+        for feature in CATEGORY_FEATURES[category]:
+            # Star ratings only count when STAR_PATTERN finds a valid one
+            if not feature.endswith("-star") and re.search(rf"\b{re.escape(feature)}\b", lowered):
+                mask |= FEATURE_BITS[(category, feature)]
+        if mask:
+            return {"constraint": text, "category": category, "mask": mask}
+    
+    for category, pattern in CATEGORY_REQUIREMENTS.items():
+        if pattern.search(lowered):
+            return {"constraint": text, "category": category, "mask": 0}
+    
+    return {"constraint": text, "category": None, "mask": 0}
+
+
+def satisfies(has: int, known: int, mask: int) -> bool:
+    """Whether an item meets a constraint mask.
+    
+    Features the item's metadata says nothing about are not held against it,
+    so sparse listings are kept rather than silently dropped.
+    """
+    return has & mask == mask & known
@@ -0,0 +1,146 @@
+"""Bounded thread pool for blocking LLM calls."""
+
+from typing import Dict, Any, Callable, Optional, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+from src.config import settings
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Run blocking callables on a dedicated, size-capped thread pool.
+    
+    At most max_workers calls run at once and the rest wait in the pool's
+    queue, so awaiting a call never blocks the event loop. A call that runs
+    past its timeout is abandoned: if it has not started it is cancelled,
+    otherwise its thread finishes in the background (threads cannot be
+    interrupted) and the result is discarded.
+    """
+    
+    def __init__(self, max_workers: int, name: str = "blocking"):
+        """Create the pool.
+        
+        Args:
+            max_workers: Maximum number of calls running at once
+            name: Thread name prefix
+        """
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._wait_seconds = 0.0  # Total time started calls spent queued
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "max_queue_depth": 0,
+        }
+    
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """Run fn(*args) on the pool and await its result.
+        
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            timeout: Seconds to wait (queueing included); None waits forever
+            
+        Returns:
+            fn's return value
+            
+        Raises:
+            asyncio.TimeoutError: If the call did not finish within timeout
+        """
+        submitted_at = time.monotonic()
+        
+        def call() -> T:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._started += 1
+                self._wait_seconds += time.monotonic() - submitted_at
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+        
+        with self._lock:
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queued)
+        
+        future = self._pool.submit(call)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(future)
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise
+        except asyncio.CancelledError:
+            self._abandon(future)
+            raise
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        
+        with self._lock:
+            self._stats["completed"] += 1
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get concurrency, queue-depth and outcome counters.
+        
+        Returns:
+            Dict with counters, calls currently "running" and "queued", and
+            the average time started calls spent queued
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "max_workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "avg_queue_wait_ms": (
+                    round(self._wait_seconds / self._started * 1000, 1) if self._started else 0.0
+                ),
+            }
+    
+    def shutdown(self) -> None:
+        """Stop accepting calls and cancel queued ones (running calls finish)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _abandon(self, future: Future) -> None:
+        """Give up on a call, cancelling it if it is still queued."""
+        if future.cancel():
+            # Never started, so call() will not take it off the queue
+            with self._lock:
+                self._queued -= 1
+
+
+# Process-wide pool for LLM calls (created on first use)
+_llm_executor: Optional[BoundedExecutor] = None
+
+
+def get_llm_executor() -> BoundedExecutor:
+    """Get the shared LLM call pool, creating it if needed."""
+    global _llm_executor
+    if _llm_executor is None:
+        _llm_executor = BoundedExecutor(settings.llm_max_concurrency, name="llm")
+    return _llm_executor
+
+
+def shutdown_llm_executor() -> None:
+    """Shut down the shared LLM call pool, if it was created."""
+    global _llm_executor
+    if _llm_executor is not None:
+        _llm_executor.shutdown()
+        _llm_executor = None
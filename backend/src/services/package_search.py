@@ -0,0 +1,173 @@
+"""Best-first search and Pareto frontiers over per-category item lists."""
+
+from typing import Iterator, List, Sequence, Tuple
+import heapq
+
+
+def iter_top_combinations(
+    columns: Sequence[Sequence[float]]
+) -> Iterator[Tuple[float, Tuple[int, ...]]]:
+    """Yield index combinations in descending order of their summed value.
+    
+    Package scores are a weighted sum of per-category item scores, so with
+    each category's contributions sorted descending the best package is
+    (0, 0, ..., 0) and every other package is reachable by stepping one
+    category index at a time. A max-heap over that frontier yields packages
+    best-first without materializing the Cartesian product: pulling K
+    packages costs O(K * C * log(K * C)) for C categories.
+    
+    Ties are broken by the index tuple, i.e. by the order of the input lists.
+    
+    Args:
+        columns: Per-category contributions, each sorted in descending order
+        
+    Yields:
+        Tuples of (summed value, index per category)
+    """
+    if not columns or any(len(column) == 0 for column in columns):
+        return
+    
+    start = (0,) * len(columns)
+    heap = [(-sum(column[0] for column in columns), start)]
+    seen = {start}
+    
+    while heap:
+        neg_total, combo = heapq.heappop(heap)
+        yield -neg_total, combo
+        
+        for dim, idx in enumerate(combo):
+            if idx + 1 >= len(columns[dim]):
+                continue
+            successor = combo[:dim] + (idx + 1,) + combo[dim + 1:]
+            if successor in seen:
+                continue
+            seen.add(successor)
+            total = sum(columns[d][i] for d, i in enumerate(successor))
+            heapq.heappush(heap, (-total, successor))
+
+
+def iter_top_combinations_within(
+    columns: Sequence[Sequence[float]],
+    costs: Sequence[Sequence[float]],
+    limit: float
+) -> Iterator[Tuple[float, Tuple[int, ...]]]:
+    """Yield combinations whose summed cost is within limit, best-first.
+    
+    Branch and bound over categories in order: a node fixes the items of the
+    first categories and is bounded by its score plus the best remaining
+    contribution of every later category. Items that cannot be completed
+    within the limit, even with the cheapest item of every later category,
+    are pruned before they enter the heap, so infeasible packages are never
+    generated. Siblings are pushed lazily, so each pop adds at most two
+    nodes.
+    
+    Args:
+        columns: Per-category contributions, each sorted in descending order
+        costs: Per-category item costs, aligned with columns
+        limit: Maximum summed cost of a combination
+        
+    Yields:
+        Tuples of (summed value, index per category)
+    """
+    if not columns or any(len(column) == 0 for column in columns):
+        return
+    
+    dims = len(columns)
+    
+    # Best score and cheapest cost still obtainable from category d onwards
+    best_rest = [0.0] * (dims + 1)
+    cheapest_rest = [0.0] * (dims + 1)
+    for d in reversed(range(dims)):
+        best_rest[d] = best_rest[d + 1] + columns[d][0]
+        cheapest_rest[d] = cheapest_rest[d + 1] + min(costs[d])
+    
+    if cheapest_rest[0] > limit:
+        return
+    
+    heap = []
+    
+    def push(prefix: Tuple[int, ...], prefix_score: float, prefix_cost: float, start: int) -> None:
+        """Push the first item >= start of the next category that can stay within limit."""
+        dim = len(prefix)
+        allowance = limit - prefix_cost - cheapest_rest[dim + 1]
+        idx = next(
+            (i for i in range(start, len(columns[dim])) if costs[dim][i] <= allowance),
+            None
+        )
+        if idx is None:
+            return
+        
+        combo = prefix + (idx,)
+        if dim == dims - 1:
+            # Complete: summed in category order, exactly like iter_top_combinations
+            bound = sum(columns[d][i] for d, i in enumerate(combo))
+        else:
+            bound = prefix_score + columns[dim][idx] + best_rest[dim + 1]
+        heapq.heappush(heap, (-bound, combo, prefix_score, prefix_cost))
+    
+    push((), 0.0, 0.0, 0)
+    
+    while heap:
+        neg_bound, combo, prefix_score, prefix_cost = heapq.heappop(heap)
+        dim, idx = len(combo) - 1, combo[-1]
+        
+        # Next-best choice for this category under the same prefix
+        push(combo[:-1], prefix_score, prefix_cost, idx + 1)
+        
+        if dim == dims - 1:
+            yield -neg_bound, combo
+        else:
+            push(combo, prefix_score + columns[dim][idx], prefix_cost + costs[dim][idx], 0)
+
+
+def skyline(
+    points: Sequence[Tuple[float, float, Tuple[int, ...]]]
+) -> List[Tuple[float, float, Tuple[int, ...]]]:
+    """Keep the points not dominated on (lower cost, higher value).
+    
+    Args:
+        points: Tuples of (cost, value, index tuple)
+        
+    Returns:
+        Non-dominated points in ascending cost (and value) order; of points
+        with equal cost and value only the first by index tuple is kept
+    """
+    frontier = []
+    for cost, value, combo in sorted(points, key=lambda p: (p[0], -p[1], p[2])):
+        if not frontier or value > frontier[-1][1]:
+            frontier.append((cost, value, combo))
+    return frontier
+
+
+def pareto_frontier(
+    columns: Sequence[Sequence[float]],
+    costs: Sequence[Sequence[float]]
+) -> List[Tuple[float, float, Tuple[int, ...]]]:
+    """Pareto-optimal combinations on (summed cost, summed value).
+    
+    Both objectives are sums over categories, so a combination using an
+    item that is dominated within its own category is itself dominated.
+    The frontier is therefore the skyline of the Minkowski sum of the
+    per-category skylines, built one category at a time and pruned back to
+    a skyline after each merge instead of enumerating every combination.
+    
+    Args:
+        columns: Per-category contributions
+        costs: Per-category item costs, aligned with columns
+        
+    Returns:
+        Tuples of (cost, value, index per category) in ascending cost order
+    """
+    if not columns or any(len(column) == 0 for column in columns):
+        return []
+    
+    frontier = [(0.0, 0.0, ())]
+    for column, column_costs in zip(columns, costs):
+        options = skyline([(cost, value, (i,)) for i, (value, cost) in enumerate(zip(column, column_costs))])
+        frontier = skyline([
+            (cost + option_cost, value + option_value, combo + option)
+            for cost, value, combo in frontier
+            for option_cost, option_value, option in options
+        ])
+    
+    return frontier
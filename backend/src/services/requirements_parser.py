@@ -0,0 +1,320 @@
+"""Deterministic rule-based requirements parser with per-field confidence.
+
+Handles the common, well-formed requests ("2-day retreat in Miami for 50
+people, $60k budget") without an LLM call. Every required field gets a
+confidence; anything ambiguous (two different numbers for the same field,
+ranges, dates, preferences the rules cannot capture) lowers it so the
+caller can hand the request to the LLM instead.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import re
+
+from src.services.features import CATEGORY_FEATURES, STAR_PATTERN, SYNONYMS
+
+
+REQUIRED_FIELDS = ("attendees", "budget", "duration", "location")
+
+# Confidence when a field is matched more than one way with different values
+AMBIGUOUS = 0.3
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+ATTENDEE_NOUNS = (
+    r"(?:people|persons|attendees|participants|guests|employees|managers|engineers|"
+    r"staff|members|colleagues|executives|leaders|reps|developers|teammates)"
+)
+
+MULTIPLIERS = {"k": 1_000, "thousand": 1_000, "m": 1_000_000, "million": 1_000_000}
+
+MONTHS = (
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+)
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Capitalized words that are never a place
+NOT_PLACES = {
+    *(month.title() for month in MONTHS),
+    *(day.title() for day in WEEKDAYS),
+    "The", "Our", "We", "Need", "Budget", "Plan", "Planning", "Q1", "Q2", "Q3", "Q4",
+}
+
+# Phrases carrying details the rules would drop; each sends the request to the LLM
+LLM_CUES = {
+    "date": (
+        rf"\b(?:{'|'.join(MONTHS)}|{'|'.join(WEEKDAYS)})\b|\b\d{{1,2}}/\d{{1,2}}\b|\b\d{{4}}-\d{{2}}-\d{{2}}\b"
+        r"|\bnext (?:week|month|quarter|year)\b|\bq[1-4]\b|\bdeadline\b"
+        r"|\b(?:spring|summer|fall|autumn|winter)\b|\b(?:in|within) \d+ (?:days|weeks|months)\b"
+    ),
+    "preference": r"\b(?:prefer\w*|ideally|nice to have|would like|if possible|optional\w*|rather than|instead)\b",
+    "alternative": r"\b(?:or|either|maybe|possibly)\b",
+    "negation": r"\b(?:no|not|without|avoid|except)\b",
+    "special needs": r"\b(?:accessib\w*|wheelchair|allerg\w*|kids|children|pets?)\b",
+    "per person": r"\bper (?:person|head|attendee|day|night)\b|\beach\b",
+}
+
+# Abbreviations that start a place name ("St. Louis") and initialisms that
+# end one ("Washington D.C."); any other period ends the sentence, and the name
+PLACE_PREFIX = r"(?:(?:St|Ste|Ft|Mt)\.\s+)?"
+INITIALISM = r"(?:[A-Z]\.){2,}"
+PLACE_WORD = PLACE_PREFIX + r"[A-Z][\w'-]*(?!\.[A-Za-z])"
+
+LOCATION_WORDS = (
+    PLACE_WORD + r"(?:\s+" + PLACE_WORD + r")*"
+    r"(?:,?\s+" + INITIALISM + r"|,\s*[A-Z]{2}\b)?"
+)
+
+# Splits text into segments at commas, semicolons and sentence-ending periods
+SEGMENT_BREAK = r"[,;]|(?<!\bSt)(?<!\bSte)(?<!\bFt)(?<!\bMt)(?<![A-Z]\.[A-Z])\.(?=\s|$)"
+
+
+def _to_number(text: str, unit: Optional[str] = None) -> float:
+    """Parse "60,000" / "60" + "k" into a number."""
+    value = float(text.replace(",", ""))
+    if unit:
+        value *= MULTIPLIERS[unit.lower()]
+    return value
+
+
+def _pick(candidates: List[Tuple[Any, float]]) -> Tuple[Any, float]:
+    """Choose a field value from (value, confidence) candidates.
+    
+    Returns:
+        The best candidate; confidence drops to AMBIGUOUS when candidates
+        disagree, and (None, 0.0) when there are none
+    """
+    if not candidates:
+        return None, 0.0
+    if len({value for value, _ in candidates}) > 1:
+        return max(candidates, key=lambda c: c[1])[0], AMBIGUOUS
+    return candidates[0][0], max(confidence for _, confidence in candidates)
+
+
+def _attendees(text: str) -> Tuple[Optional[int], float]:
+    """Extract the head count."""
+    if re.search(rf"\d+\s*(?:-|–|to)\s*\d+\s+(?:\w+\s+)?{ATTENDEE_NOUNS}\b", text, re.IGNORECASE):
+        return None, AMBIGUOUS
+    
+    candidates = [
+        (int(_to_number(number)), 1.0)
+        for number in re.findall(rf"\b(\d[\d,]*)\s+(?:\w+\s+)?{ATTENDEE_NOUNS}\b", text, re.IGNORECASE)
+    ]
+    candidates += [
+        (int(_to_number(number)), 0.95)
+        for number in re.findall(
+            r"\b(?:team|group|party|company) of (\d[\d,]*)\b|\b(\d[\d,]*)[- ]person\b",
+            text,
+            re.IGNORECASE
+        )
+        for number in number if number
+    ]
+    return _pick(candidates)
+
+
+def _budget(text: str) -> Tuple[Optional[float], float]:
+    """Extract the total budget in USD."""
+    unit = r"(k|m|thousand|million)?\b"
+    amount = r"(\d[\d,]*(?:\.\d+)?)\s*"
+    candidates = [
+        (_to_number(number, suffix or None), 1.0)
+        for number, suffix in re.findall(r"\$\s*" + amount + unit, text, re.IGNORECASE)
+    ]
+    candidates += [
+        (_to_number(number, suffix or None), 1.0)
+        for number, suffix in re.findall(
+            r"\bbudget\s*(?:of|is|:)?\s*(?:around|about|approximately|up to)?\s*" + amount + unit,
+            text,
+            re.IGNORECASE
+        )
+    ]
+    candidates += [
+        (_to_number(number, suffix), 0.95)
+        for number, suffix in re.findall(
+            r"(?<![\$\d,.])" + amount + r"(k|thousand|million)\b\s*(?:dollars|usd|budget)?",
+            text,
+            re.IGNORECASE
+        )
+    ]
+    candidates += [
+        (_to_number(number), 0.95)
+        for number in re.findall(r"(?<![\$\d,.])(\d[\d,]*)\s*(?:dollars|usd)\b", text, re.IGNORECASE)
+    ]
+    
+    value, confidence = _pick(candidates)
+    if value is not None and value < 100:
+        # "$50" is almost certainly a per-person or per-item figure
+        confidence = min(confidence, 0.5)
+    return value, confidence
+
+
+def _duration(text: str) -> Tuple[Optional[str], float]:
+    """Extract the duration as "N days" or "N nights"."""
+    number = r"(\d+|" + "|".join(NUMBER_WORDS) + r")"
+    candidates = []
+    for match in re.finditer(number + r"\s*-?\s*(day|night|week)s?\b", text, re.IGNORECASE):
+        preceding = text[:match.start()].rstrip().lower()
+        if preceding.endswith(("in", "within", "next")):
+            continue  # "in 30 days" is a date, not a duration
+        raw, unit = match.group(1).lower(), match.group(2).lower()
+        count = int(raw) if raw.isdigit() else NUMBER_WORDS[raw]
+        if unit == "week":
+            count, unit = count * 7, "day"
+        candidates.append((f"{count} {unit}" + ("" if count == 1 else "s"), 1.0))
+    
+    if re.search(r"\bweekend\b", text, re.IGNORECASE):
+        candidates.append(("2 days", 0.9))
+    
+    return _pick(candidates)
+
+
+def _location(text: str) -> Tuple[Optional[str], float]:
+    """Extract the destination.
+    
+    Trigger words match in any case ("Offsite in ..."), but the place
+    itself must be capitalized.
+    """
+    patterns = [
+        (
+            r"\b(?i:(?:retreat|trip|offsite|off-site|event|conference|meeting|getaway|summit)\s+"
+            r"(?:in|at|to))\s+(" + LOCATION_WORDS + ")",
+            1.0
+        ),
+        (r"\b(?i:destination\s*(?:is|:)?)\s*(" + LOCATION_WORDS + ")", 1.0),
+        (r"\b(?i:in|at|to)\s+(" + LOCATION_WORDS + ")", 0.9),
+    ]
+    
+    candidates = []
+    for pattern, confidence in patterns:
+        for match in re.finditer(pattern, text):
+            place = match.group(1).strip()
+            if place.split()[0] not in NOT_PLACES:
+                candidates.append((place, confidence))
+    
+    # A bare "..., Las Vegas, ..." segment
+    for segment in re.split(SEGMENT_BREAK, text):
+        segment = segment.strip()
+        if re.fullmatch(r"[A-Z]{2}", segment):
+            continue  # The state of a "City, ST" already matched above
+        if re.fullmatch(LOCATION_WORDS, segment) and segment.split()[0] not in NOT_PLACES:
+            candidates.append((segment, 0.9))
+    
+    return _pick(candidates)
+
+
+def _origin(text: str) -> Tuple[Optional[str], float]:
+    """Extract the departure city.
+    
+    Unlike the destination the origin is optional, so a request that names
+    none is fully confident; naming several different ones is ambiguous.
+    """
+    candidates = [
+        (match.strip(), 1.0)
+        for match in re.findall(r"\b(?i:from|departing|out of)\s+(" + LOCATION_WORDS + ")", text)
+        if match.split()[0] not in NOT_PLACES
+    ]
+    return _pick(candidates) if candidates else (None, 1.0)
+
+
+def _must_haves(text: str) -> Tuple[List[str], bool]:
+    """Extract must-haves phrased the way the ranking agent parses them.
+    
+    Returns:
+        Tuple of (must-haves, whether a feature could belong to several
+        categories, e.g. "wifi")
+    """
+    lowered = text.lower()
+    for alias, name in SYNONYMS.items():
+        lowered = re.sub(rf"\b{re.escape(alias)}\b", name, lowered)
+    
+    must_haves = []
+    stars = STAR_PATTERN.search(lowered)
+    if stars:
+        must_haves.append(f"{stars.group(1)}-star hotel")
+    elif re.search(r"\bhotels?\b", lowered):
+        must_haves.append("hotel")
+    
+    shared = False
+    for category, names in CATEGORY_FEATURES.items():
+        for feature in names:
+            if feature.endswith("-star") or not re.search(rf"\b{re.escape(feature)}\b", lowered):
+                continue
+            if sum(feature in other for other in CATEGORY_FEATURES.values()) > 1:
+                shared = True
+            elif category == "flights":
+                must_haves.append(f"{feature} flights")
+            else:
+                must_haves.append(feature)
+    
+    if re.search(r"\bflights?\b", lowered) and not any(m.endswith("flights") for m in must_haves):
+        must_haves.append("flights")
+    if re.search(r"\b(?:meeting|conference) rooms?\b|\bvenue\b", lowered):
+        must_haves.append("meeting room")
+    if re.search(r"\bcatering\b|\bmeals?\b|\bfood\b", lowered):
+        must_haves.append("catering")
+    
+    return must_haves, shared
+
+
+def parse_requirements(text: str) -> Dict[str, Any]:
+    """Parse a retreat request with rules and score how sure each field is.
+    
+    Args:
+        text: Natural language retreat request
+        
+    Returns:
+        Dict with "requirements" (same shape as the LLM path produces;
+        fields not found are None), "confidence" (0-1 per required field
+        and for the optional origin),
+        "overall" (the lowest field confidence, halved if the request has
+        details the rules cannot capture) and "reasons" (why confidence
+        was lowered)
+    """
+    attendees, attendees_conf = _attendees(text)
+    budget, budget_conf = _budget(text)
+    duration, duration_conf = _duration(text)
+    location, location_conf = _location(text)
+    origin, origin_conf = _origin(text)
+    must_haves, shared_feature = _must_haves(text)
+    
+    confidence = {
+        "attendees": attendees_conf,
+        "budget": budget_conf,
+        "duration": duration_conf,
+        "location": location_conf,
+        "origin": origin_conf,
+    }
+    reasons = [
+        f"{field} {'missing' if score == 0 else 'ambiguous' if score <= AMBIGUOUS else 'uncertain'}"
+        for field, score in confidence.items()
+        if score < 1.0
+    ]
+    
+    cues = [name for name, pattern in LLM_CUES.items() if re.search(pattern, text, re.IGNORECASE)]
+    if shared_feature:
+        cues.append("feature shared by several categories")
+    reasons += [f"mentions {cue}" for cue in cues]
+    
+    overall = min(confidence.values())
+    if cues:
+        overall *= 0.5
+    
+    return {
+        "requirements": {
+            "attendees": attendees,
+            "budget": int(budget) if budget is not None and budget.is_integer() else budget,
+            "duration": duration,
+            "location": location,
+            "origin": origin,
+            "deadline": None,
+            "must_haves": must_haves,
+            "nice_to_haves": [],
+            "preferences": {},
+        },
+        "confidence": confidence,
+        "overall": round(overall, 3),
+        "reasons": reasons,
+    }
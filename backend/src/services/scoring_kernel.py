@@ -0,0 +1,375 @@
+"""Vectorized NumPy scoring kernel for items and packages.
+
+Items are turned into column arrays once; component scores, weighted
+category scores and package scores are then computed in batch. The formulas
+match RankingAgent's per-item scoring exactly (including Python rounding).
+"""
+
+from typing import Dict, Any, List, Sequence, Tuple
+
+import numpy as np
+
+
+# Scoring components per category: (component name, weight key, default weight)
+CATEGORY_COMPONENTS: Dict[str, List[Tuple[str, str, int]]] = {
+    "flights": [
+        ("price", "price_weight", 50),
+        ("timing", "timing_weight", 25),
+        ("trust", "trust_weight", 15),
+        ("comfort", "comfort_weight", 10),
+    ],
+    "hotels": [
+        ("price", "price_weight", 20),
+        ("trust", "trust_weight", 40),
+        ("location", "location_weight", 25),
+        ("amenities", "amenities_weight", 15),
+    ],
+    "meeting_rooms": [
+        ("price", "price_weight", 25),
+        ("capacity", "capacity_weight", 35),
+        ("equipment", "equipment_weight", 25),
+        ("trust", "trust_weight", 15),
+    ],
+    "catering": [
+        ("price", "price_weight", 30),
+        ("trust", "trust_weight", 30),
+        ("dietary", "dietary_weight", 25),
+        ("service", "service_weight", 15),
+    ],
+}
+
+# Fallback for unknown categories (weights are fixed, not configurable)
+DEFAULT_COMPONENTS: List[Tuple[str, str, int]] = [
+    ("price", "", 50),
+    ("trust", "", 50),
+]
+
+# Component scores that are constant until better data is available
+CONSTANT_SCORES = {
+    "timing": 75,
+    "comfort": 70,
+    "location": 85,
+    "service": 80,
+}
+
+
+def components_for(category: str) -> List[Tuple[str, str, int]]:
+    """Get the (name, weight key, default weight) components of a category."""
+    return CATEGORY_COMPONENTS.get(category, DEFAULT_COMPONENTS)
+
+
+def item_columns(items: Sequence[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Extract the scoring inputs of items into column arrays.
+    
+    Args:
+        items: Discovered item dictionaries
+        
+    Returns:
+        Dict of float arrays: price, rating, capacity, amenity_count,
+        equipment_count and dietary_count
+    """
+    n = len(items)
+    price = np.empty(n)
+    rating = np.empty(n)
+    capacity = np.empty(n)
+    amenity_count = np.empty(n)
+    equipment_count = np.empty(n)
+    dietary_count = np.empty(n)
+    
+    for i, item in enumerate(items):
+        metadata = item.get("metadata") or {}
+        trust = item.get("trust_score", {})
+        
+        price[i] = item.get("price", 0)
+        # A missing rating counts as 3 stars; a non-dict trust score as 60/100
+        rating[i] = trust.get("rating", 3) if isinstance(trust, dict) else 3
+        capacity[i] = metadata.get("capacity", 50)
+        amenity_count[i] = len(metadata.get("amenities") or [])
+        equipment_count[i] = len(metadata.get("equipment") or [])
+        dietary_count[i] = len(metadata.get("dietary_options") or [])
+    
+    return {
+        "price": price,
+        "rating": rating,
+        "capacity": capacity,
+        "amenity_count": amenity_count,
+        "equipment_count": equipment_count,
+        "dietary_count": dietary_count,
+    }
+
+
+def price_scores(price: np.ndarray, budget: float) -> np.ndarray:
+    """Price score per item (lower share of budget = higher score).
+    
+    Args:
+        price: Item prices
+        budget: Total budget
+        
+    Returns:
+        Scores from 0-100
+    """
+    if budget <= 0:
+        return np.full(price.shape, 50.0)
+    
+    # Price as fraction of total budget
+    ratio = price / budget
+    return np.where(
+        ratio > 0.5,  # More than 50% of budget for single category
+        np.maximum(0, 100 - ratio * 150),
+        np.where(ratio > 0.3, 100 - ratio * 100, 100 - ratio * 50),
+    )
+
+
+def component_matrix(
+    category: str,
+    columns: Dict[str, np.ndarray],
+    requirements: Dict[str, Any]
+) -> np.ndarray:
+    """Compute every component score for every item of one category.
+    
+    Component scores do not depend on weights, so the matrix can be reused
+    across weight changes.
+    
+    Args:
+        category: Item category
+        columns: Column arrays from item_columns
+        requirements: User requirements
+        
+    Returns:
+        Array of shape (items, components) in components_for(category) order
+    """
+    n = len(columns["price"])
+    required_capacity = requirements.get("attendees", 50)
+    
+    computed = {
+        "price": lambda: price_scores(columns["price"], requirements.get("budget", 100000)),
+        "trust": lambda: columns["rating"] * 20,  # Convert 5-star to 100
+        "amenities": lambda: np.minimum(100, columns["amenity_count"] * 12),
+        "capacity": lambda: np.where(
+            columns["capacity"] >= required_capacity,
+            100.0,
+            (columns["capacity"] / required_capacity) * 100,
+        ),
+        "equipment": lambda: np.minimum(100, columns["equipment_count"] * 25),
+        "dietary": lambda: np.minimum(100, columns["dietary_count"] * 20),
+    }
+    
+    matrix = np.empty((n, len(components_for(category))))
+    for j, (name, _, _) in enumerate(components_for(category)):
+        if name in CONSTANT_SCORES:
+            matrix[:, j] = CONSTANT_SCORES[name]
+        else:
+            matrix[:, j] = computed[name]()
+    
+    return matrix
+
+
+def weight_vector(category: str, weights: Dict[str, Any]) -> np.ndarray:
+    """Resolve a category's component weights into a vector.
+    
+    Args:
+        category: Item category
+        weights: Component weights keyed like "price_weight"
+        
+    Returns:
+        Weight per component in components_for(category) order
+    """
+    if category not in CATEGORY_COMPONENTS:
+        return np.array([default for _, _, default in DEFAULT_COMPONENTS], dtype=float)
+    
+    return np.array(
+        [weights.get(key, default) for _, key, default in components_for(category)],
+        dtype=float
+    )
+
+
+def weighted_scores(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Weighted average of component scores per item, rounded like round(x, 2).
+    
+    Accumulates component by component (not via a dot product) so the
+    floating-point result is bit-identical to the per-item Python formula.
+    
+    Args:
+        matrix: Component matrix of shape (items, components)
+        weights: Weight vector, or matrix of shape (components, presets)
+        
+    Returns:
+        Scores of shape (items,) or (items, presets)
+    """
+    weights = np.asarray(weights, dtype=float)
+    total = np.zeros(matrix.shape[:1] + weights.shape[1:])
+    total_weight = np.zeros(weights.shape[1:])
+    for j in range(matrix.shape[1]):
+        if weights.ndim == 1:
+            total = total + matrix[:, j] * weights[j]
+        else:
+            total = total + matrix[:, j:j + 1] * weights[j]
+        total_weight = total_weight + weights[j]
+    
+    # All-zero weights leave the (zero) total undivided
+    scores = total / np.where(total_weight > 0, total_weight, 1)
+    
+    return round_scores(scores, 2)
+
+
+def share_weighted_scores(matrix: np.ndarray, shares: Sequence[float]) -> np.ndarray:
+    """Sum of component scores times pre-normalized shares, rounded like round(x, 2).
+    
+    Unlike weighted_scores, the weights are divided before multiplying, as
+    in sum(score * share); the result is bit-identical to that formula.
+    
+    Args:
+        matrix: Component matrix of shape (items, components)
+        shares: Weight per component, already divided by the total
+        
+    Returns:
+        Scores of shape (items,)
+    """
+    total = np.zeros(matrix.shape[:1])
+    for j, share in enumerate(shares):
+        total = total + matrix[:, j] * share
+    return round_scores(total, 2)
+
+
+def round_scores(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round like Python's round() (np.round can differ at .5 boundaries)."""
+    flat = [round(v, digits) for v in values.ravel().tolist()]
+    return np.array(flat, dtype=float).reshape(values.shape)
+
+
+def category_scores(
+    items: Sequence[Dict[str, Any]],
+    category: str,
+    requirements: Dict[str, Any],
+    weights: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score all items of one category in batch.
+    
+    Args:
+        items: Items of the category
+        category: Item category
+        requirements: User requirements
+        weights: Component weights keyed like "price_weight"
+        
+    Returns:
+        Tuple of (scores of shape (items,), component matrix)
+    """
+    matrix = component_matrix(category, item_columns(items), requirements)
+    return weighted_scores(matrix, weight_vector(category, weights)), matrix
+
+
+def breakdown(category: str, row: np.ndarray, weights: np.ndarray) -> Dict[str, Dict[str, Any]]:
+    """Build the per-component breakdown for one item.
+    
+    Args:
+        category: Item category
+        row: The item's row of the component matrix
+        weights: Weight vector for the category
+        
+    Returns:
+        Dict mapping component name to its rounded score and weight
+    """
+    result = {}
+    for (name, _, _), score, weight in zip(components_for(category), row.tolist(), weights.tolist()):
+        result[name] = {"score": round(score, 1), "weight": int(weight) if weight.is_integer() else weight}
+    return result
+
+
+def package_scores(
+    scores_by_category: Sequence[np.ndarray],
+    importance: Sequence[float]
+) -> np.ndarray:
+    """Score every package as a broadcast sum across category axes.
+    
+    Args:
+        scores_by_category: Category score arrays, one per category
+        importance: Normalized importance per category (fractions)
+        
+    Returns:
+        Array with one axis per category; entry [i, j, ...] is the score of
+        the package made of item i of the first category, j of the second, ...
+    """
+    total = np.zeros(())
+    for axis, (scores, share) in enumerate(zip(scores_by_category, importance)):
+        shape = [1] * len(scores_by_category)
+        shape[axis] = len(scores)
+        total = total + (np.asarray(scores, dtype=float) * share).reshape(shape)
+    return total
+
+
+def importance_shares(importance: Dict[str, Any], categories: Sequence[str]) -> List[float]:
+    """Normalize category importance weights into per-category shares.
+    
+    Categories without an importance weight count 25 towards their own share
+    (but not towards the total); if the weights sum to zero they are read as
+    percentages.
+    
+    Args:
+        importance: Category importance weights (need not sum to 100)
+        categories: Categories present in the package, in scoring order
+        
+    Returns:
+        Share per category, aligned with categories
+    """
+    total_importance = sum(importance.get(cat, 0) for cat in categories)
+    if total_importance == 0:
+        total_importance = 100
+    return [importance.get(cat, 25) / total_importance for cat in categories]
+
+
+def allocation_price_scores(price: np.ndarray, expected_price: float) -> np.ndarray:
+    """Price score per item against the budget expected for its category.
+    
+    Args:
+        price: Item prices
+        expected_price: Budget allocated to the category
+        
+    Returns:
+        Scores from 0-100 (50 for an unknown, non-positive price)
+    """
+    price = np.asarray(price, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.select(
+            [
+                price <= 0,
+                price <= expected_price * 0.5,
+                price <= expected_price,
+                price <= expected_price * 1.5,
+            ],
+            [
+                np.full(price.shape, 50.0),  # Neutral score for unknown price
+                np.full(price.shape, 100.0),  # Great value
+                100 - ((price / expected_price) * 30),  # Good value
+                70 - ((price - expected_price) / expected_price * 40),  # Acceptable
+            ],
+            np.maximum(0, 30 - ((price - expected_price * 1.5) / expected_price * 30)),  # Poor value
+        )
+
+
+def rating_scores(rating: np.ndarray, max_rating: float = 5.0) -> np.ndarray:
+    """Rating per item as a 0-100 score (50 for an unknown rating)."""
+    rating = np.asarray(rating, dtype=float)
+    return np.where(rating <= 0, 50.0, np.minimum(100, rating / max_rating * 100))
+
+
+def capacity_fit_scores(capacity: np.ndarray, required: float) -> np.ndarray:
+    """Capacity per item scored against the required capacity.
+    
+    Insufficient capacity is penalized strongly; excess capacity slightly
+    (as waste), in steps at 1.2x and 1.5x the requirement.
+    
+    Args:
+        capacity: Available capacity per item
+        required: Required capacity
+        
+    Returns:
+        Scores from 0-100
+    """
+    capacity = np.asarray(capacity, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = capacity / required
+    return np.select(
+        [capacity < required, ratio <= 1.2, ratio <= 1.5],
+        [ratio * 70, np.full(ratio.shape, 100.0), np.full(ratio.shape, 90.0)],
+        80.0,
+    )
@@ -2,9 +2,58 @@
 
 from typing import Dict, Any, List, Optional
 
+import numpy as np
+
+from src.services import scoring_kernel
+
 
 class ScoringService:
-    """Service for scoring and ranking utilities."""
+    """Service for scoring and ranking utilities.
+    
+    Single-value helpers are thin wrappers over the batch formulas in
+    scoring_kernel, so there is one implementation of each.
+    """
+    
+    @staticmethod
+    def score_items(
+        items: List[Dict[str, Any]],
+        category: str,
+        requirements: Dict[str, Any],
+        weights: Optional[Dict[str, Any]] = None
+    ) -> List[float]:
+        """Score items of one category in batch (same formulas as RankingAgent).
+        
+        Args:
+            items: Items of the category
+            category: Item category
+            requirements: User requirements
+            weights: Component weights keyed like "price_weight" (defaults apply)
+            
+        Returns:
+            Category score (0-100) per item
+        """
+        scores, _ = scoring_kernel.category_scores(items, category, requirements, weights or {})
+        return scores.tolist()
+    
+    @staticmethod
+    def package_scores(
+        category_scores: Dict[str, List[float]],
+        importance: Dict[str, int]
+    ) -> np.ndarray:
+        """Score every combination of one item per category.
+        
+        Args:
+            category_scores: Item scores per category
+            importance: Category importance weights (normalized like RankingAgent)
+            
+        Returns:
+            Array with one axis per category (in category_scores order)
+        """
+        categories = list(category_scores)
+        return scoring_kernel.package_scores(
+            [np.array(category_scores[cat], dtype=float) for cat in categories],
+            scoring_kernel.importance_shares(importance, categories)
+        )
     
     @staticmethod
     def normalize_weights(weights: Dict[str, int]) -> Dict[str, float]:
@@ -36,13 +85,8 @@ class ScoringService:
             Weighted average score
         """
         normalized = ScoringService.normalize_weights(weights)
-        
-        total = sum(
-            scores.get(key, 0) * weight
-            for key, weight in normalized.items()
-        )
-        
-        return round(total, 2)
+        matrix = np.array([[scores.get(key, 0) for key in normalized]], dtype=float)
+        return float(scoring_kernel.share_weighted_scores(matrix, list(normalized.values()))[0])
     
     @staticmethod
     def price_to_score(price: float, budget: float, category_ratio: float = 0.25) -> float:
@@ -56,19 +100,7 @@ class ScoringService:
         Returns:
             Score from 0-100
         """
-        expected_price = budget * category_ratio
-        
-        if price <= 0:
-            return 50  # Neutral score for unknown price
-        
-        if price <= expected_price * 0.5:
-            return 100  # Great value
-        elif price <= expected_price:
-            return 100 - ((price / expected_price) * 30)  # Good value
-        elif price <= expected_price * 1.5:
-            return 70 - ((price - expected_price) / expected_price * 40)  # Acceptable
-        else:
-            return max(0, 30 - ((price - expected_price * 1.5) / expected_price * 30))  # Poor value
+        return float(scoring_kernel.allocation_price_scores([price], budget * category_ratio)[0])
     
     @staticmethod
     def rating_to_score(rating: float, max_rating: float = 5.0) -> float:
@@ -81,9 +113,7 @@ class ScoringService:
         Returns:
             Score from 0-100
         """
-        if rating <= 0:
-            return 50  # Neutral for unknown
-        return min(100, (rating / max_rating) * 100)
+        return float(scoring_kernel.rating_scores([rating], max_rating)[0])
     
     @staticmethod
     def capacity_to_score(capacity: int, required: int) -> float:
@@ -96,18 +126,7 @@ class ScoringService:
         Returns:
             Score from 0-100
         """
-        if capacity >= required:
-            # Slight penalty for too much excess (waste)
-            excess_ratio = capacity / required
-            if excess_ratio <= 1.2:
-                return 100
-            elif excess_ratio <= 1.5:
-                return 90
-            else:
-                return 80
-        else:
-            # Strong penalty for insufficient capacity
-            return (capacity / required) * 70
+        return float(scoring_kernel.capacity_fit_scores([capacity], required)[0])
     
     @staticmethod
     def generate_score_explanation(
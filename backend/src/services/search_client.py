@@ -0,0 +1,120 @@
+"""Shared async client for the Tavily search API."""
+
+from typing import Dict, Any, Optional
+import os
+
+import httpx
+
+from src.config import settings
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncSearchClient:
+    """Pooled async HTTP client for the Tavily search API.
+    
+    A single instance is shared by every session for the lifetime of the app,
+    so keep-alive connections (and their TLS sessions) are reused instead of
+    being re-established per session.
+    """
+    
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """Create the pooled client.
+        
+        Args:
+            api_key: Tavily API key (defaults to settings / TAVILY_API_KEY)
+            base_url: API base URL, e.g. a local stand-in server for offline tests
+            transport: Optional httpx transport override (e.g. httpx.MockTransport)
+        """
+        self.api_key = api_key or settings.tavily_api_key or os.getenv("TAVILY_API_KEY")
+        if not self.api_key:
+            raise ValueError("TAVILY_API_KEY is required")
+        
+        self.base_url = (base_url or settings.tavily_base_url).rstrip("/")
+        self.http2 = settings.search_http2 and HTTP2_AVAILABLE
+        
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.search_pool_max_connections,
+                max_keepalive_connections=settings.search_pool_max_keepalive,
+                keepalive_expiry=settings.search_pool_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.search_timeout_seconds),
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}",
+            },
+            transport=transport,
+        )
+    
+    @property
+    def is_closed(self) -> bool:
+        """Whether the underlying connection pool has been closed."""
+        return self._client.is_closed
+    
+    async def search(
+        self,
+        query: str,
+        search_depth: str = "advanced",
+        max_results: int = 5,
+        **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Execute a search query over the shared connection pool.
+        
+        Args:
+            query: Search query string
+            search_depth: "basic" or "advanced"
+            max_results: Maximum number of results to return
+            **kwargs: Extra Tavily search parameters
+            
+        Returns:
+            Tavily search results dictionary
+            
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        payload = {
+            "query": query,
+            "search_depth": search_depth,
+            "max_results": max_results,
+            **kwargs,
+        }
+        
+        response = await self._client.post("/search", json=payload)
+        response.raise_for_status()
+        return response.json()
+    
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._client.aclose()
+
+
+# Process-wide client instance (created on first use)
+_search_client: Optional[AsyncSearchClient] = None
+
+
+def get_search_client() -> AsyncSearchClient:
+    """Get the shared search client, creating it if needed."""
+    global _search_client
+    if _search_client is None or _search_client.is_closed:
+        _search_client = AsyncSearchClient()
+    return _search_client
+
+
+async def close_search_client() -> None:
+    """Close the shared search client (called on app shutdown)."""
+    global _search_client
+    if _search_client is not None:
+        await _search_client.aclose()
+        _search_client = None
@@ -0,0 +1,78 @@
+"""Single-flight coalescing of identical concurrent async calls."""
+
+from typing import Dict, Any, Awaitable, Callable, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it."""
+    
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it.
+    
+    The upstream call runs in its own task, so a cancelled caller only stops
+    waiting. The call itself is cancelled only once every caller waiting on
+    it has been cancelled; if it fails after that, the error is logged
+    rather than left unretrieved.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"calls": 0, "coalesced": 0, "unclaimed_errors": 0}
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn for key, or join the identical call already in flight.
+        
+        Args:
+            key: Key identifying identical calls
+            fn: Zero-argument coroutine function performing the upstream call
+            
+        Returns:
+            The shared result of the call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._finished(key, call))
+            self._stats["calls"] += 1
+        else:
+            self._stats["coalesced"] += 1
+        
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                # Last waiter gone: abandon the call so new callers start fresh
+                self._forget(key, call)
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get upstream call and coalesced caller counters."""
+        return {**self._stats, "in_flight": len(self._calls)}
+    
+    def _finished(self, key: str, call: _Call) -> None:
+        """Forget a completed call and retrieve its error, logging it if nobody waits."""
+        self._forget(key, call)
+        if call.task.cancelled():
+            return
+        error = call.task.exception()  # Marks the error as retrieved
+        if error is not None and call.waiters == 0:
+            self._stats["unclaimed_errors"] += 1
+            print(f"Coalesced call '{key}' failed after every caller left: {error}")
+    
+    def _forget(self, key: str, call: _Call) -> None:
+        """Drop a finished or abandoned call, unless a newer one replaced it."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
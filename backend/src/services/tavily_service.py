@@ -1,59 +1,139 @@
 """Tavily search service wrapper."""
 
 from typing import Dict, Any, List, Optional
-import os
-
-try:
-    from tavily import TavilyClient
-except ImportError:
-    TavilyClient = None
+import asyncio
 
 from src.config import settings
+from src.services.cache import TTLCache
+from src.services.search_client import AsyncSearchClient, get_search_client
+from src.services.single_flight import SingleFlight
+
+
+# Process-wide search result cache (created on first use)
+_search_cache: Optional[TTLCache] = None
+
+# Coalesces identical searches in flight at the same time
+search_flights = SingleFlight()
+
+# Process-wide cap on upstream searches, shared by every session
+_search_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_search_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent upstream searches across all sessions."""
+    global _search_semaphore
+    if _search_semaphore is None:
+        _search_semaphore = asyncio.Semaphore(settings.search_max_concurrency)
+    return _search_semaphore
+
+
+def get_search_cache() -> TTLCache:
+    """Get the shared search result cache, creating it if needed."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = TTLCache(
+            max_entries=settings.search_cache_max_entries,
+            default_ttl=settings.search_cache_ttl_seconds,
+            path=settings.search_cache_path or None,
+            namespace="search"
+        )
+    return _search_cache
+
+
+def search_cache_stats() -> Optional[Dict[str, Any]]:
+    """Get the search cache's stats without creating it (None until first used)."""
+    return _search_cache.stats() if _search_cache is not None else None
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for use as a cache key (case and whitespace)."""
+    return " ".join(query.casefold().split())
 
 
 class TavilyService:
     """Service wrapper for Tavily search API."""
     
-    def __init__(self):
-        if TavilyClient is None:
-            raise ImportError("tavily-python is required. Install with: pip install tavily-python")
-        
-        api_key = settings.tavily_api_key or os.getenv("TAVILY_API_KEY")
-        if not api_key:
-            raise ValueError("TAVILY_API_KEY is required")
-        
-        self.client = TavilyClient(api_key=api_key)
+    def __init__(
+        self,
+        client: Optional[AsyncSearchClient] = None,
+        cache: Optional[TTLCache] = None
+    ):
+        # Shared, pooled client and cache unless injected explicitly
+        self.client = client or get_search_client()
+        self.cache = cache or (get_search_cache() if settings.search_cache_enabled else None)
         self.max_results = settings.max_search_results
     
-    def search(
+    async def search(
         self,
         query: str,
         search_depth: str = "advanced",
-        max_results: Optional[int] = None
+        max_results: Optional[int] = None,
+        category: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Execute a search query.
+        """Execute a search query, serving repeats from the cache.
+        
+        Identical searches already in flight are joined rather than re-sent;
+        upstream calls are capped by settings.search_max_concurrency.
         
         Args:
             query: Search query string
             search_depth: "basic" or "advanced"
             max_results: Maximum number of results to return
+            category: Optional item category, used to pick the cache TTL
             
         Returns:
             Tavily search results dictionary
         """
-        return self.client.search(
-            query=query,
-            search_depth=search_depth,
-            max_results=max_results or self.max_results
+        max_results = max_results or self.max_results
+        key = self.cache_key(query, search_depth, max_results)
+        
+        if self.cache is not None:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        
+        async def fetch() -> Dict[str, Any]:
+            # Held once per upstream call, not by every caller joining it
+            async with _get_search_semaphore():
+                results = await self.client.search(
+                    query=query,
+                    search_depth=search_depth,
+                    max_results=max_results
+                )
+            if self.cache is not None:
+                await self.cache.aset(key, results, ttl=self._cache_ttl(category))
+            return results
+        
+        return await search_flights.do(key, fetch)
+    
+    @staticmethod
+    def cache_key(query: str, search_depth: str, max_results: int) -> str:
+        """Build the cache key for a search.
+        
+        Args:
+            query: Search query string
+            search_depth: "basic" or "advanced"
+            max_results: Maximum number of results
+            
+        Returns:
+            Cache key string
+        """
+        return f"{search_depth}|{max_results}|{normalize_query(query)}"
+    
+    def _cache_ttl(self, category: Optional[str]) -> float:
+        """Get the cache TTL in seconds for a category."""
+        return settings.search_cache_category_ttls.get(
+            category or "",
+            settings.search_cache_ttl_seconds
         )
     
-    def search_multiple(
+    async def search_multiple(
         self,
         queries: List[str],
         search_depth: str = "advanced",
         max_results: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Execute multiple search queries.
+        """Execute multiple search queries concurrently.
         
         Args:
             queries: List of search query strings
@@ -61,18 +141,18 @@ class TavilyService:
             max_results: Maximum results per query
             
         Returns:
-            List of search results
+            List of search results, in the same order as queries
         """
-        results = []
-        for query in queries:
+        async def run(query: str) -> Dict[str, Any]:
             try:
-                result = self.search(query, search_depth, max_results)
-                results.append({"query": query, "results": result})
+                result = await self.search(query, search_depth, max_results)
+                return {"query": query, "results": result}
             except Exception as e:
-                results.append({"query": query, "error": str(e), "results": None})
-        return results
+                return {"query": query, "error": str(e), "results": None}
+        
+        return list(await asyncio.gather(*(run(query) for query in queries)))
     
-    def get_context(self, query: str) -> str:
+    async def get_context(self, query: str) -> str:
         """Get search context optimized for LLMs.
         
         Args:
@@ -81,7 +161,7 @@ class TavilyService:
         Returns:
             Compiled context string from search results
         """
-        results = self.search(query)
+        results = await self.search(query)
         
         context_parts = []
         for result in results.get("results", [])[:5]:
@@ -1,5 +1,22 @@
 """Utility modules for retreat planning."""
 
 from src.utils.validators import validate_requirements, validate_weights
+from src.utils.ids import (
+    fingerprint,
+    make_item_id,
+    make_package_id,
+    encode_cursor,
+    decode_cursor,
+)
+from src.utils.quantities import calculate_quantity
 
-__all__ = ["validate_requirements", "validate_weights"]
+__all__ = [
+    "validate_requirements",
+    "validate_weights",
+    "fingerprint",
+    "make_item_id",
+    "make_package_id",
+    "encode_cursor",
+    "decode_cursor",
+    "calculate_quantity",
+]
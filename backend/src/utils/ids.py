@@ -0,0 +1,87 @@
+"""Content-addressed IDs and pagination cursors."""
+
+from typing import Any, Iterable, Tuple
+import base64
+import hashlib
+import json
+
+
+def fingerprint(value: Any, length: int = 16) -> str:
+    """Stable hex digest of a JSON-serializable value.
+    
+    Args:
+        value: Value to hash (dict keys are sorted, so key order is irrelevant)
+        length: Number of hex characters to keep
+        
+    Returns:
+        Hex digest prefix
+    """
+    payload = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:length]
+
+
+def make_item_id(category: str, source: str) -> str:
+    """Build a deterministic item ID from its category and source URL.
+    
+    The same listing found by two different queries gets the same ID, so
+    duplicates can be dropped and IDs stay stable across discovery runs.
+    
+    Args:
+        category: Item category
+        source: Source URL (or another stable identifier if there is no URL)
+        
+    Returns:
+        Item ID like "hotels_3f2a9c1d7e4b5a60"
+    """
+    return f"{category}_{fingerprint([category, source.strip().lower()])}"
+
+
+def make_package_id(item_ids: Iterable[str]) -> str:
+    """Build a deterministic package ID from its member item IDs.
+    
+    Args:
+        item_ids: IDs of the items in the package (order does not matter)
+        
+    Returns:
+        Package ID like "pkg_3f2a9c1d7e4b5a60"
+    """
+    return f"pkg_{fingerprint(sorted(item_ids))}"
+
+
+def encode_cursor(ranking_id: str, offset: int) -> str:
+    """Encode an opaque pagination cursor for a ranking.
+    
+    Args:
+        ranking_id: Fingerprint of the ranking being paged through
+        offset: Position of the next package to return
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{ranking_id}:{offset}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (ranking_id, offset)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ranking_id, offset = base64.urlsafe_b64decode(padded).decode("utf-8").rsplit(":", 1)
+        offset = int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    
+    return ranking_id, offset
@@ -0,0 +1,43 @@
+"""Booking quantities per category, shared by the cart and budget checks."""
+
+from typing import Dict, Any
+import re
+
+
+def calculate_quantity(
+    category: str,
+    item: Dict[str, Any],
+    requirements: Dict[str, Any]
+) -> int:
+    """Calculate quantity needed based on category and requirements.
+    
+    Args:
+        category: Item category
+        item: Item dictionary
+        requirements: User requirements
+        
+    Returns:
+        Quantity needed
+    """
+    attendees = requirements.get("attendees", 50)
+    
+    # Extract duration in days
+    duration = requirements.get("duration", "2 days")
+    days_match = re.search(r'(\d+)', duration)
+    num_days = int(days_match.group(1)) if days_match else 2
+    
+    if category == "flights":
+        # One flight per attendee (round trip typically priced together)
+        return attendees
+    elif category == "hotels":
+        # Rooms for all attendees (assuming double occupancy)
+        rooms = (attendees // 2) + (attendees % 2)
+        return rooms * num_days  # Room-nights
+    elif category == "meeting_rooms":
+        # One room for the duration
+        return num_days
+    elif category == "catering":
+        # Meals per person per day
+        return attendees * num_days
+    else:
+        return 1